@@ -20,7 +20,11 @@ from app.models import (
     Attendance,
     AttendanceCode,
     TelegramStat,
+    TelegramDailyActivity,
+    TelegramBotState,
     UnmappedTelegramUser,
+    Job,
+    RateLimitCounter,
 )
 
 config = context.config
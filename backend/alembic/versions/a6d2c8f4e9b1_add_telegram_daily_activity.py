@@ -0,0 +1,48 @@
+"""Add per-day Telegram activity table
+
+Revision ID: a6d2c8f4e9b1
+Revises: f3c8e1a9d7b4
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d2c8f4e9b1'
+down_revision: Union[str, None] = 'f3c8e1a9d7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # History before this revision only exists as telegram_stats totals
+    op.create_table(
+        'telegram_daily_activity',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('mentee_id', sa.Integer(), nullable=False),
+        sa.Column('program_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('message_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['mentee_id'], ['mentee_profiles.id']),
+        sa.ForeignKeyConstraint(['program_id'], ['programs.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'mentee_id', 'program_id', 'day',
+            name='uq_telegram_daily_activity_mentee_program_day',
+        ),
+    )
+    op.create_index(
+        'ix_telegram_daily_activity_program_day',
+        'telegram_daily_activity',
+        ['program_id', 'day'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_telegram_daily_activity_program_day', table_name='telegram_daily_activity')
+    op.drop_table('telegram_daily_activity')
@@ -0,0 +1,32 @@
+"""Add Telegram bot state table for the polling offset checkpoint
+
+Revision ID: b8e4f1a7c3d9
+Revises: a6d2c8f4e9b1
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e4f1a7c3d9'
+down_revision: Union[str, None] = 'a6d2c8f4e9b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'telegram_bot_state',
+        sa.Column('bot_id', sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column('update_offset', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('bot_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('telegram_bot_state')
@@ -0,0 +1,50 @@
+"""Store password reset tokens as indexed SHA-256 digests
+
+Revision ID: c4d9a2e6f8b3
+Revises: b8e4f1a7c3d9
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d9a2e6f8b3'
+down_revision: Union[str, None] = 'b8e4f1a7c3d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Outstanding tokens keep working: their links hash to the stored digest
+    op.execute("""
+        UPDATE users
+        SET reset_token = encode(sha256(convert_to(reset_token, 'UTF8')), 'hex')
+        WHERE reset_token IS NOT NULL
+    """)
+    op.alter_column(
+        'users',
+        'reset_token',
+        new_column_name='reset_token_hash',
+        type_=sa.String(64),
+        existing_type=sa.String(255),
+        existing_nullable=True,
+    )
+    op.create_index('ix_users_reset_token_hash', 'users', ['reset_token_hash'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_reset_token_hash', table_name='users')
+    op.alter_column(
+        'users',
+        'reset_token_hash',
+        new_column_name='reset_token',
+        type_=sa.String(255),
+        existing_type=sa.String(64),
+        existing_nullable=True,
+    )
+    # Digests can't be turned back into tokens; pending resets must be requested again
+    op.execute("UPDATE users SET reset_token = NULL, reset_token_expires = NULL")
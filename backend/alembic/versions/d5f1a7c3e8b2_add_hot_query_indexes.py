@@ -0,0 +1,77 @@
+"""Add composite indexes for hot attendance, code, session and Telegram queries
+
+Revision ID: d5f1a7c3e8b2
+Revises: b4e9f3a2c6d5
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f1a7c3e8b2'
+down_revision: Union[str, None] = 'b4e9f3a2c6d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Active code lookup: session_id = ? AND expires_at > ?
+    op.create_index(
+        'ix_attendance_codes_session_id_expires_at',
+        'attendance_codes',
+        ['session_id', 'expires_at'],
+    )
+    op.drop_index('ix_attendance_codes_session_id', table_name='attendance_codes')
+
+    # Upcoming sessions: ORDER BY date, start_time
+    op.create_index('ix_sessions_date_start_time', 'sessions', ['date', 'start_time'])
+    op.drop_index('ix_sessions_date', table_name='sessions')
+
+    # Track filters on mentee lists, leaderboard and emails
+    op.create_index('ix_mentee_profiles_track', 'mentee_profiles', ['track'])
+
+    # Merge duplicate (mentee_id, program_id) rows left by concurrent increments
+    op.execute("""
+        WITH merged AS (
+            SELECT mentee_id, program_id, MIN(id) AS keep_id, SUM(message_count) AS total
+            FROM telegram_stats
+            GROUP BY mentee_id, program_id
+            HAVING COUNT(*) > 1
+        )
+        UPDATE telegram_stats t
+        SET message_count = merged.total
+        FROM merged
+        WHERE t.id = merged.keep_id
+    """)
+    op.execute("""
+        DELETE FROM telegram_stats t
+        USING telegram_stats keep
+        WHERE t.mentee_id = keep.mentee_id
+          AND t.program_id = keep.program_id
+          AND t.id > keep.id
+    """)
+
+    # One stats row per mentee per program; also serves mentee_id lookups
+    op.create_unique_constraint(
+        'uq_telegram_stats_mentee_program',
+        'telegram_stats',
+        ['mentee_id', 'program_id'],
+    )
+    op.drop_index('ix_telegram_stats_mentee_id', table_name='telegram_stats')
+
+
+def downgrade() -> None:
+    op.create_index('ix_telegram_stats_mentee_id', 'telegram_stats', ['mentee_id'])
+    op.drop_constraint('uq_telegram_stats_mentee_program', 'telegram_stats', type_='unique')
+
+    op.drop_index('ix_mentee_profiles_track', table_name='mentee_profiles')
+
+    op.create_index('ix_sessions_date', 'sessions', ['date'])
+    op.drop_index('ix_sessions_date_start_time', table_name='sessions')
+
+    op.create_index('ix_attendance_codes_session_id', 'attendance_codes', ['session_id'])
+    op.drop_index('ix_attendance_codes_session_id_expires_at', table_name='attendance_codes')
@@ -0,0 +1,37 @@
+"""Add rate limit counters table for the shared rate limiter backend
+
+Revision ID: d7e3b5f9a1c2
+Revises: c4d9a2e6f8b3
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7e3b5f9a1c2'
+down_revision: Union[str, None] = 'c4d9a2e6f8b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'rate_limit_counters',
+        sa.Column('key', sa.String(255), nullable=False),
+        sa.Column('window_index', sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column('hits', sa.Integer(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('key', 'window_index'),
+    )
+    op.create_index(
+        'ix_rate_limit_counters_expires_at', 'rate_limit_counters', ['expires_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_rate_limit_counters_expires_at', table_name='rate_limit_counters')
+    op.drop_table('rate_limit_counters')
@@ -0,0 +1,44 @@
+"""Add pg_trgm indexes for mentee search
+
+Revision ID: e7a2b9d4f1c6
+Revises: d5f1a7c3e8b2
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a2b9d4f1c6'
+down_revision: Union[str, None] = 'd5f1a7c3e8b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # GIN trigram indexes serve ILIKE '%term%' and similarity() ranking
+    op.create_index(
+        'ix_mentee_profiles_full_name_trgm',
+        'mentee_profiles',
+        ['full_name'],
+        postgresql_using='gin',
+        postgresql_ops={'full_name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_mentee_profiles_mentee_id_trgm',
+        'mentee_profiles',
+        ['mentee_id'],
+        postgresql_using='gin',
+        postgresql_ops={'mentee_id': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_mentee_profiles_mentee_id_trgm', table_name='mentee_profiles')
+    op.drop_index('ix_mentee_profiles_full_name_trgm', table_name='mentee_profiles')
+    # pg_trgm is left installed; other objects may depend on it
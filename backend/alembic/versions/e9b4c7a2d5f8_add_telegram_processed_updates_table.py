@@ -0,0 +1,45 @@
+"""Add telegram processed updates table for webhook deduplication
+
+Revision ID: e9b4c7a2d5f8
+Revises: d7e3b5f9a1c2
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9b4c7a2d5f8'
+down_revision: Union[str, None] = 'd7e3b5f9a1c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'telegram_processed_updates',
+        sa.Column('bot_id', sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column('update_id', sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column(
+            'processed_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint('bot_id', 'update_id'),
+    )
+    op.create_index(
+        'ix_telegram_processed_updates_processed_at',
+        'telegram_processed_updates',
+        ['processed_at'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_telegram_processed_updates_processed_at', table_name='telegram_processed_updates'
+    )
+    op.drop_table('telegram_processed_updates')
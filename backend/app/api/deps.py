@@ -1,15 +1,25 @@
 from typing import Annotated, AsyncGenerator
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import AsyncSessionLocal
 from app.core.constants import UserRole
-from app.core.security import verify_jwt
+from app.core.security import verify_jwt, decode_token
 from app.core.exceptions import InvalidTokenError
 from app.repositories.user_repo import UserRepository
 from app.models.user import User
+from app.schemas.attendance import SubmitCodeRequest
+from app.schemas.auth import LoginRequest
+from app.services.rate_limit_service import (
+    RateLimit,
+    rate_limiter,
+    LOGIN_PER_IP,
+    LOGIN_PER_IP_AND_IDENTIFIER,
+    ATTENDANCE_CODE_PER_IP,
+    ATTENDANCE_CODE_PER_USER,
+)
 
 security = HTTPBearer()
 
@@ -90,3 +100,56 @@ async def get_current_coordinator(
             detail="Coordinator access required",
         )
     return user
+
+
+def client_ip(http_request: Request) -> str:
+    # Behind a reverse proxy, run uvicorn with --proxy-headers so this is the real client
+    return http_request.client.host if http_request.client else "unknown"
+
+
+async def _enforce_rate_limits(*checks: tuple[RateLimit, str]) -> None:
+    for rate_limit, key in checks:
+        retry_after = await rate_limiter.hit(rate_limit, key)
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts. Please try again later.",
+                headers={"Retry-After": str(retry_after)},
+            )
+
+
+# The body parameter is named `request` like the endpoint's, so FastAPI
+# parses the body once and both see the same model
+async def login_rate_limit(
+    http_request: Request,
+    request: LoginRequest,
+) -> None:
+    """
+    Throttle login attempts per client IP and per identifier from that IP,
+    before any DB or bcrypt work. The identifier limit is not global, so
+    failed attempts from elsewhere can't lock an account out.
+    """
+    ip = client_ip(http_request)
+    await _enforce_rate_limits(
+        (LOGIN_PER_IP, ip),
+        (LOGIN_PER_IP_AND_IDENTIFIER, f"{ip}:{request.identifier.lower()}"),
+    )
+
+
+async def attendance_code_rate_limit(
+    http_request: Request,
+    request: SubmitCodeRequest,
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+) -> None:
+    """
+    Throttle attendance code attempts per client IP and per user and session.
+    The user comes from the token alone, so no DB work happens first; invalid
+    tokens are only limited by IP and then rejected by get_current_user.
+    """
+    checks = [(ATTENDANCE_CODE_PER_IP, client_ip(http_request))]
+    payload = decode_token(credentials.credentials)
+    if payload and payload.get("sub"):
+        checks.append(
+            (ATTENDANCE_CODE_PER_USER, f"{payload['sub']}:{request.session_id}")
+        )
+    await _enforce_rate_limits(*checks)
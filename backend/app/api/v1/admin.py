@@ -1,16 +1,32 @@
 from typing import Annotated
 from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
 from app.api.deps import get_db, get_current_coordinator
+from app.api.responses import model_list_response
+from app.database import AsyncSessionLocal
+from app.core.constants import (
+    HAS_MORE_HEADER,
+    MENTEE_LIST_DEFAULT_LIMIT,
+    MENTEE_LIST_MAX_LIMIT,
+)
 from app.core.exceptions import NotFoundError, CSVImportError
 from app.models.user import User
 from app.services.csv_import_service import CSVImportService
 from app.services.mentee_service import MenteeService
 from app.services.email_service import email_service
+from app.services.rate_limit_service import rate_limiter
+from app.services.export_service import (
+    export_dataset,
+    stream_csv_response_body,
+    ExportError,
+    EXPORT_FORMATS,
+)
+from app.repositories.program_repo import ProgramRepository
 from app.schemas.mentee import (
     MenteeProfileResponse,
     MenteeAdminUpdateRequest,
@@ -19,7 +35,6 @@ from app.schemas.mentee import (
 
 router = APIRouter()
 
-
 @router.post("/mentees/import", response_model=MenteeImportResultResponse)
 async def import_mentees_csv(
     file: Annotated[UploadFile, File(description="CSV file with mentee data")],
@@ -61,11 +76,43 @@ async def list_mentees(
     db: Annotated[AsyncSession, Depends(get_db)],
     track: str | None = None,
     search: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=MENTEE_LIST_MAX_LIMIT)] = MENTEE_LIST_DEFAULT_LIMIT,
+    offset: Annotated[int, Query(ge=0)] = 0,
 ):
-    """List all mentees with optional filtering (coordinator only)."""
+    """
+    List mentees with optional filtering (coordinator only), one page at a time.
+    With a search term, results are ranked by relevance. The X-Has-More
+    header says whether another page follows at offset + limit.
+    """
     service = MenteeService(db)
-    mentees = await service.list_mentees(track=track, search=search)
-    return [MenteeProfileResponse.from_model(m) for m in mentees]
+    # One extra row tells whether another page follows
+    rows = await service.list_mentees(
+        track=track, search=search, limit=limit + 1, offset=offset
+    )
+    response = model_list_response(
+        MenteeProfileResponse, [MenteeProfileResponse.from_row(row) for row in rows[:limit]]
+    )
+    response.headers[HAS_MORE_HEADER] = "true" if len(rows) > limit else "false"
+    return response
+
+
+@router.get("/mentees/csv")
+async def export_mentees_csv(
+    current_user: Annotated[User, Depends(get_current_coordinator)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    track: str | None = None,
+    search: str | None = None,
+):
+    """
+    Stream the full mentee list as CSV (coordinator only).
+    Rows are encoded straight from a server-side cursor.
+    """
+    query = MenteeService(db).mentee_list_query(track=track, search=search)
+    return StreamingResponse(
+        stream_csv_response_body(query),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="mentees.csv"'},
+    )
 
 
 @router.get("/mentees/{mentee_id}", response_model=MenteeProfileResponse)
@@ -165,3 +212,56 @@ async def send_test_email(
         return TestEmailResponse(success=True, message=f"Test email sent to {request.to_email}")
     else:
         return TestEmailResponse(success=False, message="Failed to send email. Check SMTP configuration.")
+
+
+@router.get("/rate-limits")
+async def get_rate_limit_metrics(
+    current_user: Annotated[User, Depends(get_current_coordinator)],
+):
+    """Allowed and rejected request counts per rate limit on this API process (coordinator only)."""
+    return rate_limiter.metrics_dict()
+
+
+@router.get("/exports/{dataset}")
+async def export_data(
+    dataset: str,
+    current_user: Annotated[User, Depends(get_current_coordinator)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    program_id: int = 1,
+    export_format: Annotated[str, Query(alias="format")] = "csv",
+):
+    """
+    Stream a dataset for reporting as CSV or Parquet (coordinator only).
+    Datasets: attendance, sessions, mentees, telegram_stats
+    """
+    program = await ProgramRepository(db).find_by_id(program_id)
+    if program is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Program not found: {program_id}",
+        )
+
+    # The stream outlives this request's session, so it gets its own
+    export_db = AsyncSessionLocal()
+    try:
+        chunks = export_dataset(export_db, dataset, program_id, export_format)
+    except ExportError as e:
+        await export_db.close()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message,
+        )
+
+    async def stream():
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await export_db.close()
+
+    filename = f"{dataset}-program-{program_id}.{export_format}"
+    return StreamingResponse(
+        stream(),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,18 +1,35 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_current_mentee, get_current_coordinator
+from app.api.deps import (
+    get_db,
+    get_current_mentee,
+    get_current_coordinator,
+    attendance_code_rate_limit,
+)
+from app.api.responses import model_list_response
+from app.core.constants import AttendanceStatus
 from app.core.exceptions import (
     NotFoundError,
     NotJoinedError,
     AlreadyPresentError,
     CodeWindowClosedError,
     InvalidCodeError,
+    CSVImportError,
+    TooManyRowsError,
 )
+from app.database import AsyncSessionLocal
+from app.models.attendance import Attendance
+from app.models.mentee import MenteeProfile
+from app.models.session import Session
 from app.models.user import User
 from app.services.attendance_service import AttendanceService
+from app.services.csv_import_service import parse_attendance_csv
+from app.services.export_service import stream_csv_response_body
+from app.services.singleflight_service import coordinator_reads, data_versions
 from app.schemas.attendance import (
     JoinSessionRequest,
     SubmitCodeRequest,
@@ -20,6 +37,9 @@ from app.schemas.attendance import (
     AttendanceCodeResponse,
     AttendanceOverrideRequest,
     MenteeAttendanceDetailResponse,
+    SessionAttendanceSummaryResponse,
+    BulkAttendanceRequest,
+    BulkAttendanceResultResponse,
 )
 
 router = APIRouter()
@@ -63,7 +83,11 @@ async def join_session(
     return AttendanceResponse.from_model(attendance)
 
 
-@router.post("/code", response_model=AttendanceResponse)
+@router.post(
+    "/code",
+    response_model=AttendanceResponse,
+    dependencies=[Depends(attendance_code_rate_limit)],
+)
 async def submit_attendance_code(
     request: SubmitCodeRequest,
     current_user: Annotated[User, Depends(get_current_mentee)],
@@ -129,21 +153,92 @@ async def generate_session_code(
     response_model=list[MenteeAttendanceDetailResponse],
 )
 async def get_session_attendance(
+    session_id: int,
+    current_user: Annotated[User, Depends(get_current_coordinator)],
+    status_filter: Annotated[AttendanceStatus | None, Query(alias="status")] = None,
+    track: str | None = None,
+    limit: Annotated[int | None, Query(ge=1, le=1000)] = None,
+    offset: Annotated[int, Query(ge=0)] = 0,
+):
+    """
+    Get attendance details for mentees for a session (coordinator only).
+    Optionally filtered by status and track, and paginated with limit/offset.
+    Concurrent identical requests share one query; results are not reused.
+    """
+    async def compute():
+        async with AsyncSessionLocal() as db:
+            return await AttendanceService(db).get_session_attendance(
+                session_id, status=status_filter, track=track, limit=limit, offset=offset
+            )
+
+    try:
+        attendances = await coordinator_reads.do(
+            ("session_attendance", session_id, status_filter, track, limit, offset),
+            compute,
+            version=data_versions.get(Attendance, MenteeProfile, Session),
+        )
+    except NotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.message,
+        )
+    return model_list_response(
+        MenteeAttendanceDetailResponse,
+        [MenteeAttendanceDetailResponse.from_row(row) for row in attendances],
+    )
+
+
+@router.get("/sessions/{session_id}/csv")
+async def export_session_attendance_csv(
+    session_id: int,
+    current_user: Annotated[User, Depends(get_current_coordinator)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    status_filter: Annotated[AttendanceStatus | None, Query(alias="status")] = None,
+    track: str | None = None,
+):
+    """
+    Stream a session's full attendance roster as CSV (coordinator only).
+    Rows are encoded straight from a server-side cursor.
+    """
+    service = AttendanceService(db)
+    try:
+        query = await service.get_session_roster_query(
+            session_id, status=status_filter, track=track
+        )
+    except NotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.message,
+        )
+    return StreamingResponse(
+        stream_csv_response_body(query),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f'attachment; filename="session-{session_id}-attendance.csv"'
+        },
+    )
+
+
+@router.get(
+    "/sessions/{session_id}/summary",
+    response_model=SessionAttendanceSummaryResponse,
+)
+async def get_session_attendance_summary(
     session_id: int,
     current_user: Annotated[User, Depends(get_current_coordinator)],
     db: Annotated[AsyncSession, Depends(get_db)],
+    track: str | None = None,
 ):
-    """Get attendance details for all mentees for a session (coordinator only)."""
+    """Get attendance counts per status for a session (coordinator only)."""
     service = AttendanceService(db)
     try:
-        attendances = await service.get_session_attendance(session_id)
+        counts = await service.get_session_attendance_summary(session_id, track=track)
     except NotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=e.message,
         )
-    # attendances is already a list of dicts matching MenteeAttendanceDetailResponse
-    return attendances
+    return SessionAttendanceSummaryResponse.from_counts(session_id, counts)
 
 
 @router.patch("/{attendance_id}", response_model=AttendanceResponse)
@@ -183,3 +278,66 @@ async def create_attendance(
             detail=e.message,
         )
     return AttendanceResponse.from_model(attendance)
+
+
+async def _bulk_set_attendance(
+    db: AsyncSession, session_id: int, rows: list[tuple[str, str]]
+) -> BulkAttendanceResultResponse:
+    service = AttendanceService(db)
+    try:
+        results = await service.bulk_set_attendance(session_id, rows)
+    except NotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.message,
+        )
+    except TooManyRowsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message,
+        )
+    return BulkAttendanceResultResponse.from_results(session_id, results)
+
+
+@router.post("/sessions/{session_id}/bulk", response_model=BulkAttendanceResultResponse)
+async def bulk_set_attendance(
+    session_id: int,
+    request: BulkAttendanceRequest,
+    current_user: Annotated[User, Depends(get_current_coordinator)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    Set attendance for many mentees of a session at once (coordinator only).
+    Invalid rows are reported per row and don't block the others.
+    """
+    rows = [(row.mentee_id, row.status) for row in request.rows]
+    return await _bulk_set_attendance(db, session_id, rows)
+
+
+@router.post("/sessions/{session_id}/import", response_model=BulkAttendanceResultResponse)
+async def import_attendance_csv(
+    session_id: int,
+    file: Annotated[UploadFile, File(description="CSV file with attendance data")],
+    current_user: Annotated[User, Depends(get_current_coordinator)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    Import attendance for a session from a CSV file (coordinator only).
+    Expected columns: mentee_id, status
+    """
+    if not file.filename or not file.filename.endswith(".csv"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be a CSV",
+        )
+
+    content = await file.read()
+    try:
+        rows = parse_attendance_csv(content)
+    except CSVImportError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message,
+        )
+
+    return await _bulk_set_attendance(db, session_id, rows)
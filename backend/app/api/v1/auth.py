@@ -1,9 +1,12 @@
+import asyncio
+import time
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_current_user, login_rate_limit
+from app.core.constants import PASSWORD_RESET_MIN_RESPONSE_SECONDS
 from app.core.exceptions import (
     InvalidCredentialsError,
     InactiveAccountError,
@@ -28,7 +31,11 @@ from app.core.exceptions import InvalidResetTokenError
 router = APIRouter()
 
 
-@router.post("/login", response_model=TokenResponse)
+@router.post(
+    "/login",
+    response_model=TokenResponse,
+    dependencies=[Depends(login_rate_limit)],
+)
 async def login(
     request: LoginRequest,
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -137,9 +144,15 @@ async def forgot_password(
     request: ForgotPasswordRequest,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
-    """Request password reset. Sends email with reset link if user exists."""
+    """Request password reset. Queues an email with reset link if user exists."""
+    started = time.monotonic()
     service = AuthService(db)
     await service.request_password_reset(request.identifier)
+    # Commit before padding so known and unknown identifiers take the same time
+    await db.commit()
+    remaining = PASSWORD_RESET_MIN_RESPONSE_SECONDS - (time.monotonic() - started)
+    if remaining > 0:
+        await asyncio.sleep(remaining)
     # Always return success to prevent email enumeration
     return {"message": "If an account exists with that identifier, you will receive a password reset email."}
 
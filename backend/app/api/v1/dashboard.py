@@ -4,23 +4,48 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_current_coordinator
+from app.api.deps import get_current_coordinator
+from app.database import AsyncSessionLocal
 from app.models.user import User
 from app.models.attendance import Attendance
 from app.models.session import Session
 from app.models.mentee import MenteeProfile
 from app.models.telegram import TelegramStat
-from app.core.constants import AttendanceStatus
+from app.core.constants import (
+    AttendanceStatus,
+    COORDINATOR_READ_FRESH_SECONDS,
+    COORDINATOR_READ_STALE_SECONDS,
+)
+from app.services.singleflight_service import coordinator_reads, data_versions
 
 router = APIRouter()
 
+DASHBOARD_TABLES = (MenteeProfile, TelegramStat, Session, Attendance)
+
 
 @router.get("/stats")
 async def get_dashboard_stats(
     current_user: Annotated[User, Depends(get_current_coordinator)],
-    db: Annotated[AsyncSession, Depends(get_db)],
 ):
-    """Get dashboard statistics."""
+    """
+    Get dashboard statistics.
+    Concurrent requests share one computation, which is briefly reused.
+    """
+    return await coordinator_reads.do(
+        "dashboard_stats",
+        _compute_dashboard_stats,
+        version=data_versions.get(*DASHBOARD_TABLES),
+        fresh_seconds=COORDINATOR_READ_FRESH_SECONDS,
+        stale_seconds=COORDINATOR_READ_STALE_SECONDS,
+    )
+
+
+async def _compute_dashboard_stats() -> dict:
+    async with AsyncSessionLocal() as db:
+        return await _dashboard_stats(db)
+
+
+async def _dashboard_stats(db: AsyncSession) -> dict:
 
     # Total mentees
     mentee_count = await db.scalar(select(func.count(MenteeProfile.id)))
@@ -1,7 +1,7 @@
 """Email endpoints for coordinators."""
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, BackgroundTasks
+from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,7 +10,7 @@ from sqlalchemy.orm import selectinload
 from app.api.deps import get_db, get_current_coordinator
 from app.models.user import User
 from app.models.mentee import MenteeProfile
-from app.services.email_service import email_service
+from app.services.job_service import enqueue_job
 
 router = APIRouter()
 
@@ -28,56 +28,9 @@ class BulkEmailResponse(BaseModel):
     recipient_count: int
 
 
-async def send_bulk_emails(
-    recipients: list[tuple[str, str]],  # List of (email, name)
-    subject: str,
-    html_content: str,
-):
-    """Background task to send emails to multiple recipients."""
-    for email, name in recipients:
-        # Personalize the email
-        personalized_html = html_content.replace("{{name}}", name)
-        personalized_text = f"Hi {name},\n\n{html_content}"
-
-        await email_service.send_email(
-            to_email=email,
-            subject=subject,
-            html_content=f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <style>
-                    body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                    .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                    .header {{ background: linear-gradient(135deg, #1B4F72, #2E86C1); color: white; padding: 20px; border-radius: 8px 8px 0 0; }}
-                    .content {{ background: #f9f9f9; padding: 20px; border: 1px solid #ddd; border-top: none; border-radius: 0 0 8px 8px; }}
-                    .footer {{ text-align: center; margin-top: 20px; color: #666; font-size: 12px; }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="header">
-                        <h1 style="margin: 0;">{subject}</h1>
-                    </div>
-                    <div class="content">
-                        <p>Hi {name},</p>
-                        {personalized_html}
-                    </div>
-                    <div class="footer">
-                        <p>Kings Patriots Development Foundation</p>
-                    </div>
-                </div>
-            </body>
-            </html>
-            """,
-            text_content=personalized_text,
-        )
-
-
 @router.post("/send", response_model=BulkEmailResponse)
 async def send_bulk_email(
     request: BulkEmailRequest,
-    background_tasks: BackgroundTasks,
     current_user: Annotated[User, Depends(get_current_coordinator)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
@@ -106,12 +59,13 @@ async def send_bulk_email(
             recipient_count=0,
         )
 
-    # Send emails in background
-    background_tasks.add_task(
-        send_bulk_emails,
-        recipients,
-        request.subject,
-        request.message,
+    # Sent by a background worker
+    await enqueue_job(
+        db,
+        "send_bulk_email",
+        recipients=recipients,
+        subject=request.subject,
+        html_content=request.message,
     )
 
     return BulkEmailResponse(
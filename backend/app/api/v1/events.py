@@ -0,0 +1,80 @@
+"""Server-sent event stream for live attendance and code-window changes."""
+import asyncio
+import json
+from typing import Annotated, Any, AsyncIterator, Callable
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db, get_current_user
+from app.core.constants import UserRole
+from app.models.user import User
+from app.repositories.mentee_repo import MenteeRepository
+from app.repositories.session_repo import SessionRepository
+from app.services.event_service import event_bus, session_channel
+
+router = APIRouter()
+
+KEEPALIVE_SECONDS = 15
+MENTEE_VISIBLE_EVENTS = {"code_generated", "code_expired"}
+
+
+async def _event_stream(
+    channel: str, event_filter: Callable[[dict[str, Any]], bool]
+) -> AsyncIterator[str]:
+    async with event_bus.subscribe(channel) as queue:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event_data = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                # Comment line keeps proxies from closing an idle connection
+                yield ": keepalive\n\n"
+                continue
+            if event_filter(event_data):
+                data = json.dumps(event_data, default=str)
+                yield f"event: {event_data['type']}\ndata: {data}\n\n"
+
+
+@router.get("/sessions/{session_id}")
+async def stream_session_events(
+    session_id: int,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    Stream live events for a session.
+    Coordinators receive every event; mentees receive code window changes
+    and their own attendance changes only.
+    """
+    session = await SessionRepository(db).find_by_id(session_id)
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Session not found: {session_id}",
+        )
+
+    if current_user.role == UserRole.COORDINATOR:
+        event_filter = lambda event_data: True
+    else:
+        mentee = await MenteeRepository(db).find_by_user_id(current_user.id)
+        if mentee is None:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Mentee access required",
+            )
+        mentee_profile_id = mentee.id
+        event_filter = lambda event_data: (
+            event_data["type"] in MENTEE_VISIBLE_EVENTS
+            or event_data.get("mentee_profile_id") == mentee_profile_id
+        )
+
+    # Release the DB connection - the stream can stay open for hours
+    await db.close()
+
+    return StreamingResponse(
+        _event_stream(session_channel(session_id), event_filter),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
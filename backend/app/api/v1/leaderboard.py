@@ -1,34 +1,71 @@
+from datetime import datetime, timedelta, timezone
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from app.api.deps import get_db, get_current_coordinator
+from app.api.deps import get_current_coordinator
+from app.api.responses import model_list_response
+from app.core.constants import COORDINATOR_READ_FRESH_SECONDS, COORDINATOR_READ_STALE_SECONDS
 from app.core.exceptions import NotFoundError
+from app.database import AsyncSessionLocal
+from app.models.attendance import Attendance
+from app.models.mentee import MenteeProfile
+from app.models.program import Program
+from app.models.session import Session
+from app.models.telegram import TelegramStat, TelegramDailyActivity
 from app.models.user import User
 from app.services.scoring_service import ScoringService
+from app.services.singleflight_service import coordinator_reads, data_versions
 from app.schemas.leaderboard import LeaderboardEntryResponse
 
 router = APIRouter()
 
+LEADERBOARD_TABLES = (
+    Program,
+    Session,
+    Attendance,
+    MenteeProfile,
+    TelegramStat,
+    TelegramDailyActivity,
+)
+
 
 @router.get("", response_model=list[LeaderboardEntryResponse])
 async def get_leaderboard(
     current_user: Annotated[User, Depends(get_current_coordinator)],
-    db: Annotated[AsyncSession, Depends(get_db)],
     program_id: int = 1,
     track: str | None = None,
+    telegram_days: int | None = Query(None, ge=1, le=366),
 ):
     """
     Get leaderboard with attendance and Telegram scores.
+    telegram_days limits Telegram messages to the last N days (including today).
     Coordinator only - mentees cannot see the leaderboard.
+
+    Concurrent requests for the same leaderboard share one computation, and
+    a result is reused for a few seconds and then refreshed in the background.
     """
-    service = ScoringService(db)
+    since = None
+    if telegram_days is not None:
+        since = datetime.now(timezone.utc).date() - timedelta(days=telegram_days - 1)
+
+    async def compute():
+        async with AsyncSessionLocal() as db:
+            return await ScoringService(db).compute_leaderboard(program_id, track, since)
+
     try:
-        entries = await service.compute_leaderboard(program_id, track)
+        entries = await coordinator_reads.do(
+            ("leaderboard", program_id, track, since),
+            compute,
+            version=data_versions.get(*LEADERBOARD_TABLES),
+            fresh_seconds=COORDINATOR_READ_FRESH_SECONDS,
+            stale_seconds=COORDINATOR_READ_STALE_SECONDS,
+        )
     except NotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=e.message,
         )
-    return [LeaderboardEntryResponse.from_entry(e) for e in entries]
+    return model_list_response(
+        LeaderboardEntryResponse, [LeaderboardEntryResponse.from_entry(e) for e in entries]
+    )
@@ -8,8 +8,18 @@ from app.core.exceptions import NotFoundError
 from app.models.user import User
 from app.services.mentee_service import MenteeService
 from app.services.session_service import SessionService
-from app.services.upload_service import save_profile_picture, UploadError
-from app.schemas.mentee import MenteeProfileResponse, MenteeProfileUpdateRequest
+from app.services.upload_service import (
+    save_profile_picture,
+    create_profile_picture_upload,
+    UploadError,
+)
+from app.schemas.mentee import (
+    MenteeProfileResponse,
+    MenteeProfileUpdateRequest,
+    ProfilePictureUploadRequest,
+    ProfilePictureUploadResponse,
+    ProfilePictureConfirmRequest,
+)
 from app.schemas.session import SessionWithCountdownResponse
 
 router = APIRouter()
@@ -76,6 +86,54 @@ async def upload_profile_picture(
         )
 
 
+@router.post("/me/profile-picture/upload-url", response_model=ProfilePictureUploadResponse)
+async def create_profile_picture_upload_url(
+    request: ProfilePictureUploadRequest,
+    current_user: Annotated[User, Depends(get_current_mentee)],
+):
+    """
+    Get a presigned URL to upload a profile picture directly to storage.
+    Only available with the S3 storage backend.
+    """
+    try:
+        upload = await create_profile_picture_upload(
+            current_user.id, request.content_type, request.filename
+        )
+    except UploadError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message,
+        )
+
+    return ProfilePictureUploadResponse(**upload)
+
+
+@router.post(
+    "/me/profile-picture/confirm",
+    response_model=MenteeProfileResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def confirm_profile_picture(
+    request: ProfilePictureConfirmRequest,
+    current_user: Annotated[User, Depends(get_current_mentee)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    Set a directly uploaded file as the profile picture.
+    A worker processes the file; the profile shows it once that finishes.
+    """
+    try:
+        service = MenteeService(db)
+        profile = await service.queue_profile_picture_upload(current_user.id, request.key)
+
+        return MenteeProfileResponse.from_model(profile)
+    except UploadError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message,
+        )
+
+
 @router.get("/me/upcoming-session", response_model=SessionWithCountdownResponse | None)
 async def get_upcoming_session(
     current_user: Annotated[User, Depends(get_current_mentee)],
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1 import auth, mentee, session, attendance, telegram, leaderboard, admin, dashboard, email
+from app.api.v1 import auth, mentee, session, attendance, telegram, leaderboard, admin, dashboard, email, events
 
 api_router = APIRouter()
 
@@ -13,3 +13,4 @@ api_router.include_router(leaderboard.router, prefix="/leaderboard", tags=["Lead
 api_router.include_router(admin.router, prefix="/admin", tags=["Admin"])
 api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
 api_router.include_router(email.router, prefix="/email", tags=["Email"])
+api_router.include_router(events.router, prefix="/events", tags=["Events"])
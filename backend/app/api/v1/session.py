@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db, get_current_coordinator
+from app.api.responses import model_list_response
 from app.core.exceptions import NotFoundError
 from app.models.user import User
 from app.services.session_service import SessionService
@@ -26,8 +27,11 @@ async def list_sessions(
 ):
     """List all sessions (coordinator only)."""
     service = SessionService(db)
-    sessions = await service.list_sessions(program_id)
-    return [SessionResponse.from_model(s) for s in sessions]
+    sessions, resources = await service.list_sessions(program_id)
+    return model_list_response(
+        SessionResponse,
+        [SessionResponse.from_row(s, resources.get(s.id, [])) for s in sessions],
+    )
 
 
 @router.post("", response_model=SessionResponse, status_code=status.HTTP_201_CREATED)
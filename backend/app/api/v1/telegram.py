@@ -5,11 +5,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db, get_current_coordinator
 from app.config import get_settings
-from app.core.exceptions import NotFoundError
+from app.core.exceptions import (
+    NotFoundError,
+    InvalidTelegramMappingError,
+    TooManyRowsError,
+)
 from app.models.user import User
 from app.services.telegram_service import TelegramService
 from app.schemas.telegram import (
     TelegramMapRequest,
+    TelegramBulkMapRequest,
+    TelegramMatchSuggestionResponse,
     UnmappedTelegramUserResponse,
 )
 
@@ -39,8 +45,9 @@ async def telegram_webhook(
     except Exception:
         return {"ok": True}
 
+    # Redelivered updates are acknowledged without being counted again
     service = TelegramService(db)
-    await service.process_update(update)
+    await service.process_webhook_update(update)
     return {"ok": True}
 
 
@@ -72,9 +79,56 @@ async def map_telegram_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=e.message,
         )
+    except InvalidTelegramMappingError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message,
+        )
     return {"message": "Telegram user mapped successfully"}
 
 
+@router.get("/match-suggestions", response_model=list[TelegramMatchSuggestionResponse])
+async def get_match_suggestions(
+    current_user: Annotated[User, Depends(get_current_coordinator)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    Suggest mentees for unmapped Telegram users by username and name
+    similarity, with a 0-1 confidence score (coordinator only).
+    """
+    service = TelegramService(db)
+    candidates = await service.suggest_matches()
+    return [TelegramMatchSuggestionResponse.from_candidate(c) for c in candidates]
+
+
+@router.post("/map/bulk")
+async def bulk_map_telegram_users(
+    request: TelegramBulkMapRequest,
+    current_user: Annotated[User, Depends(get_current_coordinator)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    Map many Telegram users to mentee profiles in one transaction, e.g.
+    accepted match suggestions (coordinator only).
+    """
+    service = TelegramService(db)
+    try:
+        mapped = await service.map_telegram_users(
+            [(m.telegram_user_id, m.mentee_profile_id) for m in request.mappings]
+        )
+    except NotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.message,
+        )
+    except (InvalidTelegramMappingError, TooManyRowsError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message,
+        )
+    return {"message": f"{mapped} Telegram users mapped successfully", "mapped": mapped}
+
+
 @router.delete("/mapping/{mentee_id}")
 async def remove_telegram_mapping(
     mentee_id: int,
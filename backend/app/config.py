@@ -20,6 +20,8 @@ class Settings(BaseSettings):
     telegram_bot_token: str = ""
     telegram_webhook_secret: str = ""
     webhook_base_url: str = ""  # e.g., https://your-domain.com or ngrok URL
+    telegram_mode: str = "webhook"  # "webhook" or "polling" (getUpdates from the worker)
+    telegram_api_url: str = "https://api.telegram.org"  # Or a local Bot API server
 
     # Email
     smtp_host: str = "smtp.gmail.com"
@@ -31,6 +33,16 @@ class Settings(BaseSettings):
     cors_origins: list[str] = ["http://localhost:5173", "http://localhost:3000"]
     frontend_url: str = "http://localhost:5173"
 
+    # Live events ("memory" for a single worker, "postgres" for LISTEN/NOTIFY fan-out)
+    event_backend: str = "memory"
+
+    # Rate limiting ("memory" per API process, "postgres" shared by every API node)
+    rate_limit_backend: str = "memory"
+
+    # Background jobs
+    worker_concurrency: int = 4
+    run_worker_in_api: bool = False  # Single-process setups only; use python -m app.worker
+
     # Environment
     environment: str = "development"
 
@@ -38,6 +50,15 @@ class Settings(BaseSettings):
     upload_dir: str = "static/uploads"
     max_upload_size_mb: int = 5
 
+    # Upload storage ("local" for upload_dir, "s3" for an S3-compatible bucket)
+    storage_backend: str = "local"
+    s3_bucket: str = ""
+    s3_public_url: str = ""  # e.g., https://cdn.your-domain.com or bucket URL
+    s3_endpoint_url: str = ""  # e.g., http://localhost:9000 for MinIO
+    s3_region: str = ""
+    s3_access_key: str = ""
+    s3_secret_key: str = ""
+
     model_config = SettingsConfigDict(
         env_file=BACKEND_DIR / ".env",
         env_file_encoding="utf-8",
@@ -13,6 +13,13 @@ class AttendanceStatus(str, Enum):
     PRESENT = "PRESENT"
 
 
+class JobStatus(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
 class ResourceType(str, Enum):
     SPEAKER = "SPEAKER"
     MATERIAL = "MATERIAL"
@@ -29,6 +36,75 @@ TELEGRAM_SCORE_WEIGHT = 0.2
 CODE_EXPIRATION_MINUTES = 20
 CODE_PREFIX = "KPDF"
 CODE_LENGTH = 4
+CODE_WINDOW_RECHECK_SECONDS = 5  # How long a cached "no active code" result is trusted
+UPCOMING_SESSION_FRESH_SECONDS = 5  # How long the cached upcoming session is reused
+BULK_ATTENDANCE_MAX_ROWS = 2000  # Rows per bulk attendance request or CSV import
+
+# Coalesced coordinator reads (leaderboard, dashboard): results are reused
+# while fresh, then served stale for a while during a background refresh
+COORDINATOR_READ_FRESH_SECONDS = 5
+COORDINATOR_READ_STALE_SECONDS = 60
+
+# Response compression
+GZIP_MINIMUM_SIZE = 1024  # Bytes; smaller responses aren't worth compressing
+GZIP_COMPRESS_LEVEL = 5  # Most of level 9's size reduction for far less CPU
+# Event streams would be held back in the compressor's buffer, and uploaded
+# images are already compressed
+GZIP_EXCLUDED_PREFIXES = ("/api/v1/events", "/static")
+
+# Paged list endpoints say whether another page follows ("true"/"false")
+HAS_MORE_HEADER = "X-Has-More"
+
+# Coordinator mentee list page size; a short search term can match every mentee
+MENTEE_LIST_DEFAULT_LIMIT = 50
+MENTEE_LIST_MAX_LIMIT = 1000
+
+# Background jobs
+JOB_LEASE_SECONDS = 300  # A leased job is retried by another worker once this expires
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_BASE_SECONDS = 30  # Doubles with every failed attempt
+JOB_RETENTION_DAYS = 7  # Finished jobs (and their dedup keys) are pruned after this
+
+# Password reset
+PASSWORD_RESET_TOKEN_HOURS = 1
+PASSWORD_RESET_EMAIL_WINDOW_SECONDS = 300  # Repeat requests within a window reuse its email
+PASSWORD_RESET_MIN_RESPONSE_SECONDS = 0.5  # Floor so response time doesn't reveal whether the account exists
+
+# Rate limits as (requests, window seconds), checked before any DB or bcrypt work
+LOGIN_RATE_LIMIT_PER_IP = (60, 60)  # Generous: a whole cohort may log in from one network
+LOGIN_RATE_LIMIT_PER_IP_AND_IDENTIFIER = (10, 300)  # Others can't lock an account out
+ATTENDANCE_CODE_RATE_LIMIT_PER_IP = (300, 60)  # Mentees in one room submit the code together
+ATTENDANCE_CODE_RATE_LIMIT_PER_USER = (5, 60)  # Per session; guessing a 4-char code is hopeless at this rate
+RATE_LIMIT_PRUNE_SECONDS = 60  # How often the in-memory backend drops expired counters
+
+# Profile pictures are shared by digest, so unused files are removed by a sweep
+# rather than when a profile changes; the grace period covers in-flight uploads
+PROFILE_PICTURE_SWEEP_GRACE_HOURS = 24
+PROFILE_PIC_LOOKUP_BATCH_SIZE = 1000  # URLs per in-use lookup during the sweep
 
 # Message filtering
 MIN_MESSAGE_LENGTH = 5
+
+# Telegram long polling (TELEGRAM_MODE=polling)
+TELEGRAM_POLL_TIMEOUT_SECONDS = 30  # getUpdates holds the request open this long when idle
+TELEGRAM_POLL_BATCH_SIZE = 100  # Telegram's maximum per getUpdates call
+TELEGRAM_POLL_RETRY_SECONDS = 5
+TELEGRAM_RECENT_UPDATE_IDS = 10000  # Webhook update_ids remembered per process for dedup
+# Telegram gives up redelivering an update after 24 hours
+TELEGRAM_PROCESSED_UPDATE_RETENTION_HOURS = 48
+TELEGRAM_MATCH_MIN_SCORE = 0.8  # Minimum similarity for a suggested Telegram-to-mentee match
+TELEGRAM_BULK_MAP_MAX_ROWS = 1000  # Mappings per bulk map request
+
+# Telegram Bot API client
+TELEGRAM_API_TIMEOUT_SECONDS = 10
+TELEGRAM_API_MAX_RETRIES = 3  # For 429, 5xx and network errors
+TELEGRAM_API_RETRY_BASE_SECONDS = 1  # Doubles with every retry unless Telegram sends retry_after
+TELEGRAM_SEND_RATE_PER_SECOND = 25  # Telegram allows about 30 messages per second per bot
+# Read timeouts for methods that need longer than TELEGRAM_API_TIMEOUT_SECONDS.
+# getUpdates also waits out its own long-poll timeout on top of this.
+TELEGRAM_API_READ_TIMEOUTS = {
+    "setWebhook": 30,  # Telegram checks the webhook URL's certificate before answering
+    "sendPhoto": 60,  # Uploads
+    "sendDocument": 60,
+    "sendMediaGroup": 60,
+}
@@ -91,6 +91,16 @@ class CSVImportError(AppError):
         super().__init__(detail, "CSV_IMPORT_ERROR")
 
 
+class TooManyRowsError(AppError):
+    def __init__(self, count: int, maximum: int):
+        super().__init__(f"Too many rows: {count} (maximum {maximum})", "TOO_MANY_ROWS")
+
+
+class InvalidTelegramMappingError(AppError):
+    def __init__(self, detail: str):
+        super().__init__(detail, "INVALID_TELEGRAM_MAPPING")
+
+
 class InvalidResetTokenError(AppError):
     def __init__(self):
         super().__init__("Invalid or expired reset token", "INVALID_RESET_TOKEN")
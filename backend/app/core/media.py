@@ -0,0 +1,74 @@
+"""Static media serving with long-lived caching and WebP negotiation."""
+import os
+import re
+import stat
+from os import PathLike
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# Content-addressed files (sha256 digest names) never change once written
+IMMUTABLE_NAME = re.compile(r"^[0-9a-f]{64}(_thumb)?\.[a-z]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_CACHE_CONTROL = "public, max-age=3600"
+
+# Formats for which a precomputed .webp sibling may exist
+WEBP_SOURCE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+
+
+def webp_variant_path(path: str) -> str:
+    """Path of the precomputed WebP variant for an image path."""
+    return os.path.splitext(path)[0] + ".webp"
+
+
+class MediaFiles(StaticFiles):
+    """
+    StaticFiles with cache headers for uploaded media.
+
+    Content-addressed files are served with a one-year immutable
+    Cache-Control. Clients that accept image/webp are served the WebP
+    variant of JPEG/PNG images when one exists. ETag/Last-Modified
+    conditional requests are handled by StaticFiles.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if (
+            scope["method"] in ("GET", "HEAD")
+            and os.path.splitext(path)[1].lower() in WEBP_SOURCE_EXTENSIONS
+            and "image/webp" in Headers(scope=scope).get("accept", "")
+        ):
+            full_path, stat_result = await anyio.to_thread.run_sync(
+                self.lookup_path, webp_variant_path(path)
+            )
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                return self.file_response(full_path, stat_result, scope)
+
+        return await super().get_response(path, scope)
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+
+        response = FileResponse(
+            full_path, status_code=status_code, stat_result=stat_result
+        )
+        name = os.path.basename(full_path)
+        if IMMUTABLE_NAME.match(name):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers["Cache-Control"] = DEFAULT_CACHE_CONTROL
+        if os.path.splitext(scope["path"])[1].lower() in WEBP_SOURCE_EXTENSIONS:
+            # The same URL may be served as WebP depending on Accept
+            response.headers["Vary"] = "Accept"
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
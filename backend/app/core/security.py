@@ -1,3 +1,4 @@
+import hashlib
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
@@ -18,6 +19,11 @@ def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def hash_reset_token(token: str) -> str:
+    """Reset tokens are random, so a fast unsalted digest is enough to store them."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def create_access_token(data: dict[str, Any], expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
     if expires_delta:
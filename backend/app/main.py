@@ -1,17 +1,28 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, ORJSONResponse
 
+from app.api.responses import SelectiveGZipMiddleware
 from app.config import get_settings
+from app.core.constants import (
+    GZIP_COMPRESS_LEVEL,
+    GZIP_EXCLUDED_PREFIXES,
+    GZIP_MINIMUM_SIZE,
+    HAS_MORE_HEADER,
+)
 from app.core.exceptions import AppError
+from app.core.media import MediaFiles
 from app.api.v1.router import api_router
-from app.services.scheduler_service import setup_scheduler, start_scheduler, stop_scheduler
+from app.services.event_service import event_bus
+from app.services.rate_limit_service import rate_limiter
 from app.services.telegram_bot_service import setup_telegram_webhook
+from app.services.telegram_client import close_telegram_client
+from app.worker import run_worker, stop_worker
 
 # Configure logging
 logging.basicConfig(
@@ -30,9 +41,14 @@ profiles_dir.mkdir(parents=True, exist_ok=True)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    setup_scheduler()
-    start_scheduler()
-    logging.info("Scheduler started")
+    await event_bus.start()
+    rate_limiter.start()
+
+    # Jobs and scheduled tasks run in python -m app.worker unless embedded
+    worker_task = None
+    if settings.run_worker_in_api:
+        worker_task = asyncio.create_task(run_worker())
+        logging.info("Embedded job worker started")
 
     # Setup Telegram webhook
     await setup_telegram_webhook()
@@ -40,7 +56,11 @@ async def lifespan(app: FastAPI):
     logging.info("Application started")
     yield
     # Shutdown
-    stop_scheduler()
+    if worker_task is not None:
+        stop_worker()
+        await worker_task
+    await close_telegram_client()
+    await event_bus.stop()
     logging.info("Application shutdown")
 
 
@@ -49,6 +69,15 @@ app = FastAPI(
     description="API for the Kings Patriots Development Foundation mentorship program",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+# Compress large JSON/CSV responses
+app.add_middleware(
+    SelectiveGZipMiddleware,
+    excluded_prefixes=GZIP_EXCLUDED_PREFIXES,
+    minimum_size=GZIP_MINIMUM_SIZE,
+    compresslevel=GZIP_COMPRESS_LEVEL,
 )
 
 # CORS middleware
@@ -58,6 +87,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[HAS_MORE_HEADER],
 )
 
 
@@ -91,7 +121,7 @@ async def app_error_handler(request: Request, exc: AppError):
 app.include_router(api_router, prefix="/api/v1")
 
 # Mount static files for uploaded content
-app.mount("/static", StaticFiles(directory=settings.upload_dir), name="static")
+app.mount("/static", MediaFiles(directory=settings.upload_dir), name="static")
 
 
 @app.get("/health")
@@ -3,7 +3,15 @@ from app.models.mentee import MenteeProfile
 from app.models.program import Program
 from app.models.session import Session, SessionResource
 from app.models.attendance import Attendance, AttendanceCode
-from app.models.telegram import TelegramStat, UnmappedTelegramUser
+from app.models.telegram import (
+    TelegramStat,
+    TelegramDailyActivity,
+    TelegramBotState,
+    TelegramProcessedUpdate,
+    UnmappedTelegramUser,
+)
+from app.models.job import Job
+from app.models.rate_limit import RateLimitCounter
 
 __all__ = [
     "User",
@@ -14,5 +22,10 @@ __all__ = [
     "Attendance",
     "AttendanceCode",
     "TelegramStat",
+    "TelegramDailyActivity",
+    "TelegramBotState",
+    "TelegramProcessedUpdate",
     "UnmappedTelegramUser",
+    "Job",
+    "RateLimitCounter",
 ]
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import String, ForeignKey, DateTime, Enum, func, UniqueConstraint
+from sqlalchemy import String, ForeignKey, DateTime, Enum, func, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -34,9 +34,12 @@ class Attendance(Base):
 
 class AttendanceCode(Base):
     __tablename__ = "attendance_codes"
+    __table_args__ = (
+        Index("ix_attendance_codes_session_id_expires_at", "session_id", "expires_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    session_id: Mapped[int] = mapped_column(ForeignKey("sessions.id"), index=True)
+    session_id: Mapped[int] = mapped_column(ForeignKey("sessions.id"))
     code: Mapped[str] = mapped_column(String(20), unique=True, index=True)
     generated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import String, BigInteger, ForeignKey, DateTime, func
+from sqlalchemy import DDL, String, BigInteger, ForeignKey, DateTime, Index, event, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -7,12 +7,27 @@ from app.database import Base
 
 class MenteeProfile(Base):
     __tablename__ = "mentee_profiles"
+    __table_args__ = (
+        # Trigram indexes for substring search on the coordinator mentee list
+        Index(
+            "ix_mentee_profiles_full_name_trgm",
+            "full_name",
+            postgresql_using="gin",
+            postgresql_ops={"full_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_mentee_profiles_mentee_id_trgm",
+            "mentee_id",
+            postgresql_using="gin",
+            postgresql_ops={"mentee_id": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), unique=True)
     mentee_id: Mapped[str] = mapped_column(String(50), unique=True, index=True)  # e.g., KPDF-001
     full_name: Mapped[str] = mapped_column(String(255))
-    track: Mapped[str] = mapped_column(String(100))
+    track: Mapped[str] = mapped_column(String(100), index=True)
     profile_pic_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
     telegram_username: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
     telegram_user_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True, index=True)
@@ -31,3 +46,11 @@ class MenteeProfile(Base):
     telegram_stats: Mapped[list["TelegramStat"]] = relationship(
         "TelegramStat", back_populates="mentee"
     )
+
+
+# The trigram indexes need pg_trgm when the schema is built with create_all
+event.listen(
+    MenteeProfile.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
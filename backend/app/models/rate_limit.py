@@ -0,0 +1,21 @@
+from datetime import datetime
+from sqlalchemy import String, Integer, BigInteger, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class RateLimitCounter(Base):
+    """Requests counted for one rate limit key in one fixed window (RATE_LIMIT_BACKEND=postgres)."""
+
+    __tablename__ = "rate_limit_counters"
+    __table_args__ = (
+        Index("ix_rate_limit_counters_expires_at", "expires_at"),
+    )
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # Unix time divided by the limit's window length
+    window_index: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    hits: Mapped[int] = mapped_column(Integer, default=0)
+    # Once the next window has ended the counter no longer affects any estimate
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
@@ -1,5 +1,5 @@
 from datetime import datetime, date, time
-from sqlalchemy import String, Text, Boolean, Date, Time, ForeignKey, DateTime, Enum, func
+from sqlalchemy import String, Text, Boolean, Date, Time, ForeignKey, DateTime, Enum, func, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -8,12 +8,15 @@ from app.core.constants import ResourceType
 
 class Session(Base):
     __tablename__ = "sessions"
+    __table_args__ = (
+        Index("ix_sessions_date_start_time", "date", "start_time"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     program_id: Mapped[int] = mapped_column(ForeignKey("programs.id"))
     title: Mapped[str] = mapped_column(String(255))
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
-    date: Mapped[date] = mapped_column(Date, index=True)
+    date: Mapped[date] = mapped_column(Date)
     start_time: Mapped[time] = mapped_column(Time)
     end_time: Mapped[time] = mapped_column(Time)
     google_meet_link: Mapped[str | None] = mapped_column(String(500), nullable=True)
@@ -1,5 +1,5 @@
-from datetime import datetime
-from sqlalchemy import String, BigInteger, Integer, ForeignKey, DateTime, func
+from datetime import date, datetime
+from sqlalchemy import String, BigInteger, Integer, ForeignKey, Date, DateTime, func, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -7,9 +7,12 @@ from app.database import Base
 
 class TelegramStat(Base):
     __tablename__ = "telegram_stats"
+    __table_args__ = (
+        UniqueConstraint("mentee_id", "program_id", name="uq_telegram_stats_mentee_program"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    mentee_id: Mapped[int] = mapped_column(ForeignKey("mentee_profiles.id"), index=True)
+    mentee_id: Mapped[int] = mapped_column(ForeignKey("mentee_profiles.id"))
     program_id: Mapped[int] = mapped_column(ForeignKey("programs.id"), index=True)
     message_count: Mapped[int] = mapped_column(Integer, default=0)
     created_at: Mapped[datetime] = mapped_column(
@@ -24,6 +27,27 @@ class TelegramStat(Base):
     program: Mapped["Program"] = relationship("Program", back_populates="telegram_stats")
 
 
+class TelegramDailyActivity(Base):
+    """Qualifying messages per mentee per day; TelegramStat holds the running total."""
+
+    __tablename__ = "telegram_daily_activity"
+    __table_args__ = (
+        UniqueConstraint(
+            "mentee_id", "program_id", "day", name="uq_telegram_daily_activity_mentee_program_day"
+        ),
+        Index("ix_telegram_daily_activity_program_day", "program_id", "day"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    mentee_id: Mapped[int] = mapped_column(ForeignKey("mentee_profiles.id"))
+    program_id: Mapped[int] = mapped_column(ForeignKey("programs.id"))
+    day: Mapped[date] = mapped_column(Date)  # UTC date the messages were sent
+    message_count: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
 class UnmappedTelegramUser(Base):
     __tablename__ = "unmapped_telegram_users"
 
@@ -36,3 +60,30 @@ class UnmappedTelegramUser(Base):
         DateTime(timezone=True), server_default=func.now()
     )
     message_count: Mapped[int] = mapped_column(Integer, default=0)  # Track messages while unmapped
+
+
+class TelegramBotState(Base):
+    """Per-bot ingestion checkpoint; the id is the numeric prefix of the bot token."""
+
+    __tablename__ = "telegram_bot_state"
+
+    bot_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    update_offset: Mapped[int] = mapped_column(BigInteger)  # Next getUpdates offset
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class TelegramProcessedUpdate(Base):
+    """Webhook update_ids already processed, kept long enough to catch redeliveries."""
+
+    __tablename__ = "telegram_processed_updates"
+    __table_args__ = (
+        Index("ix_telegram_processed_updates_processed_at", "processed_at"),
+    )
+
+    bot_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    update_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    processed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
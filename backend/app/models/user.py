@@ -15,7 +15,10 @@ class User(Base):
     role: Mapped[UserRole] = mapped_column(Enum(UserRole), default=UserRole.MENTEE)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     must_reset_password: Mapped[bool] = mapped_column(Boolean, default=True)
-    reset_token: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # SHA-256 hex digest; the token itself only appears in the reset email
+    reset_token_hash: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, unique=True, index=True
+    )
     reset_token_expires: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
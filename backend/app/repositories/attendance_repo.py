@@ -1,12 +1,29 @@
 from datetime import datetime
-from sqlalchemy import select, func
+from sqlalchemy import Row, Select, select, func, literal, literal_column, case
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models.attendance import Attendance, AttendanceCode
+from app.models.mentee import MenteeProfile
 from app.core.constants import AttendanceStatus
 from app.repositories.base import BaseRepository
 
+# Mentees without an attendance record for the session count as ABSENT
+ROSTER_STATUS = func.coalesce(
+    Attendance.status, literal(AttendanceStatus.ABSENT, Attendance.status.type)
+)
+# Roster order: PRESENT first, then PARTIAL, then ABSENT, then anything else
+ROSTER_STATUS_RANK = case(
+    {
+        AttendanceStatus.PRESENT: literal_column("0"),
+        AttendanceStatus.PARTIAL: literal_column("1"),
+        AttendanceStatus.ABSENT: literal_column("2"),
+    },
+    value=ROSTER_STATUS,
+    else_=literal_column("3"),
+)
+
 
 class AttendanceRepository(BaseRepository[Attendance]):
     def __init__(self, db: AsyncSession):
@@ -35,9 +52,11 @@ class AttendanceRepository(BaseRepository[Attendance]):
 
     async def get_mentee_attendance_counts(
         self, program_id: int, track: str | None = None
-    ) -> list[dict]:
-        """Get attendance counts per mentee for scoring."""
-        from app.models.mentee import MenteeProfile
+    ) -> list[Row]:
+        """
+        Get attendance counts per mentee for scoring, as
+        (mentee_id, mentee_program_id, full_name, track, present_count) rows.
+        """
         from app.models.session import Session
 
         query = (
@@ -64,21 +83,116 @@ class AttendanceRepository(BaseRepository[Attendance]):
         )
 
         if track:
-            query = query.where(MenteeProfile.track.ilike(track))
+            query = query.where(MenteeProfile.track == track)
+
+        result = await self.db.execute(query)
+        return list(result.all())
+
+    def _roster_query(self, session_id: int, *columns, track: str | None = None):
+        """Select from every mentee LEFT JOINed to their attendance for the session."""
+        query = (
+            select(*columns)
+            .select_from(MenteeProfile)
+            .outerjoin(
+                Attendance,
+                (Attendance.mentee_id == MenteeProfile.id)
+                & (Attendance.session_id == session_id),
+            )
+        )
+        if track:
+            query = query.where(MenteeProfile.track == track)
+        return query
+
+    def session_roster_query(
+        self,
+        session_id: int,
+        status: AttendanceStatus | None = None,
+        track: str | None = None,
+    ) -> Select:
+        """One roster row per mentee, ordered by status rank and name in SQL."""
+        query = self._roster_query(
+            session_id,
+            Attendance.id.label("attendance_id"),
+            MenteeProfile.id.label("mentee_profile_id"),
+            MenteeProfile.mentee_id,
+            MenteeProfile.full_name,
+            MenteeProfile.track,
+            ROSTER_STATUS.label("status"),
+            Attendance.joined_at,
+            Attendance.code_entered_at,
+            track=track,
+        ).order_by(ROSTER_STATUS_RANK, MenteeProfile.full_name, MenteeProfile.id)
+
+        if status:
+            query = query.where(ROSTER_STATUS == status)
+        return query
+
+    async def find_session_roster(
+        self,
+        session_id: int,
+        status: AttendanceStatus | None = None,
+        track: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[dict]:
+        """Get one roster row per mentee, ordered by status rank and name in SQL."""
+        query = self.session_roster_query(session_id, status=status, track=track)
+        if limit is not None:
+            query = query.limit(limit).offset(offset)
 
         result = await self.db.execute(query)
-        rows = result.all()
-
-        return [
-            {
-                "mentee_id": row.mentee_id,
-                "mentee_program_id": row.mentee_program_id,
-                "full_name": row.full_name,
-                "track": row.track,
-                "present_count": row.present_count or 0,
-            }
-            for row in rows
-        ]
+        return [row._asdict() for row in result.all()]
+
+    async def count_roster_statuses(
+        self, session_id: int, track: str | None = None
+    ) -> dict[AttendanceStatus, int]:
+        """Count every mentee's status for a session; mentees without a record are ABSENT."""
+        status = ROSTER_STATUS.label("status")
+        result = await self.db.execute(
+            self._roster_query(
+                session_id, status, func.count(MenteeProfile.id).label("count"), track=track
+            ).group_by(status)
+        )
+        return {row.status: row.count for row in result.all()}
+
+    async def upsert_statuses(
+        self,
+        session_id: int,
+        statuses: list[tuple[int, AttendanceStatus]],
+        now: datetime,
+    ) -> list[dict]:
+        """
+        Set the status of many mentees for a session in one INSERT ... ON CONFLICT.
+        New records get joined_at/code_entered_at like create_attendance; existing
+        records only change status. Each returned row says whether it was inserted.
+        """
+        if not statuses:
+            return []
+
+        stmt = insert(Attendance).values(
+            [
+                {
+                    "session_id": session_id,
+                    "mentee_id": mentee_id,
+                    "status": status,
+                    "joined_at": now if status != AttendanceStatus.ABSENT else None,
+                    "code_entered_at": now if status == AttendanceStatus.PRESENT else None,
+                }
+                for mentee_id, status in statuses
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_attendance_session_mentee",
+            set_={"status": stmt.excluded.status, "updated_at": func.now()},
+        ).returning(
+            Attendance.id,
+            Attendance.mentee_id,
+            Attendance.status,
+            # xmax is 0 only for rows this statement inserted
+            literal_column("xmax = 0").label("inserted"),
+        )
+        result = await self.db.execute(stmt)
+        return [row._asdict() for row in result.all()]
 
     async def update_status(
         self,
@@ -104,11 +218,15 @@ class AttendanceCodeRepository(BaseRepository[AttendanceCode]):
     async def get_active_code(
         self, session_id: int, current_time: datetime
     ) -> AttendanceCode | None:
+        # Latest-expiring code wins if a coordinator regenerated mid-window
         result = await self.db.execute(
-            select(AttendanceCode).where(
+            select(AttendanceCode)
+            .where(
                 AttendanceCode.session_id == session_id,
                 AttendanceCode.expires_at > current_time,
             )
+            .order_by(AttendanceCode.expires_at.desc())
+            .limit(1)
         )
         return result.scalar_one_or_none()
 
@@ -0,0 +1,158 @@
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import select, update, delete, or_, and_, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job
+from app.core.constants import JobStatus, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS
+from app.repositories.base import BaseRepository
+
+
+class JobRepository(BaseRepository[Job]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, Job)
+
+    async def enqueue(
+        self,
+        name: str,
+        payload: dict[str, Any],
+        dedup_key: str | None = None,
+        run_at: datetime | None = None,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+    ) -> int | None:
+        """Insert a job; returns None if a job with the same dedup_key exists."""
+        values = {
+            "name": name,
+            "payload": payload,
+            "dedup_key": dedup_key,
+            "status": JobStatus.PENDING,
+            "attempts": 0,
+            "max_attempts": max_attempts,
+        }
+        if run_at is not None:
+            values["run_at"] = run_at
+
+        result = await self.db.execute(
+            insert(Job)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[Job.dedup_key])
+            .returning(Job.id)
+        )
+        return result.scalar_one_or_none()
+
+    async def lease(
+        self, worker_id: str, limit: int, lease_seconds: int = JOB_LEASE_SECONDS
+    ) -> list[Job]:
+        """
+        Claim up to `limit` due jobs for a worker.
+        Jobs whose lease expired (worker died mid-run) are claimed again
+        until they run out of attempts; then they are marked FAILED, so a
+        job that crashes its worker doesn't take every worker down in turn.
+        SKIP LOCKED lets concurrent workers lease disjoint jobs without waiting.
+        """
+        now = func.now()
+        await self.db.execute(
+            update(Job)
+            .where(
+                Job.status == JobStatus.RUNNING,
+                Job.locked_until < now,
+                Job.attempts >= Job.max_attempts,
+            )
+            .values(
+                status=JobStatus.FAILED,
+                last_error="Lease expired on the final attempt",
+                locked_by=None,
+                locked_until=None,
+                finished_at=now,
+            )
+        )
+        due = (
+            select(Job.id)
+            .where(
+                or_(
+                    and_(Job.status == JobStatus.PENDING, Job.run_at <= now),
+                    and_(
+                        Job.status == JobStatus.RUNNING,
+                        Job.locked_until < now,
+                        Job.attempts < Job.max_attempts,
+                    ),
+                )
+            )
+            .order_by(Job.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(
+            update(Job)
+            .where(Job.id.in_(due.scalar_subquery()))
+            .values(
+                status=JobStatus.RUNNING,
+                attempts=Job.attempts + 1,
+                locked_by=worker_id,
+                locked_until=now + timedelta(seconds=lease_seconds),
+            )
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.scalars().all())
+
+    async def extend_lease(
+        self, job_id: int, worker_id: str, lease_seconds: int = JOB_LEASE_SECONDS
+    ) -> None:
+        await self.db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.locked_by == worker_id)
+            .values(locked_until=func.now() + timedelta(seconds=lease_seconds))
+        )
+
+    async def mark_succeeded(self, job_id: int, worker_id: str) -> None:
+        """Record success, unless the lease has passed to another worker."""
+        await self.db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.locked_by == worker_id)
+            .values(
+                status=JobStatus.SUCCEEDED,
+                locked_by=None,
+                locked_until=None,
+                finished_at=func.now(),
+            )
+        )
+
+    async def mark_failed(
+        self,
+        job_id: int,
+        worker_id: str,
+        error: str,
+        retry_at: datetime | None,
+        payload: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Record a failed attempt; the job is retried at retry_at, or FAILED if None.
+        A payload replaces the job's payload for the retry. Nothing is
+        recorded if the lease has passed to another worker.
+        """
+        values: dict[str, Any] = {
+            "last_error": error,
+            "locked_by": None,
+            "locked_until": None,
+        }
+        if payload is not None:
+            values["payload"] = payload
+        if retry_at is None:
+            values.update(status=JobStatus.FAILED, finished_at=func.now())
+        else:
+            values.update(status=JobStatus.PENDING, run_at=retry_at)
+        await self.db.execute(
+            update(Job).where(Job.id == job_id, Job.locked_by == worker_id).values(**values)
+        )
+
+    async def delete_finished_before(self, cutoff: datetime) -> int:
+        result = await self.db.execute(
+            delete(Job).where(
+                Job.status.in_([JobStatus.SUCCEEDED, JobStatus.FAILED]),
+                Job.finished_at < cutoff,
+            )
+        )
+        return result.rowcount
@@ -1,8 +1,23 @@
-from sqlalchemy import select
+from sqlalchemy import (
+    BigInteger,
+    Integer,
+    Row,
+    Select,
+    case,
+    column,
+    func,
+    literal_column,
+    or_,
+    select,
+    update,
+    values,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.constants import PROFILE_PIC_LOOKUP_BATCH_SIZE
 from app.models.mentee import MenteeProfile
+from app.models.user import User
 from app.repositories.base import BaseRepository
 
 
@@ -16,6 +31,17 @@ class MenteeRepository(BaseRepository[MenteeProfile]):
         )
         return result.scalar_one_or_none()
 
+    async def find_ids_by_mentee_ids(self, mentee_ids: list[str]) -> dict[str, int]:
+        """Map program mentee IDs to profile IDs; unknown IDs are left out."""
+        if not mentee_ids:
+            return {}
+        result = await self.db.execute(
+            select(MenteeProfile.mentee_id, MenteeProfile.id).where(
+                MenteeProfile.mentee_id.in_(mentee_ids)
+            )
+        )
+        return {row.mentee_id: row.id for row in result.all()}
+
     async def find_by_mentee_id_with_user(self, mentee_id: str) -> MenteeProfile | None:
         result = await self.db.execute(
             select(MenteeProfile)
@@ -67,24 +93,129 @@ class MenteeRepository(BaseRepository[MenteeProfile]):
         )
         return result.scalar_one_or_none()
 
-    async def find_all_with_user(
-        self, track: str | None = None, search: str | None = None
-    ) -> list[MenteeProfile]:
-        query = select(MenteeProfile).options(selectinload(MenteeProfile.user))
+    async def find_existing_ids(self, profile_ids: list[int]) -> set[int]:
+        result = await self.db.execute(
+            select(MenteeProfile.id).where(MenteeProfile.id.in_(profile_ids))
+        )
+        return set(result.scalars().all())
+
+    async def find_telegram_links(self, telegram_user_ids: list[int]) -> dict[int, int]:
+        """Profile ids already linked to the given Telegram users, keyed by telegram_user_id."""
+        result = await self.db.execute(
+            select(MenteeProfile.telegram_user_id, MenteeProfile.id).where(
+                MenteeProfile.telegram_user_id.in_(telegram_user_ids)
+            )
+        )
+        return dict(result.all())
+
+    async def find_unlinked_telegram_rows(self) -> list[Row]:
+        """(id, mentee_id, full_name, telegram_username) for mentees without a Telegram user id."""
+        result = await self.db.execute(
+            select(
+                MenteeProfile.id,
+                MenteeProfile.mentee_id,
+                MenteeProfile.full_name,
+                MenteeProfile.telegram_username,
+            ).where(MenteeProfile.telegram_user_id.is_(None))
+        )
+        return list(result.all())
+
+    async def set_telegram_user_ids(self, links: dict[int, int]) -> int:
+        """Set telegram_user_id for many profiles, keyed by profile id, in one UPDATE."""
+        link_values = values(
+            column("profile_id", Integer),
+            column("telegram_user_id", BigInteger),
+            name="links",
+        ).data(list(links.items()))
+        result = await self.db.execute(
+            update(MenteeProfile)
+            .where(MenteeProfile.id == link_values.c.profile_id)
+            .values(telegram_user_id=link_values.c.telegram_user_id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def find_profile_pic_urls_in_use(self, profile_pic_urls: list[str]) -> set[str]:
+        """The subset of the given picture URLs that some profile still references."""
+        in_use: set[str] = set()
+        for start in range(0, len(profile_pic_urls), PROFILE_PIC_LOOKUP_BATCH_SIZE):
+            batch = profile_pic_urls[start:start + PROFILE_PIC_LOOKUP_BATCH_SIZE]
+            result = await self.db.execute(
+                select(MenteeProfile.profile_pic_url)
+                .where(MenteeProfile.profile_pic_url.in_(batch))
+                .distinct()
+            )
+            in_use.update(result.scalars().all())
+        return in_use
 
+    def _filter_and_rank(self, query: Select, track: str | None, search: str | None) -> Select:
+        """
+        Order by name, or rank by relevance when searching.
+        Substring matches are served by the pg_trgm GIN indexes on full_name
+        and mentee_id; prefix matches rank first, then trigram similarity.
+        """
         if track:
             query = query.where(MenteeProfile.track == track)
 
-        if search:
-            search_pattern = f"%{search}%"
-            query = query.where(
-                (MenteeProfile.full_name.ilike(search_pattern))
-                | (MenteeProfile.mentee_id.ilike(search_pattern))
+        search = search.strip() if search else None
+        if not search:
+            return query.order_by(MenteeProfile.full_name, MenteeProfile.id)
+
+        return query.where(
+            or_(
+                MenteeProfile.full_name.icontains(search, autoescape=True),
+                MenteeProfile.mentee_id.icontains(search, autoescape=True),
             )
+        ).order_by(
+            case(
+                (
+                    or_(
+                        MenteeProfile.mentee_id.istartswith(search, autoescape=True),
+                        MenteeProfile.full_name.istartswith(search, autoescape=True),
+                    ),
+                    literal_column("0"),
+                ),
+                else_=literal_column("1"),
+            ),
+            func.greatest(
+                func.similarity(MenteeProfile.full_name, search),
+                func.similarity(MenteeProfile.mentee_id, search),
+            ).desc(),
+            MenteeProfile.full_name,
+            MenteeProfile.id,
+        )
+
+    def list_rows_query(self, track: str | None = None, search: str | None = None) -> Select:
+        """Flat column rows for the mentee list, ordered by name or ranked by relevance when searching."""
+        return self._filter_and_rank(
+            select(
+                MenteeProfile.id,
+                MenteeProfile.mentee_id,
+                MenteeProfile.full_name,
+                User.email,
+                MenteeProfile.track,
+                MenteeProfile.profile_pic_url,
+                MenteeProfile.telegram_user_id,
+                MenteeProfile.created_at,
+            ).join(User, User.id == MenteeProfile.user_id),
+            track,
+            search,
+        )
+
+    async def find_list_rows(
+        self,
+        track: str | None = None,
+        search: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[Row]:
+        """Read-only mentee list rows, without loading ORM entities."""
+        query = self.list_rows_query(track, search).offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
 
-        query = query.order_by(MenteeProfile.full_name)
         result = await self.db.execute(query)
-        return list(result.scalars().all())
+        return list(result.all())
 
     async def create_profile(
         self,
@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.rate_limit import RateLimitCounter
+from app.repositories.base import BaseRepository
+
+
+class RateLimitRepository(BaseRepository[RateLimitCounter]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, RateLimitCounter)
+
+    async def hit(
+        self, key: str, window_index: int, expires_at: datetime
+    ) -> tuple[int, int]:
+        """
+        Count one request in a window, in a single statement.
+        Returns (previous window's hits, this window's hits including this one).
+        """
+        current = (
+            insert(RateLimitCounter)
+            .values(key=key, window_index=window_index, hits=1, expires_at=expires_at)
+            .on_conflict_do_update(
+                index_elements=[RateLimitCounter.key, RateLimitCounter.window_index],
+                set_={"hits": RateLimitCounter.hits + 1},
+            )
+            .returning(RateLimitCounter.hits)
+            .cte("current")
+        )
+        previous = (
+            select(RateLimitCounter.hits)
+            .where(
+                RateLimitCounter.key == key,
+                RateLimitCounter.window_index == window_index - 1,
+            )
+            .scalar_subquery()
+        )
+        result = await self.db.execute(select(func.coalesce(previous, 0), current.c.hits))
+        previous_hits, current_hits = result.one()
+        return previous_hits, current_hits
+
+    async def delete_expired(self, now: datetime) -> int:
+        result = await self.db.execute(
+            delete(RateLimitCounter).where(RateLimitCounter.expires_at < now)
+        )
+        return result.rowcount
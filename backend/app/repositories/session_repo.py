@@ -1,5 +1,5 @@
 from datetime import date, time
-from sqlalchemy import select, and_, or_
+from sqlalchemy import Row, select, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -19,17 +19,50 @@ class SessionRepository(BaseRepository[Session]):
         )
         return result.scalar_one_or_none()
 
-    async def find_all_by_program(
+    async def find_list_rows(
         self, program_id: int | None = None
-    ) -> list[Session]:
-        query = select(Session).options(selectinload(Session.resources))
-
+    ) -> tuple[list[Row], dict[int, list[Row]]]:
+        """
+        Read-only session list rows and their resource rows grouped by
+        session id, in two column queries without loading ORM entities.
+        """
+        query = select(
+            Session.id,
+            Session.program_id,
+            Session.title,
+            Session.description,
+            Session.date,
+            Session.start_time,
+            Session.end_time,
+            Session.google_meet_link,
+            Session.is_core_session,
+            Session.created_at,
+        )
         if program_id:
             query = query.where(Session.program_id == program_id)
+        result = await self.db.execute(query.order_by(Session.date, Session.start_time))
+        sessions = list(result.all())
 
-        query = query.order_by(Session.date, Session.start_time)
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
+        resource_query = select(
+            SessionResource.id,
+            SessionResource.session_id,
+            SessionResource.type,
+            SessionResource.title,
+            SessionResource.url,
+            SessionResource.speaker_name,
+            SessionResource.speaker_bio,
+            SessionResource.speaker_linkedin,
+            SessionResource.created_at,
+        ).order_by(SessionResource.id)
+        if program_id:
+            resource_query = resource_query.join(
+                Session, Session.id == SessionResource.session_id
+            ).where(Session.program_id == program_id)
+        resources: dict[int, list[Row]] = {}
+        for row in (await self.db.execute(resource_query)).all():
+            resources.setdefault(row.session_id, []).append(row)
+
+        return sessions, resources
 
     async def find_upcoming_session(
         self, today: date, current_time: time
@@ -1,7 +1,16 @@
-from sqlalchemy import select
+from datetime import date, datetime
+
+from sqlalchemy import BigInteger, Integer, Row, column, delete, func, literal, select, values
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.telegram import TelegramStat, UnmappedTelegramUser
+from app.models.telegram import (
+    TelegramStat,
+    TelegramDailyActivity,
+    TelegramBotState,
+    TelegramProcessedUpdate,
+    UnmappedTelegramUser,
+)
 from app.repositories.base import BaseRepository
 
 
@@ -21,34 +30,138 @@ class TelegramStatsRepository(BaseRepository[TelegramStat]):
         return result.scalar_one_or_none()
 
     async def get_stats_by_program(
-        self, program_id: int, track: str | None = None
-    ) -> list[TelegramStat]:
+        self, program_id: int, track: str | None = None, since: date | None = None
+    ) -> list[Row]:
+        """
+        Message counts per mentee as (mentee_id, message_count) rows.
+
+        Without `since` these are the all-time totals; with it, the daily
+        activity rollup from that UTC day onwards.
+        """
         from app.models.mentee import MenteeProfile
 
-        query = (
-            select(TelegramStat)
-            .join(MenteeProfile, MenteeProfile.id == TelegramStat.mentee_id)
-            .where(TelegramStat.program_id == program_id)
-        )
+        if since is None:
+            query = select(
+                TelegramStat.mentee_id, TelegramStat.message_count
+            ).where(TelegramStat.program_id == program_id)
+            mentee_column = TelegramStat.mentee_id
+        else:
+            query = (
+                select(
+                    TelegramDailyActivity.mentee_id,
+                    func.sum(TelegramDailyActivity.message_count).label("message_count"),
+                )
+                .where(
+                    TelegramDailyActivity.program_id == program_id,
+                    TelegramDailyActivity.day >= since,
+                )
+                .group_by(TelegramDailyActivity.mentee_id)
+            )
+            mentee_column = TelegramDailyActivity.mentee_id
 
         if track:
-            query = query.where(MenteeProfile.track == track)
+            query = query.join(
+                MenteeProfile, MenteeProfile.id == mentee_column
+            ).where(MenteeProfile.track == track)
 
         result = await self.db.execute(query)
-        return list(result.scalars().all())
+        return list(result.all())
 
-    async def increment_count(self, mentee_id: int, program_id: int) -> TelegramStat:
-        stat = await self.find_by_mentee_and_program(mentee_id, program_id)
-        if stat:
-            stat.message_count += 1
-            await self.db.flush()
-            return stat
-        else:
-            return await self.create(
-                mentee_id=mentee_id,
-                program_id=program_id,
-                message_count=1,
+    async def add_counts(self, counts: dict[tuple[int, int], int]) -> None:
+        """Add message counts to the totals, keyed by (mentee_id, program_id), in one statement."""
+        stmt = insert(TelegramStat).values([
+            {"mentee_id": mentee_id, "program_id": program_id, "message_count": count}
+            for (mentee_id, program_id), count in counts.items()
+        ])
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_telegram_stats_mentee_program",
+                set_={
+                    "message_count": TelegramStat.message_count + stmt.excluded.message_count,
+                    "updated_at": func.now(),
+                },
             )
+        )
+
+    async def increment_count(
+        self, mentee_id: int, program_id: int, amount: int = 1
+    ) -> TelegramStat:
+        """Add to a mentee's total in one race-free INSERT ... ON CONFLICT statement."""
+        stmt = insert(TelegramStat).values(
+            mentee_id=mentee_id, program_id=program_id, message_count=amount
+        )
+        result = await self.db.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_telegram_stats_mentee_program",
+                set_={
+                    "message_count": TelegramStat.message_count + stmt.excluded.message_count,
+                    "updated_at": func.now(),
+                },
+            )
+            .returning(TelegramStat)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one()
+
+
+    async def transfer_unmapped_counts(
+        self, links: dict[int, int], program_id: int
+    ) -> None:
+        """
+        Add each unmapped user's message count to their mentee's total in one
+        statement; links maps telegram_user_id to mentee profile id.
+        """
+        link_values = values(
+            column("telegram_user_id", BigInteger),
+            column("mentee_id", Integer),
+            name="links",
+        ).data(list(links.items()))
+        counts = (
+            select(
+                link_values.c.mentee_id,
+                literal(program_id),
+                UnmappedTelegramUser.message_count,
+            )
+            .join(
+                UnmappedTelegramUser,
+                UnmappedTelegramUser.telegram_user_id == link_values.c.telegram_user_id,
+            )
+            .where(UnmappedTelegramUser.message_count > 0)
+        )
+        stmt = insert(TelegramStat).from_select(
+            ["mentee_id", "program_id", "message_count"], counts
+        )
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_telegram_stats_mentee_program",
+                set_={
+                    "message_count": TelegramStat.message_count + stmt.excluded.message_count,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+
+class TelegramActivityRepository(BaseRepository[TelegramDailyActivity]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, TelegramDailyActivity)
+
+    async def add_counts(self, counts: dict[tuple[int, int, date], int]) -> None:
+        """Add message counts keyed by (mentee_id, program_id, day) in one statement."""
+        stmt = insert(TelegramDailyActivity).values([
+            {"mentee_id": mentee_id, "program_id": program_id, "day": day, "message_count": count}
+            for (mentee_id, program_id, day), count in counts.items()
+        ])
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_telegram_daily_activity_mentee_program_day",
+                set_={
+                    "message_count": TelegramDailyActivity.message_count
+                    + stmt.excluded.message_count,
+                    "updated_at": func.now(),
+                },
+            )
+        )
 
 
 class UnmappedTelegramUserRepository(BaseRepository[UnmappedTelegramUser]):
@@ -65,6 +178,25 @@ class UnmappedTelegramUserRepository(BaseRepository[UnmappedTelegramUser]):
         )
         return result.scalar_one_or_none()
 
+    async def find_match_rows(self) -> list[Row]:
+        """(telegram_user_id, username, display_name, message_count) for every unmapped user."""
+        result = await self.db.execute(
+            select(
+                UnmappedTelegramUser.telegram_user_id,
+                UnmappedTelegramUser.username,
+                UnmappedTelegramUser.display_name,
+                UnmappedTelegramUser.message_count,
+            )
+        )
+        return list(result.all())
+
+    async def delete_by_telegram_ids(self, telegram_user_ids: list[int]) -> None:
+        await self.db.execute(
+            delete(UnmappedTelegramUser).where(
+                UnmappedTelegramUser.telegram_user_id.in_(telegram_user_ids)
+            )
+        )
+
     async def find_all_ordered(self) -> list[UnmappedTelegramUser]:
         result = await self.db.execute(
             select(UnmappedTelegramUser).order_by(
@@ -80,18 +212,71 @@ class UnmappedTelegramUserRepository(BaseRepository[UnmappedTelegramUser]):
         telegram_username: str | None,
         chat_id: int,
     ) -> UnmappedTelegramUser:
-        existing = await self.find_by_telegram_id(telegram_user_id)
-        if existing:
-            existing.display_name = telegram_name
-            existing.username = telegram_username
-            existing.message_count += 1
-            await self.db.flush()
-            return existing
-        else:
-            return await self.create(
-                telegram_user_id=telegram_user_id,
-                display_name=telegram_name,
-                username=telegram_username,
-                chat_id=chat_id,
-                message_count=1,
+        """Record a message from an unmapped user in one race-free INSERT ... ON CONFLICT statement."""
+        stmt = insert(UnmappedTelegramUser).values(
+            telegram_user_id=telegram_user_id,
+            display_name=telegram_name,
+            username=telegram_username,
+            chat_id=chat_id,
+            message_count=1,
+        )
+        result = await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[UnmappedTelegramUser.telegram_user_id],
+                set_={
+                    "display_name": stmt.excluded.display_name,
+                    "username": stmt.excluded.username,
+                    "message_count": UnmappedTelegramUser.message_count + 1,
+                },
             )
+            .returning(UnmappedTelegramUser)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one()
+
+
+class TelegramBotStateRepository(BaseRepository[TelegramBotState]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, TelegramBotState)
+
+    async def get_offset(self, bot_id: int) -> int | None:
+        result = await self.db.execute(
+            select(TelegramBotState.update_offset).where(TelegramBotState.bot_id == bot_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def save_offset(self, bot_id: int, update_offset: int) -> None:
+        stmt = insert(TelegramBotState).values(bot_id=bot_id, update_offset=update_offset)
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[TelegramBotState.bot_id],
+                set_={"update_offset": stmt.excluded.update_offset, "updated_at": func.now()},
+            )
+        )
+
+
+class TelegramProcessedUpdateRepository(BaseRepository[TelegramProcessedUpdate]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, TelegramProcessedUpdate)
+
+    async def claim(self, bot_id: int, update_id: int) -> bool:
+        """
+        Record update_id as processed. Returns False when it already was.
+        A concurrent delivery of the same update waits on the unique key
+        and gets False once the first transaction commits.
+        """
+        result = await self.db.execute(
+            insert(TelegramProcessedUpdate)
+            .values(bot_id=bot_id, update_id=update_id)
+            .on_conflict_do_nothing(
+                index_elements=[TelegramProcessedUpdate.bot_id, TelegramProcessedUpdate.update_id]
+            )
+            .returning(TelegramProcessedUpdate.update_id)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def delete_processed_before(self, cutoff: datetime) -> int:
+        result = await self.db.execute(
+            delete(TelegramProcessedUpdate).where(TelegramProcessedUpdate.processed_at < cutoff)
+        )
+        return result.rowcount
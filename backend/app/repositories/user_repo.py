@@ -1,7 +1,8 @@
-from sqlalchemy import select
+from sqlalchemy import case, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import contains_eager, selectinload
 
+from app.models.mentee import MenteeProfile
 from app.models.user import User
 from app.repositories.base import BaseRepository
 
@@ -16,6 +17,14 @@ class UserRepository(BaseRepository[User]):
         )
         return result.scalar_one_or_none()
 
+    async def find_by_id_with_profile(self, user_id: int) -> User | None:
+        result = await self.db.execute(
+            select(User)
+            .options(selectinload(User.mentee_profile))
+            .where(User.id == user_id)
+        )
+        return result.scalar_one_or_none()
+
     async def find_by_email_with_profile(self, email: str) -> User | None:
         result = await self.db.execute(
             select(User)
@@ -24,11 +33,31 @@ class UserRepository(BaseRepository[User]):
         )
         return result.scalar_one_or_none()
 
-    async def find_by_reset_token(self, token: str) -> User | None:
+    async def find_by_login_identifier(self, identifier: str) -> User | None:
+        """
+        Find a user by email (coordinators) or mentee_id (mentees) in one
+        query, with the mentee profile loaded. An email match wins if both match.
+        """
+        # Each branch is an index lookup; an OR across the join would scan
+        matching_ids = union_all(
+            select(User.id).where(User.email == identifier.lower()),
+            select(MenteeProfile.user_id).where(MenteeProfile.mentee_id == identifier),
+        ).subquery()
+        result = await self.db.execute(
+            select(User)
+            .outerjoin(User.mentee_profile)
+            .options(contains_eager(User.mentee_profile))
+            .where(User.id.in_(select(matching_ids.c.id)))
+            .order_by(case((User.email == identifier.lower(), 0), else_=1))
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def find_by_reset_token_hash(self, token_hash: str) -> User | None:
         result = await self.db.execute(
             select(User)
             .options(selectinload(User.mentee_profile))
-            .where(User.reset_token == token)
+            .where(User.reset_token_hash == token_hash)
         )
         return result.scalar_one_or_none()
 
@@ -54,6 +54,47 @@ class AttendanceOverrideRequest(BaseModel):
     status: AttendanceStatus
 
 
+class BulkAttendanceRow(BaseModel):
+    mentee_id: str  # Program mentee ID, e.g. KPDF-001
+    status: str
+
+
+class BulkAttendanceRequest(BaseModel):
+    rows: list[BulkAttendanceRow]
+
+
+class BulkAttendanceRowResult(BaseModel):
+    row: int
+    mentee_id: str
+    status: AttendanceStatus | None
+    result: str  # "created", "updated" or "error"
+    attendance_id: int | None
+    error: str | None
+
+
+class BulkAttendanceResultResponse(BaseModel):
+    session_id: int
+    total: int
+    created: int
+    updated: int
+    failed: int
+    results: list[BulkAttendanceRowResult]
+
+    @classmethod
+    def from_results(
+        cls, session_id: int, results: list[dict]
+    ) -> "BulkAttendanceResultResponse":
+        outcomes = [result["result"] for result in results]
+        return cls(
+            session_id=session_id,
+            total=len(results),
+            created=outcomes.count("created"),
+            updated=outcomes.count("updated"),
+            failed=outcomes.count("error"),
+            results=[BulkAttendanceRowResult(**result) for result in results],
+        )
+
+
 class MenteeAttendanceDetailResponse(BaseModel):
     attendance_id: int | None
     mentee_profile_id: int
@@ -76,3 +117,39 @@ class MenteeAttendanceDetailResponse(BaseModel):
             joined_at=attendance.joined_at,
             code_entered_at=attendance.code_entered_at,
         )
+
+    @classmethod
+    def from_row(cls, row: dict) -> "MenteeAttendanceDetailResponse":
+        """Build from an AttendanceRepository.find_session_roster row."""
+        return cls(
+            attendance_id=row["attendance_id"],
+            mentee_profile_id=row["mentee_profile_id"],
+            mentee_id=row["mentee_id"],
+            full_name=row["full_name"],
+            track=row["track"],
+            status=row["status"],
+            joined_at=row["joined_at"],
+            code_entered_at=row["code_entered_at"],
+        )
+
+
+class SessionAttendanceSummaryResponse(BaseModel):
+    session_id: int
+    total: int
+    present: int
+    partial: int
+    absent: int
+    not_joined: int
+
+    @classmethod
+    def from_counts(
+        cls, session_id: int, counts: dict[AttendanceStatus, int]
+    ) -> "SessionAttendanceSummaryResponse":
+        return cls(
+            session_id=session_id,
+            total=sum(counts.values()),
+            present=counts.get(AttendanceStatus.PRESENT, 0),
+            partial=counts.get(AttendanceStatus.PARTIAL, 0),
+            absent=counts.get(AttendanceStatus.ABSENT, 0),
+            not_joined=counts.get(AttendanceStatus.NOT_JOINED, 0),
+        )
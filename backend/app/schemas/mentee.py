@@ -1,7 +1,9 @@
 from datetime import datetime
 from pydantic import BaseModel, ConfigDict
+from sqlalchemy import Row
 
 from app.models.mentee import MenteeProfile
+from app.services.upload_service import thumbnail_url
 
 
 class MenteeProfileResponse(BaseModel):
@@ -11,6 +13,7 @@ class MenteeProfileResponse(BaseModel):
     email: str
     track: str
     profile_pic_url: str | None
+    profile_pic_thumb_url: str | None
     telegram_user_id: int | None
     created_at: datetime
 
@@ -25,15 +28,47 @@ class MenteeProfileResponse(BaseModel):
             email=profile.user.email,
             track=profile.track,
             profile_pic_url=profile.profile_pic_url,
+            profile_pic_thumb_url=thumbnail_url(profile.profile_pic_url),
             telegram_user_id=profile.telegram_user_id,
             created_at=profile.created_at,
         )
 
+    @classmethod
+    def from_row(cls, row: Row) -> "MenteeProfileResponse":
+        """Build from a MenteeRepository.list_rows_query row."""
+        return cls(
+            id=row.id,
+            mentee_id=row.mentee_id,
+            full_name=row.full_name,
+            email=row.email,
+            track=row.track,
+            profile_pic_url=row.profile_pic_url,
+            profile_pic_thumb_url=thumbnail_url(row.profile_pic_url),
+            telegram_user_id=row.telegram_user_id,
+            created_at=row.created_at,
+        )
+
 
 class MenteeProfileUpdateRequest(BaseModel):
     profile_pic_url: str | None = None
 
 
+class ProfilePictureUploadRequest(BaseModel):
+    content_type: str
+    filename: str
+
+
+class ProfilePictureUploadResponse(BaseModel):
+    """Presigned POST: send the file as multipart form data with these fields."""
+    url: str
+    fields: dict[str, str]
+    key: str
+
+
+class ProfilePictureConfirmRequest(BaseModel):
+    key: str
+
+
 class MenteeAdminUpdateRequest(BaseModel):
     full_name: str | None = None
     track: str | None = None
@@ -1,5 +1,6 @@
 from datetime import datetime, date as date_type, time as time_type, timezone
 from pydantic import BaseModel, ConfigDict
+from sqlalchemy import Row
 
 from app.core.constants import ResourceType
 from app.models.session import Session, SessionResource
@@ -32,6 +33,21 @@ class SessionResourceResponse(BaseModel):
             created_at=resource.created_at,
         )
 
+    @classmethod
+    def from_row(cls, row: Row) -> "SessionResourceResponse":
+        """Build from a SessionRepository.find_list_rows resource row."""
+        return cls(
+            id=row.id,
+            session_id=row.session_id,
+            type=row.type,
+            title=row.title,
+            url=row.url,
+            speaker_name=row.speaker_name,
+            speaker_bio=row.speaker_bio,
+            speaker_linkedin=row.speaker_linkedin,
+            created_at=row.created_at,
+        )
+
 
 class SessionResourceCreateRequest(BaseModel):
     type: ResourceType
@@ -75,6 +91,23 @@ class SessionResponse(BaseModel):
             ],
         )
 
+    @classmethod
+    def from_row(cls, row: Row, resources: list[Row]) -> "SessionResponse":
+        """Build from SessionRepository.find_list_rows rows."""
+        return cls(
+            id=row.id,
+            program_id=row.program_id,
+            title=row.title,
+            description=row.description,
+            date=row.date,
+            start_time=row.start_time,
+            end_time=row.end_time,
+            google_meet_link=row.google_meet_link,
+            is_core_session=row.is_core_session,
+            created_at=row.created_at,
+            resources=[SessionResourceResponse.from_row(r) for r in resources],
+        )
+
 
 class SessionCreateRequest(BaseModel):
     program_id: int
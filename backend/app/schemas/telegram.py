@@ -2,6 +2,7 @@ from datetime import datetime
 from pydantic import BaseModel, ConfigDict
 
 from app.models.telegram import UnmappedTelegramUser
+from app.services.telegram_match_service import MatchCandidate
 
 
 class TelegramMapRequest(BaseModel):
@@ -9,6 +10,38 @@ class TelegramMapRequest(BaseModel):
     mentee_profile_id: int
 
 
+class TelegramBulkMapRequest(BaseModel):
+    mappings: list[TelegramMapRequest]
+
+
+class TelegramMatchSuggestionResponse(BaseModel):
+    telegram_user_id: int
+    telegram_username: str | None
+    telegram_display_name: str | None
+    message_count: int
+    mentee_profile_id: int
+    mentee_id: str
+    full_name: str
+    score: float
+    reason: str
+
+    @classmethod
+    def from_candidate(
+        cls, candidate: MatchCandidate
+    ) -> "TelegramMatchSuggestionResponse":
+        return cls(
+            telegram_user_id=candidate.telegram_user_id,
+            telegram_username=candidate.telegram_username,
+            telegram_display_name=candidate.telegram_display_name,
+            message_count=candidate.message_count,
+            mentee_profile_id=candidate.mentee_profile_id,
+            mentee_id=candidate.mentee_id,
+            full_name=candidate.full_name,
+            score=candidate.score,
+            reason=candidate.reason,
+        )
+
+
 class UnmappedTelegramUserResponse(BaseModel):
     id: int
     telegram_user_id: int
@@ -1,10 +1,13 @@
+import asyncio
 import secrets
 import string
 from datetime import datetime, timezone, timedelta
+from sqlalchemy import Select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.constants import (
     AttendanceStatus,
+    BULK_ATTENDANCE_MAX_ROWS,
     CODE_EXPIRATION_MINUTES,
     CODE_PREFIX,
     CODE_LENGTH,
@@ -16,11 +19,24 @@ from app.core.exceptions import (
     AlreadyPresentError,
     CodeWindowClosedError,
     InvalidCodeError,
+    TooManyRowsError,
 )
 from app.repositories.attendance_repo import AttendanceRepository, AttendanceCodeRepository
 from app.repositories.session_repo import SessionRepository
 from app.repositories.mentee_repo import MenteeRepository
+from app.database import AsyncSessionLocal
 from app.models.attendance import Attendance, AttendanceCode
+from app.services.code_window_service import code_window_cache
+from app.services.event_service import (
+    event_bus,
+    publish_after_commit,
+    run_after_commit,
+    session_channel,
+)
+
+# Roster counts are recomputed at most once per interval per session
+ROSTER_COUNTS_DEBOUNCE_SECONDS = 1.0
+_roster_counts_scheduled: set[int] = set()
 
 
 def generate_attendance_code() -> str:
@@ -32,6 +48,32 @@ def generate_attendance_code() -> str:
     return f"{CODE_PREFIX}-{random_part}"
 
 
+def schedule_roster_counts(session_id: int) -> None:
+    """Publish updated roster counts for a session, coalescing bursts of changes."""
+    if session_id in _roster_counts_scheduled:
+        return
+    _roster_counts_scheduled.add(session_id)
+    loop = asyncio.get_running_loop()
+    loop.call_later(
+        ROSTER_COUNTS_DEBOUNCE_SECONDS,
+        lambda: loop.create_task(_publish_roster_counts(session_id)),
+    )
+
+
+async def _publish_roster_counts(session_id: int) -> None:
+    _roster_counts_scheduled.discard(session_id)
+    async with AsyncSessionLocal() as db:
+        counts = await AttendanceRepository(db).count_roster_statuses(session_id)
+    event_bus.publish(
+        session_channel(session_id),
+        {
+            "type": "roster_counts",
+            "session_id": session_id,
+            "counts": {status.value: count for status, count in counts.items()},
+        },
+    )
+
+
 class AttendanceService:
     def __init__(self, db: AsyncSession):
         self.repo = AttendanceRepository(db)
@@ -40,6 +82,29 @@ class AttendanceService:
         self.mentee_repo = MenteeRepository(db)
         self.db = db
 
+    def _publish_attendance_change(self, attendance: Attendance) -> None:
+        """Notify subscribers of a status change once the transaction commits."""
+        self._publish_status_change(
+            attendance.session_id, attendance.id, attendance.mentee_id, attendance.status
+        )
+
+    def _publish_status_change(
+        self,
+        session_id: int,
+        attendance_id: int,
+        mentee_profile_id: int,
+        status: AttendanceStatus,
+    ) -> None:
+        publish_after_commit(
+            self.db, session_channel(session_id), "attendance_changed",
+            session_id=session_id,
+            attendance_id=attendance_id,
+            mentee_profile_id=mentee_profile_id,
+            status=status.value,
+        )
+        # Debounced, so a bulk change recomputes the counts once
+        run_after_commit(self.db, lambda: schedule_roster_counts(session_id))
+
     async def get_mentee_attendance(
         self, user_id: int, session_id: int
     ) -> Attendance | None:
@@ -82,15 +147,18 @@ class AttendanceService:
             existing.status = AttendanceStatus.PARTIAL
             existing.joined_at = now
             await self.db.flush()
+            self._publish_attendance_change(existing)
             return existing
 
         # Create new attendance record
-        return await self.repo.create(
+        attendance = await self.repo.create(
             session_id=session_id,
             mentee_id=mentee.id,
             status=AttendanceStatus.PARTIAL,
             joined_at=now,
         )
+        self._publish_attendance_change(attendance)
+        return attendance
 
     async def submit_code(
         self, user_id: int, session_id: int, code: str
@@ -123,11 +191,13 @@ class AttendanceService:
             raise InvalidCodeError()
 
         # Update attendance to PRESENT
-        return await self.repo.update_status(
+        attendance = await self.repo.update_status(
             attendance.id,
             status=AttendanceStatus.PRESENT,
             code_submitted_at=now,
         )
+        self._publish_attendance_change(attendance)
+        return attendance
 
     async def generate_code(self, session_id: int) -> AttendanceCode:
         """
@@ -150,61 +220,78 @@ class AttendanceService:
                 break
             code = generate_attendance_code()
 
-        return await self.code_repo.create(
+        attendance_code = await self.code_repo.create(
             session_id=session_id,
             code=code,
             generated_at=now,
             expires_at=expires_at,
         )
+        # Only a committed code may be announced to polling mentees
+        run_after_commit(self.db, lambda: code_window_cache.open(session_id, expires_at))
 
-    async def get_session_attendance(self, session_id: int) -> list[dict]:
+        channel = session_channel(session_id)
+        publish_after_commit(
+            self.db, channel, "code_generated",
+            session_id=session_id, expires_at=expires_at.isoformat(),
+        )
+        run_after_commit(
+            self.db,
+            lambda: event_bus.publish_later(
+                CODE_EXPIRATION_MINUTES * 60,
+                channel,
+                {
+                    "type": "code_expired",
+                    "session_id": session_id,
+                    "expires_at": expires_at.isoformat(),
+                },
+            ),
+        )
+        return attendance_code
+
+    async def get_session_attendance(
+        self,
+        session_id: int,
+        status: AttendanceStatus | None = None,
+        track: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[dict]:
         """
-        Get attendance details for all mentees for a session.
+        Get attendance details for mentees for a session.
         Returns a list of dicts with attendance info for every mentee,
-        including those who haven't joined (ABSENT).
+        including those who haven't joined (ABSENT), ordered PRESENT first,
+        then PARTIAL, then ABSENT, then by name.
         """
         session = await self.session_repo.find_by_id(session_id)
         if session is None:
             raise NotFoundError("Session", session_id)
 
-        # Get existing attendance records
-        attendances = await self.repo.find_by_session_with_mentees(session_id)
-        attendance_by_mentee = {a.mentee_id: a for a in attendances}
-
-        # Get all mentees
-        all_mentees = await self.mentee_repo.find_all()
-
-        result = []
-        for mentee in all_mentees:
-            attendance = attendance_by_mentee.get(mentee.id)
-            if attendance:
-                result.append({
-                    "attendance_id": attendance.id,
-                    "mentee_profile_id": mentee.id,
-                    "mentee_id": mentee.mentee_id,
-                    "full_name": mentee.full_name,
-                    "track": mentee.track,
-                    "status": attendance.status,
-                    "joined_at": attendance.joined_at,
-                    "code_entered_at": attendance.code_entered_at,
-                })
-            else:
-                result.append({
-                    "attendance_id": None,
-                    "mentee_profile_id": mentee.id,
-                    "mentee_id": mentee.mentee_id,
-                    "full_name": mentee.full_name,
-                    "track": mentee.track,
-                    "status": AttendanceStatus.ABSENT,
-                    "joined_at": None,
-                    "code_entered_at": None,
-                })
-
-        # Sort by status (PRESENT first, then PARTIAL, then ABSENT)
-        status_order = {AttendanceStatus.PRESENT: 0, AttendanceStatus.PARTIAL: 1, AttendanceStatus.ABSENT: 2}
-        result.sort(key=lambda x: (status_order.get(x["status"], 3), x["full_name"]))
-
-        return result
+        return await self.repo.find_session_roster(
+            session_id, status=status, track=track, limit=limit, offset=offset
+        )
+
+    async def get_session_roster_query(
+        self,
+        session_id: int,
+        status: AttendanceStatus | None = None,
+        track: str | None = None,
+    ) -> Select:
+        """Query for a session's full roster as flat rows, for streaming exports."""
+        session = await self.session_repo.find_by_id(session_id)
+        if session is None:
+            raise NotFoundError("Session", session_id)
+
+        return self.repo.session_roster_query(session_id, status=status, track=track)
+
+    async def get_session_attendance_summary(
+        self, session_id: int, track: str | None = None
+    ) -> dict[AttendanceStatus, int]:
+        """Count mentees per attendance status for a session."""
+        session = await self.session_repo.find_by_id(session_id)
+        if session is None:
+            raise NotFoundError("Session", session_id)
+
+        return await self.repo.count_roster_statuses(session_id, track=track)
 
     async def override_attendance(
         self, attendance_id: int, status: AttendanceStatus
@@ -214,7 +301,9 @@ class AttendanceService:
         if attendance is None:
             raise NotFoundError("Attendance", attendance_id)
 
-        return await self.repo.update_status(attendance.id, status=status)
+        attendance = await self.repo.update_status(attendance.id, status=status)
+        self._publish_attendance_change(attendance)
+        return attendance
 
     async def create_attendance(
         self, session_id: int, mentee_id: int, status: AttendanceStatus
@@ -234,13 +323,78 @@ class AttendanceService:
         existing = await self.repo.find_by_user_and_session(mentee_id, session_id)
         if existing:
             # Update existing record instead
-            return await self.repo.update_status(existing.id, status=status)
+            attendance = await self.repo.update_status(existing.id, status=status)
+        else:
+            now = datetime.now(timezone.utc)
+            attendance = await self.repo.create(
+                session_id=session_id,
+                mentee_id=mentee_id,
+                status=status,
+                joined_at=now if status != AttendanceStatus.ABSENT else None,
+                code_entered_at=now if status == AttendanceStatus.PRESENT else None,
+            )
+
+        self._publish_attendance_change(attendance)
+        return attendance
+
+    async def bulk_set_attendance(
+        self, session_id: int, rows: list[tuple[str, str]]
+    ) -> list[dict]:
+        """
+        Set attendance for many mentees of a session (coordinator action).
 
-        now = datetime.now(timezone.utc)
-        return await self.repo.create(
-            session_id=session_id,
-            mentee_id=mentee_id,
-            status=status,
-            joined_at=now if status != AttendanceStatus.ABSENT else None,
-            code_entered_at=now if status == AttendanceStatus.PRESENT else None,
+        Rows are (program mentee_id, status) pairs. Valid rows are applied with
+        a single upsert; invalid rows are reported and skipped. Returns one
+        result per input row, in order.
+        """
+        if len(rows) > BULK_ATTENDANCE_MAX_ROWS:
+            raise TooManyRowsError(len(rows), BULK_ATTENDANCE_MAX_ROWS)
+
+        session = await self.session_repo.find_by_id(session_id)
+        if session is None:
+            raise NotFoundError("Session", session_id)
+
+        mentee_ids = {mentee_id.strip() for mentee_id, _ in rows}
+        profile_ids = await self.mentee_repo.find_ids_by_mentee_ids(list(mentee_ids))
+
+        results: list[dict] = []
+        pending: dict[int, dict] = {}  # profile id -> result of the row applying it
+        for row_num, (mentee_id, raw_status) in enumerate(rows, start=1):
+            mentee_id = mentee_id.strip()
+            result = {
+                "row": row_num,
+                "mentee_id": mentee_id,
+                "status": None,
+                "result": "error",
+                "attendance_id": None,
+                "error": None,
+            }
+            results.append(result)
+
+            try:
+                status = AttendanceStatus(str(raw_status).strip().upper())
+            except ValueError:
+                result["error"] = f"Invalid status: {raw_status}"
+                continue
+            result["status"] = status
+
+            profile_id = profile_ids.get(mentee_id)
+            if profile_id is None:
+                result["error"] = f"Mentee not found: {mentee_id}"
+            elif profile_id in pending:
+                result["error"] = f"Duplicate of row {pending[profile_id]['row']}"
+            else:
+                pending[profile_id] = result
+
+        upserted = await self.repo.upsert_statuses(
+            session_id,
+            [(profile_id, result["status"]) for profile_id, result in pending.items()],
+            datetime.now(timezone.utc),
         )
+        for row in upserted:
+            result = pending[row["mentee_id"]]
+            result["result"] = "created" if row["inserted"] else "updated"
+            result["attendance_id"] = row["id"]
+            self._publish_status_change(session_id, row["id"], row["mentee_id"], row["status"])
+
+        return results
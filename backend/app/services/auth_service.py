@@ -1,10 +1,15 @@
 import secrets
+import time
 from datetime import datetime, timedelta
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
-from app.core.constants import UserRole
+from app.core.constants import (
+    UserRole,
+    PASSWORD_RESET_TOKEN_HOURS,
+    PASSWORD_RESET_EMAIL_WINDOW_SECONDS,
+)
 from app.core.exceptions import (
     InvalidCredentialsError,
     InactiveAccountError,
@@ -16,6 +21,7 @@ from app.core.exceptions import (
 from app.core.security import (
     verify_password,
     hash_password,
+    hash_reset_token,
     create_access_token,
     create_refresh_token,
     verify_jwt,
@@ -23,7 +29,9 @@ from app.core.security import (
 from app.repositories.user_repo import UserRepository
 from app.repositories.mentee_repo import MenteeRepository
 from app.models.user import User
+from app.database import AsyncSessionLocal
 from app.services.email_service import email_service
+from app.services.job_service import enqueue_job
 
 
 class AuthService:
@@ -39,16 +47,7 @@ class AuthService:
         Authenticate user with email (coordinator) or mentee_id (mentee).
         Returns (user, access_token, refresh_token).
         """
-        # Try email first (coordinator login)
-        user = await self.user_repo.find_by_email(identifier)
-
-        # If not found, try mentee_id lookup
-        if user is None:
-            mentee_profile = await self.mentee_repo.find_by_mentee_id_with_user(
-                identifier
-            )
-            if mentee_profile:
-                user = mentee_profile.user
+        user = await self.user_repo.find_by_login_identifier(identifier)
 
         if user is None:
             raise InvalidCredentialsError()
@@ -119,49 +118,31 @@ class AuthService:
 
     async def request_password_reset(self, identifier: str) -> bool:
         """
-        Request password reset. Sends email with reset link.
-        Returns True if email was sent (or would be sent - we don't reveal if user exists).
-        """
-        # Find user by email or mentee_id
-        user = await self.user_repo.find_by_email(identifier)
+        Request password reset. Queues an email with a reset link for a worker to send.
+        Returns True whether or not the user exists, so callers can't enumerate accounts.
 
-        if user is None:
-            mentee_profile = await self.mentee_repo.find_by_mentee_id_with_user(identifier)
-            if mentee_profile:
-                user = mentee_profile.user
+        Requests for the same user within PASSWORD_RESET_EMAIL_WINDOW_SECONDS
+        share one email.
+        """
+        user = await self.user_repo.find_by_login_identifier(identifier)
 
         # Always return success to prevent email enumeration
         if user is None or not user.is_active:
             return True
 
-        # Generate secure reset token
-        reset_token = secrets.token_urlsafe(32)
-        user.reset_token = reset_token
-        user.reset_token_expires = datetime.utcnow() + timedelta(hours=1)
-        await self.db.flush()
-
-        # Build reset link
-        settings = get_settings()
-        frontend_url = settings.frontend_url.rstrip('/')
-        reset_link = f"{frontend_url}/reset-password?token={reset_token}"
-
-        # Get user name for email
-        user_name = user.email
-        if user.mentee_profile:
-            user_name = user.mentee_profile.full_name
-
-        # Send email
-        await email_service.send_password_reset(
-            to_email=user.email,
-            user_name=user_name,
-            reset_link=reset_link,
+        # The job issues the token, so it is never stored in the jobs table
+        window = int(time.time()) // PASSWORD_RESET_EMAIL_WINDOW_SECONDS
+        await enqueue_job(
+            self.db,
+            "send_password_reset",
+            dedup_key=f"password_reset:{user.id}:{window}",
+            user_id=user.id,
         )
-
         return True
 
     async def reset_password_with_token(self, token: str, new_password: str) -> None:
         """Reset password using reset token from email."""
-        user = await self.user_repo.find_by_reset_token(token)
+        user = await self.user_repo.find_by_reset_token_hash(hash_reset_token(token))
 
         if user is None:
             raise InvalidResetTokenError()
@@ -171,7 +152,35 @@ class AuthService:
 
         # Update password and clear token
         user.password_hash = hash_password(new_password)
-        user.reset_token = None
+        user.reset_token_hash = None
         user.reset_token_expires = None
         user.must_reset_password = False
         await self.db.flush()
+
+
+async def send_password_reset_job(user_id: int) -> None:
+    """
+    Job: issue a reset token and email the link. Only the token's hash is
+    stored; each attempt issues a new token, replacing any earlier one.
+    """
+    async with AsyncSessionLocal() as db:
+        user = await UserRepository(db).find_by_id_with_profile(user_id)
+        if user is None or not user.is_active:
+            return
+
+        # Generate secure reset token
+        reset_token = secrets.token_urlsafe(32)
+        user.reset_token_hash = hash_reset_token(reset_token)
+        user.reset_token_expires = datetime.utcnow() + timedelta(
+            hours=PASSWORD_RESET_TOKEN_HOURS
+        )
+        await db.commit()
+
+    # Build reset link
+    settings = get_settings()
+    frontend_url = settings.frontend_url.rstrip('/')
+    reset_link = f"{frontend_url}/reset-password?token={reset_token}"
+
+    user_name = user.mentee_profile.full_name if user.mentee_profile else user.email
+    if not await email_service.send_password_reset(user.email, user_name, reset_link):
+        raise RuntimeError(f"Password reset email to user {user_id} could not be sent")
@@ -0,0 +1,63 @@
+"""In-memory attendance code window state, served to polling mentees."""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from app.core.constants import CODE_WINDOW_RECHECK_SECONDS
+
+
+@dataclass
+class CodeWindow:
+    expires_at: datetime | None  # None when the session has no active code
+    valid_until: datetime  # After this the entry must be re-read from the DB
+
+    def is_open(self, now: datetime) -> bool:
+        return self.expires_at is not None and now < self.expires_at
+
+
+class CodeWindowCache:
+    """
+    Per-session code window state.
+
+    An open window is known exactly (generate_code records its expires_at),
+    so it is trusted until it expires. A closed window is only trusted for
+    CODE_WINDOW_RECHECK_SECONDS, which bounds how long another worker that
+    generated a code can go unnoticed.
+    """
+
+    def __init__(self):
+        self._windows: dict[int, CodeWindow] = {}
+
+    def open(self, session_id: int, expires_at: datetime) -> None:
+        """Record a freshly generated code for a session."""
+        self._windows[session_id] = CodeWindow(
+            expires_at=expires_at, valid_until=expires_at
+        )
+
+    def record(
+        self, session_id: int, expires_at: datetime | None, now: datetime
+    ) -> None:
+        """Record the window state read from the database."""
+        if expires_at is not None and now < expires_at:
+            self.open(session_id, expires_at)
+        else:
+            self._windows[session_id] = CodeWindow(
+                expires_at=None,
+                valid_until=now + timedelta(seconds=CODE_WINDOW_RECHECK_SECONDS),
+            )
+
+    def is_open(self, session_id: int, now: datetime) -> bool | None:
+        """
+        Return whether the session's code window is open.
+        Returns None when the state is unknown or stale and must be re-read.
+        """
+        window = self._windows.get(session_id)
+        if window is None or now >= window.valid_until:
+            return None
+        return window.is_open(now)
+
+    def clear(self) -> None:
+        self._windows.clear()
+
+
+# Singleton instance
+code_window_cache = CodeWindowCache()
@@ -10,6 +10,36 @@ from app.repositories.user_repo import UserRepository
 from app.repositories.mentee_repo import MenteeRepository
 
 
+def _decode(file_content: bytes) -> str:
+    try:
+        return file_content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return file_content.decode("latin-1")
+
+
+def parse_attendance_csv(file_content: bytes) -> list[tuple[str, str]]:
+    """
+    Read (mentee_id, status) rows from an attendance CSV.
+    Expected columns: mentee_id, status
+    """
+    reader = csv.DictReader(io.StringIO(_decode(file_content)))
+
+    if not reader.fieldnames:
+        raise CSVImportError("CSV file is empty or has no header row")
+
+    missing_columns = {"mentee_id", "status"} - {name.strip() for name in reader.fieldnames}
+    if missing_columns:
+        raise CSVImportError(
+            f"CSV missing required columns: {', '.join(missing_columns)}"
+        )
+
+    rows = []
+    for row in reader:
+        row = {key.strip(): value for key, value in row.items() if key}
+        rows.append((row["mentee_id"] or "", row["status"] or ""))
+    return rows
+
+
 @dataclass
 class ImportResult:
     total: int = 0
@@ -33,12 +63,7 @@ class CSVImportService:
         Import mentees from CSV content.
         Expected columns: mentee_id, name, email, track, default_password
         """
-        try:
-            text = file_content.decode("utf-8")
-        except UnicodeDecodeError:
-            text = file_content.decode("latin-1")
-
-        reader = csv.DictReader(io.StringIO(text))
+        reader = csv.DictReader(io.StringIO(_decode(file_content)))
 
         if not reader.fieldnames:
             raise CSVImportError("CSV file is empty or has no header row")
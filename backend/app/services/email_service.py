@@ -7,6 +7,7 @@ from email.mime.multipart import MIMEMultipart
 import aiosmtplib
 
 from app.config import get_settings
+from app.services.job_service import PartialJobFailure
 
 logger = logging.getLogger(__name__)
 
@@ -380,6 +381,71 @@ Kings Patriots Development Foundation
 
         return await self.send_email(to_email, subject, html_content, text_content)
 
+    async def send_bulk_email(
+        self,
+        recipients: list[tuple[str, str]],  # List of (email, name)
+        subject: str,
+        html_content: str,
+    ) -> list[tuple[str, str]]:
+        """Send a personalized copy of an email to each recipient. Returns the recipients that failed."""
+        failed = []
+        for email, name in recipients:
+            # Personalize the email
+            personalized_html = html_content.replace("{{name}}", name)
+            personalized_text = f"Hi {name},\n\n{html_content}"
+
+            if not await self.send_email(
+                to_email=email,
+                subject=subject,
+                html_content=f"""
+                <!DOCTYPE html>
+                <html>
+                <head>
+                    <style>
+                        body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+                        .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+                        .header {{ background: linear-gradient(135deg, #1B4F72, #2E86C1); color: white; padding: 20px; border-radius: 8px 8px 0 0; }}
+                        .content {{ background: #f9f9f9; padding: 20px; border: 1px solid #ddd; border-top: none; border-radius: 0 0 8px 8px; }}
+                        .footer {{ text-align: center; margin-top: 20px; color: #666; font-size: 12px; }}
+                    </style>
+                </head>
+                <body>
+                    <div class="container">
+                        <div class="header">
+                            <h1 style="margin: 0;">{subject}</h1>
+                        </div>
+                        <div class="content">
+                            <p>Hi {name},</p>
+                            {personalized_html}
+                        </div>
+                        <div class="footer">
+                            <p>Kings Patriots Development Foundation</p>
+                        </div>
+                    </div>
+                </body>
+                </html>
+                """,
+                text_content=personalized_text,
+            ):
+                failed.append((email, name))
+        return failed
+
 
 # Singleton instance
 email_service = EmailService()
+
+
+async def send_bulk_email_job(
+    recipients: list[tuple[str, str]], subject: str, html_content: str
+) -> None:
+    """
+    Job: send a bulk email. send_email() reports failures by returning False,
+    so this raises to have the job retried, for the failed recipients only.
+    """
+    failed = await email_service.send_bulk_email(recipients, subject, html_content)
+    if failed:
+        raise PartialJobFailure(
+            f"{len(failed)} of {len(recipients)} emails could not be sent",
+            {"recipients": failed, "subject": subject, "html_content": html_content},
+        )
+
@@ -0,0 +1,198 @@
+"""
+Event service - in-process pub/sub for live attendance updates.
+
+Services publish events with publish_after_commit(); they are delivered to
+subscribers only once the surrounding transaction commits. With
+EVENT_BACKEND=postgres, events are fanned out through Postgres
+LISTEN/NOTIFY so every API worker sees events published by the others; a
+lost LISTEN connection is re-established in the background.
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Callable
+
+import asyncpg
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session as OrmSession
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PG_CHANNEL = "kpdf_events"
+SUBSCRIBER_QUEUE_SIZE = 100
+RECONNECT_BASE_SECONDS = 1  # Doubles after every failed LISTEN reconnect
+RECONNECT_MAX_SECONDS = 30
+HEALTH_CHECK_SECONDS = 30
+AFTER_COMMIT_KEY = "after_commit_callbacks"
+
+
+def session_channel(session_id: int) -> str:
+    return f"session:{session_id}"
+
+
+class EventBus:
+    """Fan-out of JSON events to subscriber queues, keyed by channel."""
+
+    def __init__(self):
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+        self._pg_conn: asyncpg.Connection | None = None
+        self._pg_lock = asyncio.Lock()
+        self._listen_task: asyncio.Task | None = None
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers[channel].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[channel].discard(queue)
+            if not self._subscribers[channel]:
+                del self._subscribers[channel]
+
+    def publish(self, channel: str, event_data: dict[str, Any]) -> None:
+        """Publish an event. Safe to call from sync code on the event loop."""
+        if self._pg_conn is not None:
+            asyncio.get_running_loop().create_task(self._notify(channel, event_data))
+        else:
+            self._dispatch(channel, event_data)
+
+    def publish_later(
+        self, delay_seconds: float, channel: str, event_data: dict[str, Any]
+    ) -> None:
+        """Publish an event after a delay (e.g. when a code window closes)."""
+        asyncio.get_running_loop().call_later(
+            max(0.0, delay_seconds), self.publish, channel, event_data
+        )
+
+    def _dispatch(self, channel: str, event_data: dict[str, Any]) -> None:
+        for queue in list(self._subscribers.get(channel, ())):
+            try:
+                queue.put_nowait(event_data)
+            except asyncio.QueueFull:
+                # Slow consumer - drop rather than block publishers
+                logger.warning("Dropping event for slow subscriber on %s", channel)
+
+    async def _notify(self, channel: str, event_data: dict[str, Any]) -> None:
+        payload = json.dumps({"channel": channel, "event": event_data}, default=str)
+        try:
+            async with self._pg_lock:
+                await self._pg_conn.execute("SELECT pg_notify($1, $2)", PG_CHANNEL, payload)
+        except Exception as e:
+            logger.error("Failed to publish event via Postgres: %s", e)
+            # Still deliver to this worker's subscribers
+            self._dispatch(channel, event_data)
+
+    def _on_notification(self, connection, pid, channel, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        self._dispatch(message["channel"], message["event"])
+
+    async def start(self) -> None:
+        """Start listening on Postgres in the background if configured."""
+        settings = get_settings()
+        if settings.event_backend != "postgres":
+            logger.info("Event bus using in-process backend")
+            return
+
+        dsn = settings.database_url.replace("+asyncpg", "")
+        self._listen_task = asyncio.create_task(self._listen(dsn))
+
+    async def _listen(self, dsn: str) -> None:
+        """
+        Hold the LISTEN connection, reconnecting with backoff whenever it is
+        lost. While disconnected, events are delivered to this worker's
+        subscribers only.
+        """
+        delay = RECONNECT_BASE_SECONDS
+        while True:
+            lost = asyncio.Event()
+            conn = None
+            try:
+                conn = await asyncpg.connect(dsn)
+                conn.add_termination_listener(lambda _: lost.set())
+                await conn.add_listener(PG_CHANNEL, self._on_notification)
+            except Exception as e:
+                if conn is not None:
+                    conn.terminate()
+                logger.error(
+                    "Event bus could not listen on Postgres, retrying in %ss: %s", delay, e
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+                continue
+
+            self._pg_conn = conn
+            delay = RECONNECT_BASE_SECONDS
+            logger.info("Event bus listening on Postgres channel %s", PG_CHANNEL)
+            try:
+                await self._watch(conn, lost)
+            finally:
+                self._pg_conn = None
+                conn.terminate()
+            logger.warning("Event bus lost its Postgres connection, reconnecting")
+
+    async def _watch(self, conn: asyncpg.Connection, lost: asyncio.Event) -> None:
+        """Return once the connection closes or stops answering health checks."""
+        while True:
+            try:
+                await asyncio.wait_for(lost.wait(), timeout=HEALTH_CHECK_SECONDS)
+                return
+            except asyncio.TimeoutError:
+                pass
+            # A half-open connection never reports termination; ask it
+            try:
+                async with self._pg_lock:
+                    await conn.execute("SELECT 1", timeout=HEALTH_CHECK_SECONDS)
+            except Exception as e:
+                logger.warning("Event bus health check failed: %s", e)
+                return
+
+    async def stop(self) -> None:
+        if self._listen_task is not None:
+            task, self._listen_task = self._listen_task, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+def run_after_commit(db: AsyncSession, callback: Callable[[], None]) -> None:
+    """Run a callback once the DB session commits; dropped on rollback."""
+    db.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+
+
+def publish_after_commit(
+    db: AsyncSession, channel: str, event_type: str, **data: Any
+) -> None:
+    """Queue an event on the DB session; it is published once the session commits."""
+    run_after_commit(
+        db, partial(event_bus.publish, channel, {"type": event_type, **data})
+    )
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _run_after_commit_callbacks(session: OrmSession) -> None:
+    for callback in session.info.pop(AFTER_COMMIT_KEY, []):
+        try:
+            callback()
+        except Exception as e:
+            logger.error("After-commit callback failed: %s", e)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_after_commit_callbacks(session: OrmSession) -> None:
+    session.info.pop(AFTER_COMMIT_KEY, None)
+
+
+# Singleton instance
+event_bus = EventBus()
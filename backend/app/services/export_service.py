@@ -0,0 +1,251 @@
+"""Streaming CSV/Parquet exports of program data for reporting."""
+import asyncio
+import csv
+import enum
+import io
+from typing import Any, AsyncIterator, Callable
+
+from sqlalchemy import Select, select, types
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from app.models.attendance import Attendance
+from app.models.mentee import MenteeProfile
+from app.models.session import Session
+from app.models.telegram import TelegramStat
+from app.models.user import User
+
+# Rows fetched per round trip from the server-side cursor; memory use is
+# bounded by one batch regardless of table size
+EXPORT_BATCH_SIZE = 5000
+
+EXPORT_FORMATS = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+
+class ExportError(Exception):
+    """Raised when an export can't be produced."""
+
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(message)
+
+
+def _attendance_query(program_id: int) -> Select:
+    """One row per attendance record (fact table) in the program."""
+    return (
+        select(
+            Attendance.id.label("attendance_id"),
+            Attendance.session_id,
+            Session.date.label("session_date"),
+            Session.title.label("session_title"),
+            Session.is_core_session,
+            MenteeProfile.id.label("mentee_profile_id"),
+            MenteeProfile.mentee_id,
+            MenteeProfile.full_name,
+            MenteeProfile.track,
+            Attendance.status,
+            Attendance.joined_at,
+            Attendance.code_entered_at,
+            Attendance.updated_at,
+        )
+        .join(Session, Session.id == Attendance.session_id)
+        .join(MenteeProfile, MenteeProfile.id == Attendance.mentee_id)
+        .where(Session.program_id == program_id)
+        .order_by(Attendance.id)
+    )
+
+
+def _sessions_query(program_id: int) -> Select:
+    return (
+        select(
+            Session.id.label("session_id"),
+            Session.title,
+            Session.date,
+            Session.start_time,
+            Session.end_time,
+            Session.is_core_session,
+            Session.created_at,
+        )
+        .where(Session.program_id == program_id)
+        .order_by(Session.date, Session.start_time)
+    )
+
+
+def _mentees_query(program_id: int) -> Select:
+    # Mentee profiles aren't scoped to a program
+    return (
+        select(
+            MenteeProfile.id.label("mentee_profile_id"),
+            MenteeProfile.mentee_id,
+            MenteeProfile.full_name,
+            User.email,
+            MenteeProfile.track,
+            MenteeProfile.telegram_username,
+            MenteeProfile.telegram_user_id,
+            MenteeProfile.created_at,
+        )
+        .join(User, User.id == MenteeProfile.user_id)
+        .order_by(MenteeProfile.id)
+    )
+
+
+def _telegram_stats_query(program_id: int) -> Select:
+    return (
+        select(
+            MenteeProfile.id.label("mentee_profile_id"),
+            MenteeProfile.mentee_id,
+            MenteeProfile.full_name,
+            MenteeProfile.track,
+            TelegramStat.message_count,
+            TelegramStat.updated_at,
+        )
+        .join(MenteeProfile, MenteeProfile.id == TelegramStat.mentee_id)
+        .where(TelegramStat.program_id == program_id)
+        .order_by(MenteeProfile.id)
+    )
+
+
+EXPORT_DATASETS: dict[str, Callable[[int], Select]] = {
+    "attendance": _attendance_query,
+    "sessions": _sessions_query,
+    "mentees": _mentees_query,
+    "telegram_stats": _telegram_stats_query,
+}
+
+
+def _export_value(value: Any) -> Any:
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+async def _iter_batches(
+    db: AsyncSession, query: Select
+) -> AsyncIterator[list[tuple]]:
+    """Yield rows in batches from a server-side cursor."""
+    result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    async for partition in result.partitions():
+        yield [tuple(_export_value(value) for value in row) for row in partition]
+
+
+async def stream_csv(db: AsyncSession, query: Select) -> AsyncIterator[bytes]:
+    """Encode a query's rows as CSV chunks, one per server-side cursor batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.name for column in query.selected_columns])
+    yield buffer.getvalue().encode("utf-8")
+
+    async for batch in _iter_batches(db, query):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back in chunks while tracking position."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_type(column_type: types.TypeEngine):
+    import pyarrow as pa
+
+    if isinstance(column_type, types.Boolean):
+        return pa.bool_()
+    if isinstance(column_type, types.Integer):
+        return pa.int64()
+    if isinstance(column_type, types.DateTime):
+        return pa.timestamp("us", tz="UTC") if column_type.timezone else pa.timestamp("us")
+    if isinstance(column_type, types.Date):
+        return pa.date32()
+    if isinstance(column_type, types.Time):
+        return pa.time64("us")
+    return pa.string()
+
+
+async def _export_parquet(db: AsyncSession, query: Select) -> AsyncIterator[bytes]:
+    """Write one Parquet row group per batch and stream the bytes as they're written."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [(column.name, _arrow_type(column.type)) for column in query.selected_columns]
+    )
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="snappy")
+
+    def write_batch(batch: list[tuple]) -> bytes:
+        columns = list(zip(*batch))
+        writer.write_table(pa.Table.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+            schema=schema,
+        ))
+        return sink.drain()
+
+    def close() -> bytes:
+        writer.close()
+        return sink.drain()
+
+    async for batch in _iter_batches(db, query):
+        # Arrow conversion and compression are CPU-bound
+        yield await asyncio.to_thread(write_batch, batch)
+    yield await asyncio.to_thread(close)
+
+
+async def stream_csv_response_body(query: Select) -> AsyncIterator[bytes]:
+    """
+    stream_csv with its own DB session, for StreamingResponse bodies that
+    outlive the request's session.
+    """
+    async with AsyncSessionLocal() as db:
+        async for chunk in stream_csv(db, query):
+            yield chunk
+
+
+def export_dataset(
+    db: AsyncSession, dataset: str, program_id: int, export_format: str = "csv"
+) -> AsyncIterator[bytes]:
+    """
+    Stream a dataset as CSV or Parquet bytes.
+
+    Rows come from a server-side cursor in batches of EXPORT_BATCH_SIZE, so
+    memory stays bounded however large the program is.
+
+    Raises:
+        ExportError: If the dataset or format is unknown, or Parquet is
+            requested without pyarrow installed
+    """
+    if dataset not in EXPORT_DATASETS:
+        raise ExportError(
+            f"Unknown dataset: {dataset}. Available: {', '.join(EXPORT_DATASETS)}"
+        )
+    if export_format not in EXPORT_FORMATS:
+        raise ExportError(
+            f"Unknown format: {export_format}. Available: {', '.join(EXPORT_FORMATS)}"
+        )
+
+    query = EXPORT_DATASETS[dataset](program_id)
+    if export_format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ExportError("Parquet export requires pyarrow")
+        return _export_parquet(db, query)
+    return stream_csv(db, query)
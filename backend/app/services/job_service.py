@@ -0,0 +1,150 @@
+"""Postgres-backed background jobs: web processes enqueue, workers run them."""
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from app.models.job import Job
+from app.repositories.job_repo import JobRepository
+from app.core.constants import JOB_LEASE_SECONDS, JOB_RETRY_BASE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+JOB_POLL_SECONDS = 1
+MAX_ERROR_LENGTH = 2000
+
+JobHandler = Callable[..., Awaitable[Any]]
+
+
+class PartialJobFailure(Exception):
+    """
+    Raised by a handler that finished part of its work. The job is retried
+    like any failure, but with `payload` so finished work isn't repeated.
+    """
+
+    def __init__(self, message: str, payload: dict[str, Any]):
+        super().__init__(message)
+        self.payload = payload
+
+
+async def enqueue_job(
+    db: AsyncSession,
+    name: str,
+    dedup_key: str | None = None,
+    run_at: datetime | None = None,
+    **payload: Any,
+) -> bool:
+    """
+    Queue a job in the caller's transaction; workers see it once the caller
+    commits. The payload must be JSON-serializable and is passed to the
+    handler as keyword arguments.
+
+    Returns False if a job with the same dedup_key was already queued.
+    """
+    job_id = await JobRepository(db).enqueue(name, payload, dedup_key=dedup_key, run_at=run_at)
+    return job_id is not None
+
+
+class JobRunner:
+    """
+    Leases due jobs from the jobs table and runs them with bounded concurrency.
+
+    Leases are extended while a job runs; if the worker dies, the lease
+    expires and another worker retries the job. Failed jobs are retried with
+    exponential backoff until max_attempts.
+    """
+
+    def __init__(self, handlers: dict[str, JobHandler], concurrency: int = 4):
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping = asyncio.Event()
+        self._running: set[asyncio.Task] = set()
+
+    def stop(self) -> None:
+        """Stop leasing new jobs; run() returns once running jobs finish."""
+        self._stopping.set()
+
+    async def run(self) -> None:
+        self._stopping.clear()
+        logger.info("Job runner %s started", self.worker_id)
+
+        while not self._stopping.is_set():
+            free = self.concurrency - len(self._running)
+            if free <= 0:
+                await asyncio.wait(self._running, return_when=asyncio.FIRST_COMPLETED)
+                continue
+
+            jobs: list[Job] = []
+            try:
+                async with AsyncSessionLocal() as db:
+                    jobs = await JobRepository(db).lease(self.worker_id, free)
+                    await db.commit()
+            except Exception as e:
+                logger.error("Failed to lease jobs: %s", e)
+
+            for job in jobs:
+                task = asyncio.create_task(self._execute(job))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+            if not jobs:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        logger.info("Job runner %s stopped", self.worker_id)
+
+    async def _heartbeat(self, job_id: int) -> None:
+        while True:
+            await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await JobRepository(db).extend_lease(job_id, self.worker_id)
+                    await db.commit()
+            except Exception as e:
+                logger.error("Failed to extend lease for job %s: %s", job_id, e)
+
+    async def _execute(self, job: Job) -> None:
+        error: Exception | None = None
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        try:
+            handler = self.handlers.get(job.name)
+            if handler is None:
+                raise LookupError(f"No handler registered for job: {job.name}")
+            await handler(**job.payload)
+        except Exception as e:
+            error = e
+            logger.exception("Job %s (%s) failed on attempt %d", job.id, job.name, job.attempts)
+        finally:
+            heartbeat.cancel()
+
+        try:
+            async with AsyncSessionLocal() as db:
+                repo = JobRepository(db)
+                if error is None:
+                    await repo.mark_succeeded(job.id, self.worker_id)
+                else:
+                    retry_at = None
+                    if job.attempts < job.max_attempts:
+                        delay = JOB_RETRY_BASE_SECONDS * 2 ** (job.attempts - 1)
+                        retry_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+                    await repo.mark_failed(
+                        job.id,
+                        self.worker_id,
+                        repr(error)[:MAX_ERROR_LENGTH],
+                        retry_at,
+                        payload=error.payload if isinstance(error, PartialJobFailure) else None,
+                    )
+                await db.commit()
+        except Exception as e:
+            # The lease expires and the job is picked up again
+            logger.error("Failed to record result of job %s: %s", job.id, e)
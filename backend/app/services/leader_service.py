@@ -0,0 +1,146 @@
+"""
+Leader election across worker processes using a Postgres advisory lock.
+
+The leader holds a session-level pg_try_advisory_lock on a dedicated
+connection. The lock lives exactly as long as that connection, so the
+leader renews by checking the connection; if it dies, Postgres releases the
+lock and a standby takes over on its next attempt. TCP keepalives bound how
+long a crashed leader's connection (and so the lock) can linger.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+import asyncpg
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+LEADER_RENEW_SECONDS = 10
+# Server-side keepalives: a dead leader's connection is dropped within ~30s
+LEADER_CONNECTION_SETTINGS = {
+    "tcp_keepalives_idle": "10",
+    "tcp_keepalives_interval": "5",
+    "tcp_keepalives_count": "4",
+}
+
+
+@dataclass
+class LeaderMetrics:
+    is_leader: bool = False
+    acquisitions: int = 0  # Times this node became leader
+    losses: int = 0  # Times leadership was lost (connection failure or shutdown)
+    contended_attempts: int = 0  # Attempts while another node held the lock
+    renewals: int = 0
+    errors: int = 0
+    leader_since: datetime | None = None
+    last_renewed_at: datetime | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class LeaderElector:
+    """Elects one leader per lock name; listeners are told when this node gains or loses it."""
+
+    def __init__(self, name: str, renew_seconds: float = LEADER_RENEW_SECONDS):
+        self.name = name
+        self.renew_seconds = renew_seconds
+        self.metrics = LeaderMetrics()
+        self._listeners: list[Callable[[bool], None]] = []
+        self._conn: asyncpg.Connection | None = None
+        self._stopping = asyncio.Event()
+
+    @property
+    def is_leader(self) -> bool:
+        return self.metrics.is_leader
+
+    def add_listener(self, callback: Callable[[bool], None]) -> None:
+        """Call callback(is_leader) whenever leadership changes."""
+        self._listeners.append(callback)
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        """Campaign for leadership until stop() is called."""
+        self._stopping.clear()
+        while not self._stopping.is_set():
+            try:
+                if self.is_leader:
+                    await self._renew()
+                else:
+                    await self._try_acquire()
+            except Exception as e:
+                self.metrics.errors += 1
+                logger.error("Leader election for %s failed: %s", self.name, e)
+                await self._release()
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.renew_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+        await self._release(unlock=True)
+
+    async def _try_acquire(self) -> None:
+        if self._conn is None or self._conn.is_closed():
+            dsn = get_settings().database_url.replace("+asyncpg", "")
+            self._conn = await asyncpg.connect(
+                dsn, server_settings=LEADER_CONNECTION_SETTINGS
+            )
+
+        acquired = await asyncio.wait_for(
+            self._conn.fetchval("SELECT pg_try_advisory_lock(hashtext($1))", self.name),
+            timeout=self.renew_seconds,
+        )
+        if not acquired:
+            self.metrics.contended_attempts += 1
+            return
+
+        now = datetime.now(timezone.utc)
+        self.metrics.acquisitions += 1
+        self.metrics.leader_since = now
+        self.metrics.last_renewed_at = now
+        self._set_leader(True)
+        logger.info("Became leader for %s (%s)", self.name, self.metrics.as_dict())
+
+    async def _renew(self) -> None:
+        # The lock is held for as long as the connection is alive
+        await asyncio.wait_for(self._conn.fetchval("SELECT 1"), timeout=self.renew_seconds)
+        self.metrics.renewals += 1
+        self.metrics.last_renewed_at = datetime.now(timezone.utc)
+
+    async def _release(self, unlock: bool = False) -> None:
+        """Step down and drop the connection; closing it releases the lock server-side."""
+        was_leader = self.is_leader
+        if was_leader:
+            # Stop leader work before anything else can fail
+            self._set_leader(False)
+            self.metrics.losses += 1
+            self.metrics.leader_since = None
+            logger.warning("Lost leadership for %s (%s)", self.name, self.metrics.as_dict())
+
+        conn, self._conn = self._conn, None
+        if conn is None or conn.is_closed():
+            return
+        try:
+            if unlock and was_leader:
+                await asyncio.wait_for(
+                    conn.execute("SELECT pg_advisory_unlock(hashtext($1))", self.name),
+                    timeout=self.renew_seconds,
+                )
+            await asyncio.wait_for(conn.close(), timeout=self.renew_seconds)
+        except Exception:
+            conn.terminate()
+
+    def _set_leader(self, is_leader: bool) -> None:
+        self.metrics.is_leader = is_leader
+        for callback in self._listeners:
+            try:
+                callback(is_leader)
+            except Exception as e:
+                logger.error("Leader listener for %s failed: %s", self.name, e)
@@ -1,8 +1,21 @@
+import logging
+
+from sqlalchemy import Row, Select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError
+from app.database import AsyncSessionLocal
 from app.repositories.mentee_repo import MenteeRepository
 from app.models.mentee import MenteeProfile
+from app.services.job_service import enqueue_job
+from app.services.upload_service import (
+    InvalidImageError,
+    confirm_profile_picture_upload,
+    delete_profile_picture_upload,
+    process_profile_picture_upload,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class MenteeService:
@@ -20,7 +33,11 @@ class MenteeService:
     async def update_profile_picture(
         self, user_id: int, profile_pic_url: str
     ) -> MenteeProfile:
-        """Update mentee's profile picture."""
+        """
+        Update mentee's profile picture.
+        The previous file may be shared with other profiles or a concurrent
+        upload, so it is left for the scheduled sweep to remove once unused.
+        """
         profile = await self.repo.find_by_user_id_with_user(user_id)
         if profile is None:
             raise NotFoundError("MenteeProfile", user_id)
@@ -29,11 +46,38 @@ class MenteeService:
         await self.db.flush()
         return profile
 
+    async def queue_profile_picture_upload(self, user_id: int, key: str) -> MenteeProfile:
+        """
+        Queue a confirmed direct upload for processing by a worker, which
+        stores it and sets it as the profile picture. Returns the profile
+        as it is until then.
+        """
+        profile = await self.get_profile_by_user_id(user_id)
+        await confirm_profile_picture_upload(user_id, key)
+        await enqueue_job(
+            self.db,
+            "process_profile_picture",
+            dedup_key=f"profile_picture:{key}",
+            user_id=user_id,
+            key=key,
+        )
+        return profile
+
     async def list_mentees(
-        self, track: str | None = None, search: str | None = None
-    ) -> list[MenteeProfile]:
-        """List all mentees with optional filtering."""
-        return await self.repo.find_all_with_user(track=track, search=search)
+        self,
+        track: str | None = None,
+        search: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[Row]:
+        """List mentees as flat rows with optional filtering; search results are ranked."""
+        return await self.repo.find_list_rows(
+            track=track, search=search, limit=limit, offset=offset
+        )
+
+    def mentee_list_query(self, track: str | None = None, search: str | None = None) -> Select:
+        """Query for the full mentee list as flat rows, for streaming exports."""
+        return self.repo.list_rows_query(track=track, search=search)
 
     async def get_by_id(self, mentee_id: int) -> MenteeProfile:
         """Get mentee by profile ID."""
@@ -63,3 +107,25 @@ class MenteeService:
 
         await self.db.flush()
         return profile
+
+
+async def process_profile_picture_job(user_id: int, key: str) -> None:
+    """
+    Job: hash a direct upload, store it with its derivatives and set it as
+    the user's profile picture. Invalid images are discarded, not retried.
+    """
+    try:
+        url_path = await process_profile_picture_upload(user_id, key)
+    except InvalidImageError:
+        logger.warning("Discarded direct upload %s: not a valid image", key)
+        return
+    if url_path is None:
+        return  # Processed by an earlier attempt
+
+    async with AsyncSessionLocal() as db:
+        try:
+            await MenteeService(db).update_profile_picture(user_id, url_path)
+        except NotFoundError:
+            logger.warning("Discarded direct upload %s: user %s has no profile", key, user_id)
+        await db.commit()
+    await delete_profile_picture_upload(key)
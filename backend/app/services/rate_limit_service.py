@@ -0,0 +1,169 @@
+"""
+Sliding-window rate limiting for login and attendance code attempts.
+
+Each limit counts requests per key in fixed windows and estimates the
+sliding window as this window's count plus the previous window's count,
+weighted by how much of the previous window the sliding window still
+covers. That keeps two counters per key instead of a timestamp per
+request. Rejected requests are counted too, so a client that keeps
+retrying stays limited.
+
+With RATE_LIMIT_BACKEND=memory the counters live in this process; with
+"postgres" they live in the rate_limit_counters table and are shared by
+every API node.
+"""
+import logging
+import math
+import time
+from collections import defaultdict
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from typing import Any
+
+from app.config import get_settings
+from app.core.constants import (
+    LOGIN_RATE_LIMIT_PER_IP,
+    LOGIN_RATE_LIMIT_PER_IP_AND_IDENTIFIER,
+    ATTENDANCE_CODE_RATE_LIMIT_PER_IP,
+    ATTENDANCE_CODE_RATE_LIMIT_PER_USER,
+    RATE_LIMIT_PRUNE_SECONDS,
+)
+from app.database import AsyncSessionLocal
+from app.repositories.rate_limit_repo import RateLimitRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    name: str
+    limit: int
+    window_seconds: int
+
+
+LOGIN_PER_IP = RateLimit("login:ip", *LOGIN_RATE_LIMIT_PER_IP)
+LOGIN_PER_IP_AND_IDENTIFIER = RateLimit(
+    "login:ip_identifier", *LOGIN_RATE_LIMIT_PER_IP_AND_IDENTIFIER
+)
+ATTENDANCE_CODE_PER_IP = RateLimit("attendance_code:ip", *ATTENDANCE_CODE_RATE_LIMIT_PER_IP)
+ATTENDANCE_CODE_PER_USER = RateLimit("attendance_code:user", *ATTENDANCE_CODE_RATE_LIMIT_PER_USER)
+
+
+@dataclass
+class RateLimitMetrics:
+    allowed: int = 0
+    limited: int = 0
+    errors: int = 0  # Backend failures; the request is let through
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class MemoryRateLimitStore:
+    """Counters for a single API process."""
+
+    backend = "memory"
+
+    def __init__(self):
+        # key -> [window_index, previous hits, current hits, expires at]
+        self._counters: dict[str, list] = {}
+        self._next_prune = 0.0
+
+    async def hit(self, key: str, window_index: int, window_seconds: int) -> tuple[int, int]:
+        counter = self._counters.get(key)
+        if counter is None or counter[0] < window_index - 1:
+            counter = self._counters[key] = [window_index, 0, 0, 0.0]
+        elif counter[0] == window_index - 1:
+            counter[:] = [window_index, counter[2], 0, 0.0]
+        counter[2] += 1
+        counter[3] = (window_index + 2) * window_seconds
+        self._prune()
+        return counter[1], counter[2]
+
+    def _prune(self) -> None:
+        now = time.time()
+        if now < self._next_prune:
+            return
+        self._next_prune = now + RATE_LIMIT_PRUNE_SECONDS
+        for key in [k for k, counter in self._counters.items() if counter[3] <= now]:
+            del self._counters[key]
+
+    @property
+    def tracked_keys(self) -> int:
+        return len(self._counters)
+
+
+class PostgresRateLimitStore:
+    """Counters in the rate_limit_counters table, shared by every API node."""
+
+    backend = "postgres"
+
+    async def hit(self, key: str, window_index: int, window_seconds: int) -> tuple[int, int]:
+        expires_at = datetime.fromtimestamp((window_index + 2) * window_seconds, timezone.utc)
+        async with AsyncSessionLocal() as db:
+            counts = await RateLimitRepository(db).hit(key, window_index, expires_at)
+            await db.commit()
+        return counts
+
+
+class RateLimiter:
+    def __init__(self):
+        self._store: MemoryRateLimitStore | PostgresRateLimitStore = MemoryRateLimitStore()
+        self.metrics: dict[str, RateLimitMetrics] = defaultdict(RateLimitMetrics)
+
+    def start(self) -> None:
+        """Switch to the shared Postgres backend if configured."""
+        if get_settings().rate_limit_backend == "postgres":
+            self._store = PostgresRateLimitStore()
+            logger.info("Rate limiter using Postgres backend")
+        else:
+            self._store = MemoryRateLimitStore()
+            logger.info("Rate limiter using in-process backend")
+
+    async def hit(self, rate_limit: RateLimit, key: str) -> int | None:
+        """
+        Count a request against a limit. Returns None if it is allowed, or
+        the seconds until the client may try again if it is over the limit.
+        """
+        metrics = self.metrics[rate_limit.name]
+        window_index, offset = divmod(time.time(), rate_limit.window_seconds)
+        try:
+            previous, current = await self._store.hit(
+                f"{rate_limit.name}:{key}", int(window_index), rate_limit.window_seconds
+            )
+        except Exception as e:
+            # Fail open: a broken limiter must not lock everyone out
+            metrics.errors += 1
+            logger.warning("Rate limit check for %s failed: %s", rate_limit.name, e)
+            return None
+
+        elapsed = offset / rate_limit.window_seconds
+        if previous * (1 - elapsed) + current <= rate_limit.limit:
+            metrics.allowed += 1
+            return None
+
+        metrics.limited += 1
+        return _retry_after(previous, current, rate_limit, elapsed)
+
+    def metrics_dict(self) -> dict[str, Any]:
+        return {
+            "backend": self._store.backend,
+            # Shared counters are pruned by the scheduler instead
+            "tracked_keys": getattr(self._store, "tracked_keys", None),
+            "limits": {name: metrics.as_dict() for name, metrics in self.metrics.items()},
+        }
+
+
+def _retry_after(previous: int, current: int, rate_limit: RateLimit, elapsed: float) -> int:
+    """Seconds until one more request fits, assuming the client stops retrying."""
+    if current < rate_limit.limit:
+        # Room opens up as the previous window slides out
+        target = 1 - (rate_limit.limit - current - 1) / previous
+    else:
+        # This window's hits become the previous window's and slide out in turn
+        target = 2 - (rate_limit.limit - 1) / current
+    return max(1, math.ceil((target - elapsed) * rate_limit.window_seconds))
+
+
+# Singleton instance
+rate_limiter = RateLimiter()
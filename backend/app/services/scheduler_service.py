@@ -1,233 +1,307 @@
-"""Scheduler service for automated tasks like email reminders."""
+"""Scheduler service for automated tasks like email reminders.
+
+The scheduler runs in the worker process (python -m app.worker). Every
+worker runs an elector, and only the elected leader's scheduler ticks; the
+others stay paused, ready to take over. Each tick only finds due sessions
+and queues one job per session, and the job's dedup key makes sure every
+reminder and finalization runs once even if two leaders overlap during
+failover.
+"""
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from sqlalchemy import select
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.database import AsyncSessionLocal
 from app.models.session import Session
 from app.models.mentee import MenteeProfile
 from app.models.attendance import Attendance
-from app.core.constants import AttendanceStatus
+from app.core.constants import (
+    AttendanceStatus,
+    JOB_RETENTION_DAYS,
+    PROFILE_PICTURE_SWEEP_GRACE_HOURS,
+    TELEGRAM_PROCESSED_UPDATE_RETENTION_HOURS,
+)
+from app.repositories.job_repo import JobRepository
+from app.repositories.mentee_repo import MenteeRepository
+from app.repositories.rate_limit_repo import RateLimitRepository
+from app.repositories.telegram_repo import TelegramProcessedUpdateRepository
 from app.services.email_service import email_service
+from app.services.job_service import enqueue_job
+from app.services.leader_service import LeaderElector
+from app.services.upload_service import delete_unused_profile_pictures
 
 logger = logging.getLogger(__name__)
 
-# Track which reminders have been sent to avoid duplicates
-sent_reminders: dict[str, set[int]] = {
-    "24h": set(),  # session_id set
-    "30min": set(),  # session_id set
-}
+SCHEDULER_LOCK_NAME = "kpdf_scheduler"
 
+Tick = Callable[[AsyncSession], Awaitable[None]]
 
-async def send_24h_reminders():
-    """Send 24-hour reminder emails for upcoming sessions."""
-    logger.info("Running 24h reminder check...")
 
-    async with AsyncSessionLocal() as db:
-        # Find sessions happening in ~24 hours (23-25 hour window)
-        now = datetime.utcnow()
-        window_start = now + timedelta(hours=23)
-        window_end = now + timedelta(hours=25)
+def periodic(name: str, tick: Tick) -> Callable[[], Awaitable[None]]:
+    """
+    Wrap a scheduler tick in its own transaction, guarded by a transaction-level
+    advisory lock so concurrent workers don't run the same tick at once.
+    """
 
-        result = await db.execute(
-            select(Session).where(
-                Session.date >= window_start.date(),
-                Session.date <= window_end.date(),
+    async def run() -> None:
+        if not scheduler_elector.is_leader:
+            return
+        async with AsyncSessionLocal() as db:
+            acquired = await db.scalar(
+                select(func.pg_try_advisory_xact_lock(func.hashtext(name)))
             )
-        )
-        sessions = result.scalars().all()
+            if not acquired:
+                logger.debug("Skipping %s: another worker is running it", name)
+                return
+            await tick(db)
+            await db.commit()
 
-        for session in sessions:
-            # Combine date and time
-            session_datetime = datetime.combine(session.date, session.start_time)
+    return run
 
-            # Check if within window
-            if not (window_start <= session_datetime <= window_end):
-                continue
 
-            # Skip if already sent
-            if session.id in sent_reminders["24h"]:
-                continue
+async def _mentees_with_email(db: AsyncSession) -> list[MenteeProfile]:
+    result = await db.execute(
+        select(MenteeProfile).options(selectinload(MenteeProfile.user))
+    )
+    return [m for m in result.scalars().all() if m.user and m.user.email]
+
+
+async def queue_24h_reminders(db: AsyncSession) -> None:
+    """Queue 24-hour reminder emails for upcoming sessions."""
+    logger.info("Running 24h reminder check...")
 
-            # Get all mentees
-            mentees_result = await db.execute(
-                select(MenteeProfile).options(selectinload(MenteeProfile.user))
+    # Find sessions happening in ~24 hours (23-25 hour window)
+    now = datetime.utcnow()
+    window_start = now + timedelta(hours=23)
+    window_end = now + timedelta(hours=25)
+
+    result = await db.execute(
+        select(Session).where(
+            Session.date >= window_start.date(),
+            Session.date <= window_end.date(),
+        )
+    )
+    for session in result.scalars().all():
+        session_datetime = datetime.combine(session.date, session.start_time)
+        if window_start <= session_datetime <= window_end:
+            await enqueue_job(
+                db,
+                "send_session_reminders",
+                dedup_key=f"session_reminders:24h:{session.id}",
+                session_id=session.id,
+                kind="24h",
             )
-            mentees = mentees_result.scalars().all()
-
-            sent_count = 0
-            for mentee in mentees:
-                if mentee.user and mentee.user.email:
-                    time_str = session.start_time.strftime("%I:%M %p")
-                    if session.end_time:
-                        time_str += f" - {session.end_time.strftime('%I:%M %p')}"
-
-                    success = await email_service.send_session_reminder_24h(
-                        to_email=mentee.user.email,
-                        mentee_name=mentee.full_name,
-                        session_title=session.title,
-                        session_date=session_datetime,
-                        session_time=time_str,
-                        google_meet_link=session.google_meet_link,
-                    )
-                    if success:
-                        sent_count += 1
-
-            if sent_count > 0:
-                sent_reminders["24h"].add(session.id)
-                logger.info(
-                    "Sent 24h reminders for session %s to %d mentees",
-                    session.title,
-                    sent_count,
-                )
 
 
-async def send_30min_reminders():
-    """Send 30-minute reminder emails for upcoming sessions."""
+async def queue_30min_reminders(db: AsyncSession) -> None:
+    """Queue 30-minute reminder emails for upcoming sessions."""
     logger.info("Running 30min reminder check...")
 
-    async with AsyncSessionLocal() as db:
-        # Find sessions starting in ~30 minutes (25-35 min window)
-        now = datetime.utcnow()
-        window_start = now + timedelta(minutes=25)
-        window_end = now + timedelta(minutes=35)
+    # Find sessions starting in ~30 minutes (25-35 min window)
+    now = datetime.utcnow()
+    window_start = now + timedelta(minutes=25)
+    window_end = now + timedelta(minutes=35)
 
-        result = await db.execute(
-            select(Session).where(Session.date == now.date())
-        )
-        sessions = result.scalars().all()
+    result = await db.execute(
+        select(Session).where(Session.date == now.date())
+    )
+    for session in result.scalars().all():
+        session_datetime = datetime.combine(session.date, session.start_time)
+        if window_start <= session_datetime <= window_end:
+            await enqueue_job(
+                db,
+                "send_session_reminders",
+                dedup_key=f"session_reminders:30min:{session.id}",
+                session_id=session.id,
+                kind="30min",
+            )
 
-        for session in sessions:
-            # Combine date and time
-            session_datetime = datetime.combine(session.date, session.start_time)
 
-            # Check if within window
-            if not (window_start <= session_datetime <= window_end):
-                continue
+async def queue_attendance_finalization(db: AsyncSession) -> None:
+    """Queue attendance finalization for sessions that ended in the last hour."""
+    logger.info("Running attendance finalization check...")
 
-            # Skip if already sent
-            if session.id in sent_reminders["30min"]:
-                continue
+    now = datetime.utcnow()
+    one_hour_ago = now - timedelta(hours=1)
 
-            # Get all mentees
-            mentees_result = await db.execute(
-                select(MenteeProfile).options(selectinload(MenteeProfile.user))
+    result = await db.execute(
+        select(Session).where(Session.date == now.date())
+    )
+    for session in result.scalars().all():
+        if not session.end_time:
+            continue
+
+        session_end = datetime.combine(session.date, session.end_time)
+        if one_hour_ago <= session_end <= now:
+            await enqueue_job(
+                db,
+                "finalize_session_attendance",
+                dedup_key=f"finalize_attendance:{session.id}",
+                session_id=session.id,
             )
-            mentees = mentees_result.scalars().all()
-
-            sent_count = 0
-            for mentee in mentees:
-                if mentee.user and mentee.user.email:
-                    success = await email_service.send_session_reminder_30min(
-                        to_email=mentee.user.email,
-                        mentee_name=mentee.full_name,
-                        session_title=session.title,
-                        google_meet_link=session.google_meet_link,
-                    )
-                    if success:
-                        sent_count += 1
-
-            if sent_count > 0:
-                sent_reminders["30min"].add(session.id)
-                logger.info(
-                    "Sent 30min reminders for session %s to %d mentees",
-                    session.title,
-                    sent_count,
-                )
 
 
-async def finalize_attendance():
-    """Mark absent mentees after session ends and send attendance summaries."""
-    logger.info("Running attendance finalization check...")
+async def prune_finished_jobs(db: AsyncSession) -> None:
+    """Delete finished jobs (and so their dedup keys) past the retention period."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=JOB_RETENTION_DAYS)
+    deleted = await JobRepository(db).delete_finished_before(cutoff)
+    logger.info("Pruned %d finished jobs", deleted)
 
-    async with AsyncSessionLocal() as db:
-        # Find sessions that ended in the last hour
-        now = datetime.utcnow()
-        one_hour_ago = now - timedelta(hours=1)
 
-        result = await db.execute(
-            select(Session).where(Session.date == now.date())
-        )
-        sessions = result.scalars().all()
+async def prune_rate_limit_counters(db: AsyncSession) -> None:
+    """Delete shared rate limit counters that no longer affect any limit."""
+    deleted = await RateLimitRepository(db).delete_expired(datetime.now(timezone.utc))
+    logger.info("Pruned %d expired rate limit counters", deleted)
 
-        for session in sessions:
-            if not session.end_time:
-                continue
 
-            # Check if session ended within the last hour
-            session_end = datetime.combine(session.date, session.end_time)
-            if not (one_hour_ago <= session_end <= now):
-                continue
+async def prune_telegram_processed_updates(db: AsyncSession) -> None:
+    """Forget webhook update_ids that Telegram will no longer redeliver."""
+    retention = timedelta(hours=TELEGRAM_PROCESSED_UPDATE_RETENTION_HOURS)
+    cutoff = datetime.now(timezone.utc) - retention
+    deleted = await TelegramProcessedUpdateRepository(db).delete_processed_before(cutoff)
+    logger.info("Pruned %d processed Telegram update ids", deleted)
 
-            # Get all mentees
-            mentees_result = await db.execute(
-                select(MenteeProfile).options(selectinload(MenteeProfile.user))
-            )
-            mentees = mentees_result.scalars().all()
 
-            # Get existing attendance records for this session
-            attendance_result = await db.execute(
-                select(Attendance).where(Attendance.session_id == session.id)
+async def sweep_profile_pictures(db: AsyncSession) -> None:
+    """
+    Delete stored profile pictures that no profile references.
+    Files written within the grace period are kept, since the upload that
+    wrote them may not have committed its profile change yet.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=PROFILE_PICTURE_SWEEP_GRACE_HOURS)
+    deleted = await delete_unused_profile_pictures(
+        MenteeRepository(db).find_profile_pic_urls_in_use, modified_before=cutoff
+    )
+    logger.info("Swept %d unused profile pictures", deleted)
+
+
+async def send_session_reminders(session_id: int, kind: str) -> None:
+    """Job: send the 24h or 30min reminder email for a session to every mentee."""
+    async with AsyncSessionLocal() as db:
+        session = await db.get(Session, session_id)
+        if session is None:
+            return
+        mentees = await _mentees_with_email(db)
+
+    session_datetime = datetime.combine(session.date, session.start_time)
+    sent_count = 0
+    for mentee in mentees:
+        if kind == "24h":
+            time_str = session.start_time.strftime("%I:%M %p")
+            if session.end_time:
+                time_str += f" - {session.end_time.strftime('%I:%M %p')}"
+
+            success = await email_service.send_session_reminder_24h(
+                to_email=mentee.user.email,
+                mentee_name=mentee.full_name,
+                session_title=session.title,
+                session_date=session_datetime,
+                session_time=time_str,
+                google_meet_link=session.google_meet_link,
             )
-            attendance_records = {a.mentee_id: a for a in attendance_result.scalars().all()}
-
-            for mentee in mentees:
-                attendance = attendance_records.get(mentee.id)
-
-                if attendance:
-                    # Send summary for existing attendance
-                    if mentee.user and mentee.user.email:
-                        await email_service.send_attendance_summary(
-                            to_email=mentee.user.email,
-                            mentee_name=mentee.full_name,
-                            session_title=session.title,
-                            status=attendance.status.value,
-                            joined_at=attendance.joined_at,
-                        )
-                else:
-                    # Create ABSENT record
-                    absent_record = Attendance(
+        else:
+            success = await email_service.send_session_reminder_30min(
+                to_email=mentee.user.email,
+                mentee_name=mentee.full_name,
+                session_title=session.title,
+                google_meet_link=session.google_meet_link,
+            )
+        if success:
+            sent_count += 1
+
+    if mentees and sent_count == 0:
+        # Retried by the job runner with backoff
+        raise RuntimeError(f"No {kind} reminders could be sent for session {session_id}")
+
+    logger.info(
+        "Sent %s reminders for session %s to %d mentees",
+        kind,
+        session.title,
+        sent_count,
+    )
+
+
+async def finalize_session_attendance(session_id: int) -> None:
+    """Job: mark absent mentees after a session ends and send attendance summaries."""
+    async with AsyncSessionLocal() as db:
+        session = await db.get(Session, session_id)
+        if session is None:
+            return
+
+        result = await db.execute(
+            select(MenteeProfile).options(selectinload(MenteeProfile.user))
+        )
+        mentees = result.scalars().all()
+
+        # Get existing attendance records for this session
+        attendance_result = await db.execute(
+            select(Attendance).where(Attendance.session_id == session.id)
+        )
+        attendance_records = {a.mentee_id: a for a in attendance_result.scalars().all()}
+
+        summaries: list[tuple[MenteeProfile, str, datetime | None]] = []
+        for mentee in mentees:
+            attendance = attendance_records.get(mentee.id)
+            if attendance:
+                summaries.append((mentee, attendance.status.value, attendance.joined_at))
+            else:
+                # Create ABSENT record
+                db.add(
+                    Attendance(
                         session_id=session.id,
                         mentee_id=mentee.id,
                         status=AttendanceStatus.ABSENT,
                     )
-                    db.add(absent_record)
+                )
+                summaries.append((mentee, "ABSENT", None))
+
+        await db.commit()
+
+    for mentee, status, joined_at in summaries:
+        if mentee.user and mentee.user.email:
+            await email_service.send_attendance_summary(
+                to_email=mentee.user.email,
+                mentee_name=mentee.full_name,
+                session_title=session.title,
+                status=status,
+                joined_at=joined_at,
+            )
 
-                    # Send absent notification
-                    if mentee.user and mentee.user.email:
-                        await email_service.send_attendance_summary(
-                            to_email=mentee.user.email,
-                            mentee_name=mentee.full_name,
-                            session_title=session.title,
-                            status="ABSENT",
-                        )
+    logger.info("Finalized attendance for session %s", session.title)
 
-            await db.commit()
-            logger.info("Finalized attendance for session %s", session.title)
+
+# Scheduler instance
+scheduler = AsyncIOScheduler()
 
 
-def clear_old_reminders():
-    """Clear reminder tracking for old sessions (cleanup task)."""
-    # This runs daily to prevent memory buildup
-    # In production, you'd track this in the database instead
-    sent_reminders["24h"].clear()
-    sent_reminders["30min"].clear()
-    logger.info("Cleared reminder tracking cache")
 
+def _on_leadership_change(is_leader: bool) -> None:
+    if not scheduler.running:
+        return
+    if is_leader:
+        scheduler.resume()
+        logger.info("Scheduler resumed on this node")
+    else:
+        scheduler.pause()
+        logger.info("Scheduler paused on this node")
 
-# Scheduler instance
-scheduler = AsyncIOScheduler()
+
+# Singleton instance
+scheduler_elector = LeaderElector(SCHEDULER_LOCK_NAME)
+scheduler_elector.add_listener(_on_leadership_change)
 
 
 def setup_scheduler():
     """Configure and return the scheduler with all jobs."""
     # Check for 24h reminders every hour
     scheduler.add_job(
-        send_24h_reminders,
+        periodic("queue_24h_reminders", queue_24h_reminders),
         trigger=IntervalTrigger(hours=1),
         id="send_24h_reminders",
         name="Send 24-hour session reminders",
@@ -236,7 +310,7 @@ def setup_scheduler():
 
     # Check for 30min reminders every 10 minutes
     scheduler.add_job(
-        send_30min_reminders,
+        periodic("queue_30min_reminders", queue_30min_reminders),
         trigger=IntervalTrigger(minutes=10),
         id="send_30min_reminders",
         name="Send 30-minute session reminders",
@@ -245,19 +319,46 @@ def setup_scheduler():
 
     # Finalize attendance every 30 minutes
     scheduler.add_job(
-        finalize_attendance,
+        periodic("queue_attendance_finalization", queue_attendance_finalization),
         trigger=IntervalTrigger(minutes=30),
         id="finalize_attendance",
         name="Finalize session attendance",
         replace_existing=True,
     )
 
-    # Clear old reminder cache daily
+    # Prune finished jobs daily
+    scheduler.add_job(
+        periodic("prune_finished_jobs", prune_finished_jobs),
+        trigger=IntervalTrigger(days=1),
+        id="prune_finished_jobs",
+        name="Prune finished jobs",
+        replace_existing=True,
+    )
+
+    # Prune expired rate limit counters (RATE_LIMIT_BACKEND=postgres)
+    scheduler.add_job(
+        periodic("prune_rate_limit_counters", prune_rate_limit_counters),
+        trigger=IntervalTrigger(minutes=10),
+        id="prune_rate_limit_counters",
+        name="Prune expired rate limit counters",
+        replace_existing=True,
+    )
+
+    # Prune processed Telegram update ids every hour
+    scheduler.add_job(
+        periodic("prune_telegram_processed_updates", prune_telegram_processed_updates),
+        trigger=IntervalTrigger(hours=1),
+        id="prune_telegram_processed_updates",
+        name="Prune processed Telegram update ids",
+        replace_existing=True,
+    )
+
+    # Remove unused profile pictures daily
     scheduler.add_job(
-        clear_old_reminders,
+        periodic("sweep_profile_pictures", sweep_profile_pictures),
         trigger=IntervalTrigger(days=1),
-        id="clear_old_reminders",
-        name="Clear reminder cache",
+        id="sweep_profile_pictures",
+        name="Sweep unused profile pictures",
         replace_existing=True,
     )
 
@@ -265,9 +366,12 @@ def setup_scheduler():
 
 
 def start_scheduler():
-    """Start the scheduler."""
+    """
+    Start the scheduler paused; it runs while this node holds the scheduler
+    leader lock. scheduler_elector.run() must be running for it to tick.
+    """
     if not scheduler.running:
-        scheduler.start()
+        scheduler.start(paused=True)
         logger.info("Scheduler started with %d jobs", len(scheduler.get_jobs()))
 
 
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import date
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.constants import MEET_SCORE_WEIGHT, TELEGRAM_SCORE_WEIGHT
@@ -8,7 +9,7 @@ from app.repositories.telegram_repo import TelegramStatsRepository
 from app.repositories.program_repo import ProgramRepository
 
 
-@dataclass
+@dataclass(slots=True)
 class LeaderboardEntry:
     rank: int
     mentee_id: int
@@ -30,9 +31,12 @@ class ScoringService:
         self.program_repo = ProgramRepository(db)
 
     async def compute_leaderboard(
-        self, program_id: int, track: str | None = None
+        self, program_id: int, track: str | None = None, since: date | None = None
     ) -> list[LeaderboardEntry]:
-        """Compute leaderboard with attendance and Telegram scores."""
+        """
+        Compute leaderboard with attendance and Telegram scores.
+        With `since`, only Telegram messages from that UTC day onwards count.
+        """
         program = await self.program_repo.find_by_id(program_id)
         if program is None:
             raise NotFoundError("Program", program_id)
@@ -47,17 +51,17 @@ class ScoringService:
 
         # Get telegram stats
         telegram_stats = await self.telegram_repo.get_stats_by_program(
-            program_id, track
+            program_id, track, since
         )
-        telegram_map = {s.mentee_id: s.message_count for s in telegram_stats}
+        telegram_map = dict(telegram_stats)
 
         entries = []
         for m in mentees:
             # Attendance score (80% weight)
-            meet_score = (m["present_count"] / total_core) * 100 if total_core > 0 else 0
+            meet_score = (m.present_count / total_core) * 100 if total_core > 0 else 0
 
             # Telegram score (20% weight, capped at 100)
-            messages = telegram_map.get(m["mentee_id"], 0)
+            messages = telegram_map.get(m.mentee_id, 0)
             telegram_score = (
                 min((messages / target_messages) * 100, 100)
                 if target_messages > 0
@@ -72,11 +76,11 @@ class ScoringService:
             entries.append(
                 LeaderboardEntry(
                     rank=0,  # Will be set after sorting
-                    mentee_id=m["mentee_id"],
-                    mentee_program_id=m["mentee_program_id"],
-                    full_name=m["full_name"],
-                    track=m["track"],
-                    sessions_attended=m["present_count"],
+                    mentee_id=m.mentee_id,
+                    mentee_program_id=m.mentee_program_id,
+                    full_name=m.full_name,
+                    track=m.track,
+                    sessions_attended=m.present_count,
                     total_core_sessions=total_core,
                     meet_score=round(meet_score, 1),
                     telegram_messages=messages,
@@ -1,11 +1,15 @@
 from datetime import date, time, datetime, timezone
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError
-from app.core.constants import ResourceType
+from app.core.constants import ResourceType, UPCOMING_SESSION_FRESH_SECONDS
+from app.database import AsyncSessionLocal
 from app.repositories.session_repo import SessionRepository, SessionResourceRepository
 from app.repositories.attendance_repo import AttendanceCodeRepository
 from app.models.session import Session, SessionResource
+from app.services.code_window_service import code_window_cache
+from app.services.singleflight_service import data_versions, mentee_reads
 
 
 class SessionService:
@@ -15,9 +19,14 @@ class SessionService:
         self.code_repo = AttendanceCodeRepository(db)
         self.db = db
 
-    async def list_sessions(self, program_id: int | None = None) -> list[Session]:
-        """List all sessions, optionally filtered by program."""
-        return await self.repo.find_all_by_program(program_id)
+    async def list_sessions(
+        self, program_id: int | None = None
+    ) -> tuple[list[Row], dict[int, list[Row]]]:
+        """
+        List all sessions, optionally filtered by program, as flat rows plus
+        their resource rows keyed by session id.
+        """
+        return await self.repo.find_list_rows(program_id)
 
     async def get_session(self, session_id: int) -> Session:
         """Get a session by ID with resources."""
@@ -135,11 +144,34 @@ class SessionService:
         """
         Get the next upcoming session and whether it has an active code.
         Returns (session, has_active_code).
+
+        Every polling mentee asks for the same session, so it is loaded once
+        and reused for UPCOMING_SESSION_FRESH_SECONDS, or until this process
+        commits a change to sessions or their resources. The code status is
+        served from the in-memory code window cache and only falls back to
+        the database when the cached state is stale.
         """
-        session = await self.get_upcoming_session()
+        session = await mentee_reads.do(
+            "upcoming_session",
+            _load_upcoming_session,
+            version=data_versions.get(Session, SessionResource),
+            fresh_seconds=UPCOMING_SESSION_FRESH_SECONDS,
+        )
         if session is None:
             return None, False
 
         now = datetime.now(timezone.utc)
-        active_code = await self.code_repo.get_active_code(session.id, now)
-        return session, active_code is not None
+        has_active_code = code_window_cache.is_open(session.id, now)
+        if has_active_code is None:
+            active_code = await self.code_repo.get_active_code(session.id, now)
+            code_window_cache.record(
+                session.id, active_code.expires_at if active_code else None, now
+            )
+            has_active_code = active_code is not None
+        return session, has_active_code
+
+
+async def _load_upcoming_session() -> Session | None:
+    # Shared by concurrent requests, so it can't use any one request's session
+    async with AsyncSessionLocal() as db:
+        return await SessionService(db).get_upcoming_session()
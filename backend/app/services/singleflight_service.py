@@ -0,0 +1,174 @@
+"""
+Request coalescing for expensive read-only computations.
+
+Concurrent calls with the same key share one in-flight computation instead
+of each running the same aggregation. Results can optionally be kept for a
+short fresh period and then served stale while one background refresh runs.
+
+Keys are paired with a data version built from per-table counters that
+are bumped when a DB session commits changes to those tables, so a write in
+this process is never followed by a stale read. Writes from other processes
+are picked up once the fresh period ends.
+"""
+import asyncio
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session as OrmSession
+
+logger = logging.getLogger(__name__)
+
+CHANGED_TABLES_KEY = "singleflight_changed_tables"
+
+
+class DataVersions:
+    """Per-table change counters for this process."""
+
+    def __init__(self):
+        self._versions: Counter[str] = Counter()
+
+    def get(self, *models: type) -> tuple[int, ...]:
+        """Current versions of the tables behind the given mapped classes."""
+        return tuple(self._versions[model.__tablename__] for model in models)
+
+    def bump(self, tables: set[str]) -> None:
+        for table in tables:
+            self._versions[table] += 1
+
+
+@dataclass
+class _CachedResult:
+    version: Hashable
+    value: Any
+    fresh_until: float
+    stale_until: float
+
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight: dict[tuple[Hashable, Hashable], asyncio.Task] = {}
+        self._cache: dict[Hashable, _CachedResult] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        version: Hashable = None,
+        fresh_seconds: float = 0,
+        stale_seconds: float = 0,
+    ) -> Any:
+        """
+        Return compute()'s result for key, sharing it with concurrent callers.
+
+        With fresh_seconds, the result is reused until it expires; with
+        stale_seconds on top, an expired result is still returned for that
+        long while a single background call refreshes it. A cached result
+        is never used once the version changes. Exceptions are shared by
+        everyone waiting and are not cached.
+        """
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached is not None and cached.version == version:
+            if now < cached.fresh_until:
+                return cached.value
+            if now < cached.stale_until:
+                self._start(key, compute, version, fresh_seconds, stale_seconds)
+                return cached.value
+
+        # shield: a cancelled caller must not cancel the computation others wait on
+        return await asyncio.shield(
+            self._start(key, compute, version, fresh_seconds, stale_seconds)
+        )
+
+    def _start(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        version: Hashable,
+        fresh_seconds: float,
+        stale_seconds: float,
+    ) -> asyncio.Task:
+        flight = (key, version)
+        task = self._inflight.get(flight)
+        if task is None:
+            task = asyncio.create_task(
+                self._run(flight, compute, fresh_seconds, stale_seconds)
+            )
+            self._inflight[flight] = task
+            task.add_done_callback(_log_failure)
+        return task
+
+    async def _run(
+        self,
+        flight: tuple[Hashable, Hashable],
+        compute: Callable[[], Awaitable[Any]],
+        fresh_seconds: float,
+        stale_seconds: float,
+    ) -> Any:
+        key, version = flight
+        try:
+            value = await compute()
+            if fresh_seconds > 0:
+                now = time.monotonic()
+                self._cache[key] = _CachedResult(
+                    version=version,
+                    value=value,
+                    fresh_until=now + fresh_seconds,
+                    stale_until=now + fresh_seconds + stale_seconds,
+                )
+            return value
+        finally:
+            del self._inflight[flight]
+            self._prune()
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, cached in self._cache.items() if now >= cached.stale_until]:
+            del self._cache[key]
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+def _log_failure(task: asyncio.Task) -> None:
+    # Also retrieves the exception of background refreshes nobody awaits
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Coalesced computation failed: %r", task.exception())
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _record_flushed_tables(session: OrmSession, flush_context) -> None:
+    tables = session.info.setdefault(CHANGED_TABLES_KEY, set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        tables.add(instance.__table__.name)
+
+
+@event.listens_for(OrmSession, "do_orm_execute")
+def _record_statement_tables(state: ORMExecuteState) -> None:
+    # Bulk INSERT/UPDATE/DELETE statements bypass the flush
+    if state.is_insert or state.is_update or state.is_delete:
+        table = getattr(state.statement, "table", None)
+        if table is not None and hasattr(table, "name"):
+            state.session.info.setdefault(CHANGED_TABLES_KEY, set()).add(table.name)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _bump_data_versions(session: OrmSession) -> None:
+    tables = session.info.pop(CHANGED_TABLES_KEY, None)
+    if tables:
+        data_versions.bump(tables)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_changed_tables(session: OrmSession) -> None:
+    session.info.pop(CHANGED_TABLES_KEY, None)
+
+
+# Singleton instances
+data_versions = DataVersions()
+coordinator_reads = SingleFlight()
+mentee_reads = SingleFlight()
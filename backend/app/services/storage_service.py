@@ -0,0 +1,296 @@
+"""Object storage for uploaded files: local filesystem or S3-compatible buckets."""
+import asyncio
+import os
+import shutil
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+
+from app.config import get_settings
+from app.core.media import IMMUTABLE_CACHE_CONTROL
+
+settings = get_settings()
+
+PRESIGNED_UPLOAD_EXPIRES_SECONDS = 600
+
+
+class StorageError(Exception):
+    """Raised when a storage operation fails or is unsupported."""
+
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(message)
+
+
+class StorageBackend(ABC):
+    """
+    Interface for upload storage drivers.
+
+    Keys are slash-separated relative paths such as "profiles/<name>.png".
+    Stored objects are immutable: callers write new keys rather than
+    overwriting existing ones.
+    """
+
+    url_prefix: str
+
+    def url(self, key: str) -> str:
+        """Public URL for a key."""
+        return f"{self.url_prefix}{key}"
+
+    def key_for_url(self, url: str) -> str | None:
+        """Key for a URL returned by url(), or None if it isn't ours."""
+        if not url or not url.startswith(self.url_prefix):
+            return None
+        key = url[len(self.url_prefix):]
+        parts = key.split("/")
+        if any(part in ("", ".", "..") or part.startswith(".") for part in parts):
+            return None
+        return key
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Whether an object is stored under key."""
+
+    @abstractmethod
+    async def size(self, key: str) -> int | None:
+        """Size of an object in bytes, or None if it doesn't exist."""
+
+    @abstractmethod
+    async def put_file(self, key: str, source: Path, content_type: str) -> None:
+        """Store a local file under key. The source file is consumed."""
+
+    @abstractmethod
+    async def get_file(self, key: str, destination: Path, max_size: int) -> int:
+        """Download an object to a local file and return its size."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Delete an object; missing objects are ignored."""
+
+    @abstractmethod
+    async def list_keys(self, prefix: str) -> list[tuple[str, datetime]]:
+        """(key, last modified) for every object whose key starts with prefix."""
+
+    @abstractmethod
+    async def touch(self, key: str, content_type: str) -> None:
+        """Set an object's last modified time to now."""
+
+    async def presigned_upload(self, key: str, content_type: str, max_size: int) -> dict:
+        """Form fields for a direct browser-to-storage POST upload."""
+        raise StorageError("Direct uploads are not supported by this storage backend")
+
+
+class LocalStorage(StorageBackend):
+    """Files under settings.upload_dir, served by the /static mount."""
+
+    def __init__(self, root: str, url_prefix: str = "/static/"):
+        self.root = Path(root)
+        self.url_prefix = url_prefix
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self._path(key).exists)
+
+    def _size(self, key: str) -> int | None:
+        try:
+            return self._path(key).stat().st_size
+        except FileNotFoundError:
+            return None
+
+    async def size(self, key: str) -> int | None:
+        return await asyncio.to_thread(self._size, key)
+
+    def _put(self, key: str, source: Path) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(source, path)
+
+    async def put_file(self, key: str, source: Path, content_type: str) -> None:
+        await asyncio.to_thread(self._put, key, source)
+
+    def _get(self, key: str, destination: Path, max_size: int) -> int:
+        path = self._path(key)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            raise StorageError(f"Object not found: {key}")
+        if size > max_size:
+            raise StorageError("File too large")
+        shutil.copyfile(path, destination)
+        return size
+
+    async def get_file(self, key: str, destination: Path, max_size: int) -> int:
+        return await asyncio.to_thread(self._get, key, destination, max_size)
+
+    def _delete(self, key: str) -> None:
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+    def _list_keys(self, prefix: str) -> list[tuple[str, datetime]]:
+        directory, _, name_prefix = prefix.rpartition("/")
+        try:
+            entries = list(os.scandir(self._path(directory)))
+        except FileNotFoundError:
+            return []
+        return [
+            (
+                f"{directory}/{entry.name}" if directory else entry.name,
+                datetime.fromtimestamp(entry.stat().st_mtime, timezone.utc),
+            )
+            for entry in entries
+            if entry.is_file() and entry.name.startswith(name_prefix)
+        ]
+
+    async def list_keys(self, prefix: str) -> list[tuple[str, datetime]]:
+        return await asyncio.to_thread(self._list_keys, prefix)
+
+    async def touch(self, key: str, content_type: str) -> None:
+        await asyncio.to_thread(os.utime, self._path(key))
+
+
+class S3Storage(StorageBackend):
+    """
+    S3-compatible bucket (AWS S3, MinIO, R2, ...).
+    boto3 is synchronous, so every call runs in a worker thread.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        public_url: str,
+        endpoint_url: str | None = None,
+        region: str | None = None,
+        access_key: str | None = None,
+        secret_key: str | None = None,
+    ):
+        import boto3
+        from botocore.config import Config
+
+        self.bucket = bucket
+        self.url_prefix = public_url.rstrip("/") + "/"
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key,
+            config=Config(signature_version="s3v4"),
+        )
+
+    def _size(self, key: str) -> int | None:
+        from botocore.exceptions import ClientError
+
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self._size, key) is not None
+
+    async def size(self, key: str) -> int | None:
+        return await asyncio.to_thread(self._size, key)
+
+    def _put(self, key: str, source: Path, content_type: str) -> None:
+        try:
+            self.client.upload_file(
+                str(source),
+                self.bucket,
+                key,
+                ExtraArgs={
+                    "ContentType": content_type,
+                    # Keys are content-addressed, so objects never change
+                    "CacheControl": IMMUTABLE_CACHE_CONTROL,
+                },
+            )
+        finally:
+            try:
+                os.unlink(source)
+            except OSError:
+                pass
+
+    async def put_file(self, key: str, source: Path, content_type: str) -> None:
+        await asyncio.to_thread(self._put, key, source, content_type)
+
+    def _get(self, key: str, destination: Path, max_size: int) -> int:
+        from botocore.exceptions import ClientError
+
+        try:
+            size = self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+        except ClientError:
+            raise StorageError(f"Object not found: {key}")
+        if size > max_size:
+            raise StorageError("File too large")
+        self.client.download_file(self.bucket, key, str(destination))
+        return size
+
+    async def get_file(self, key: str, destination: Path, max_size: int) -> int:
+        return await asyncio.to_thread(self._get, key, destination, max_size)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=key)
+
+    def _list_keys(self, prefix: str) -> list[tuple[str, datetime]]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        return [
+            (obj["Key"], obj["LastModified"])
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix)
+            for obj in page.get("Contents", [])
+        ]
+
+    async def list_keys(self, prefix: str) -> list[tuple[str, datetime]]:
+        return await asyncio.to_thread(self._list_keys, prefix)
+
+    def _touch(self, key: str, content_type: str) -> None:
+        # Copying an object onto itself is only allowed when replacing its metadata
+        self.client.copy_object(
+            Bucket=self.bucket,
+            Key=key,
+            CopySource={"Bucket": self.bucket, "Key": key},
+            MetadataDirective="REPLACE",
+            ContentType=content_type,
+            CacheControl=IMMUTABLE_CACHE_CONTROL,
+        )
+
+    async def touch(self, key: str, content_type: str) -> None:
+        await asyncio.to_thread(self._touch, key, content_type)
+
+    def _presign(self, key: str, content_type: str, max_size: int) -> dict:
+        return self.client.generate_presigned_post(
+            self.bucket,
+            key,
+            Fields={"Content-Type": content_type},
+            Conditions=[
+                {"Content-Type": content_type},
+                ["content-length-range", 1, max_size],
+            ],
+            ExpiresIn=PRESIGNED_UPLOAD_EXPIRES_SECONDS,
+        )
+
+    async def presigned_upload(self, key: str, content_type: str, max_size: int) -> dict:
+        return await asyncio.to_thread(self._presign, key, content_type, max_size)
+
+
+@lru_cache
+def get_storage() -> StorageBackend:
+    """Get the storage driver selected by settings.storage_backend."""
+    if settings.storage_backend == "s3":
+        return S3Storage(
+            bucket=settings.s3_bucket,
+            public_url=settings.s3_public_url,
+            endpoint_url=settings.s3_endpoint_url or None,
+            region=settings.s3_region or None,
+            access_key=settings.s3_access_key or None,
+            secret_key=settings.s3_secret_key or None,
+        )
+    return LocalStorage(settings.upload_dir)
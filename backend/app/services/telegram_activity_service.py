@@ -0,0 +1,33 @@
+"""
+Telegram activity counting.
+
+Message counts are added to the daily activity table and the running
+totals with one ON CONFLICT upsert each, in the transaction that
+processes the updates: the webhook request, or the batch in which the
+poller stores its offset. A count is therefore never lost once its
+update is marked as processed.
+"""
+from collections import Counter
+from datetime import date
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.telegram_repo import TelegramActivityRepository, TelegramStatsRepository
+
+# (mentee_id, program_id, UTC day the message was sent)
+ActivityKey = tuple[int, int, date]
+
+
+async def add_activity_counts(db: AsyncSession, counts: Counter[ActivityKey]) -> None:
+    """Add message counts to the daily activity and running totals in the caller's transaction."""
+    if not counts:
+        return
+    # Sorted keys give every writer the same row lock order
+    daily = dict(sorted(counts.items()))
+    totals: Counter[tuple[int, int]] = Counter()
+    for (mentee_id, program_id, _), count in daily.items():
+        totals[(mentee_id, program_id)] += count
+
+    await TelegramActivityRepository(db).add_counts(daily)
+    await TelegramStatsRepository(db).add_counts(dict(sorted(totals.items())))
+
@@ -2,14 +2,12 @@
 Telegram Bot Service - handles bot configuration and webhook setup.
 """
 import logging
-import httpx
 
 from app.config import get_settings
+from app.services.telegram_client import TelegramAPIError, get_telegram_client
 
 logger = logging.getLogger(__name__)
 
-TELEGRAM_API_BASE = "https://api.telegram.org/bot"
-
 
 async def setup_telegram_webhook() -> bool:
     """
@@ -25,6 +23,10 @@ async def setup_telegram_webhook() -> bool:
         logger.info("Telegram bot token not configured, skipping webhook setup")
         return False
 
+    if settings.telegram_mode == "polling":
+        logger.info("Telegram polling mode enabled, skipping webhook setup")
+        return False
+
     if not settings.webhook_base_url:
         logger.warning("WEBHOOK_BASE_URL not configured, skipping Telegram webhook setup")
         return False
@@ -32,29 +34,23 @@ async def setup_telegram_webhook() -> bool:
     # Build the webhook URL
     webhook_url = f"{settings.webhook_base_url.rstrip('/')}/api/v1/telegram/webhook"
 
-    # Build Telegram API URL
-    api_url = f"{TELEGRAM_API_BASE}{settings.telegram_bot_token}/setWebhook"
-
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                api_url,
-                json={
-                    "url": webhook_url,
-                    "secret_token": settings.telegram_webhook_secret or None,
-                    "allowed_updates": ["message"],  # Only receive message updates
-                }
-            )
-
-            result = response.json()
-
-            if result.get("ok"):
-                logger.info(f"Telegram webhook registered successfully: {webhook_url}")
-                return True
-            else:
-                logger.error(f"Failed to register Telegram webhook: {result.get('description')}")
-                return False
-
+        await get_telegram_client().call(
+            "setWebhook",
+            {
+                "url": webhook_url,
+                "secret_token": settings.telegram_webhook_secret or None,
+                "allowed_updates": ["message"],  # Only receive message updates
+                # One delivery at a time keeps update_ids in order for deduplication
+                "max_connections": 1,
+            },
+        )
+        logger.info(f"Telegram webhook registered successfully: {webhook_url}")
+        return True
+
+    except TelegramAPIError as e:
+        logger.error(f"Failed to register Telegram webhook: {e.message}")
+        return False
     except Exception as e:
         logger.error(f"Error setting up Telegram webhook: {e}")
         return False
@@ -67,16 +63,8 @@ async def get_webhook_info() -> dict | None:
     if not settings.telegram_bot_token:
         return None
 
-    api_url = f"{TELEGRAM_API_BASE}{settings.telegram_bot_token}/getWebhookInfo"
-
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(api_url)
-            result = response.json()
-
-            if result.get("ok"):
-                return result.get("result")
-            return None
+        return await get_telegram_client().call("getWebhookInfo")
     except Exception:
         return None
 
@@ -88,12 +76,7 @@ async def delete_webhook() -> bool:
     if not settings.telegram_bot_token:
         return False
 
-    api_url = f"{TELEGRAM_API_BASE}{settings.telegram_bot_token}/deleteWebhook"
-
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(api_url)
-            result = response.json()
-            return result.get("ok", False)
+        return bool(await get_telegram_client().call("deleteWebhook"))
     except Exception:
         return False
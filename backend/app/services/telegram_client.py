@@ -0,0 +1,181 @@
+"""
+Shared Telegram Bot API client.
+
+One long-lived httpx.AsyncClient per process, so calls reuse pooled
+keep-alive connections (HTTP/2 when h2 is installed). Calls get per-method
+read timeouts (TELEGRAM_API_READ_TIMEOUTS), retries on 429 (honouring
+retry_after) and on 5xx/transport errors, and send* methods go through a
+process-wide rate limiter so bulk sends stay under Telegram's flood limits.
+"""
+import asyncio
+import logging
+import time
+from typing import Any
+
+import httpx
+
+from app.config import get_settings
+from app.core.constants import (
+    TELEGRAM_API_MAX_RETRIES,
+    TELEGRAM_API_READ_TIMEOUTS,
+    TELEGRAM_API_RETRY_BASE_SECONDS,
+    TELEGRAM_API_TIMEOUT_SECONDS,
+    TELEGRAM_SEND_RATE_PER_SECOND,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TelegramAPIError(Exception):
+    """Raised when the Bot API rejects a call or stays unavailable after retries."""
+
+    def __init__(self, message: str, error_code: int | None = None):
+        self.message = message
+        self.error_code = error_code
+        super().__init__(message)
+
+
+class _RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across all callers."""
+
+    def __init__(self, rate_per_second: float):
+        self.interval = 1 / rate_per_second
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def bot_id_from_token(bot_token: str) -> int:
+    """The bot's numeric id is the part of its token before the colon."""
+    return int(bot_token.split(":", 1)[0])
+
+
+def _timeout_for(method: str, params: dict[str, Any]) -> httpx.Timeout:
+    read = TELEGRAM_API_READ_TIMEOUTS.get(method, TELEGRAM_API_TIMEOUT_SECONDS)
+    if method == "getUpdates":
+        # Long polling holds the response open for up to params["timeout"]
+        read += params.get("timeout", 0)
+    return httpx.Timeout(TELEGRAM_API_TIMEOUT_SECONDS, read=read)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class TelegramClient:
+    def __init__(
+        self,
+        bot_token: str,
+        api_url: str = "https://api.telegram.org",
+        send_rate: float = TELEGRAM_SEND_RATE_PER_SECOND,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.base_url = f"{api_url.rstrip('/')}/bot{bot_token}/"
+        self._client = httpx.AsyncClient(
+            http2=_http2_available(),
+            timeout=TELEGRAM_API_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            transport=transport,
+        )
+        self._send_limiter = _RateLimiter(send_rate)
+        # Set from a 429's retry_after; every call waits until then
+        self._blocked_until = 0.0
+
+    async def call(self, method: str, params: dict[str, Any] | None = None) -> Any:
+        """
+        Call a Bot API method and return its result.
+
+        Raises:
+            TelegramAPIError: If Telegram rejects the call, or 429/5xx/network
+                errors persist after TELEGRAM_API_MAX_RETRIES retries
+        """
+        params = params or {}
+        timeout = _timeout_for(method, params)
+
+        for attempt in range(TELEGRAM_API_MAX_RETRIES + 1):
+            await self._wait_turn(method)
+            retry_after = TELEGRAM_API_RETRY_BASE_SECONDS * 2 ** attempt
+            try:
+                response = await self._client.post(
+                    self.base_url + method, json=params, timeout=timeout
+                )
+            except httpx.TransportError as e:
+                logger.warning("Telegram %s attempt %d failed: %s", method, attempt + 1, e)
+            else:
+                if response.status_code < 500:
+                    try:
+                        body = response.json()
+                    except ValueError:
+                        raise TelegramAPIError(
+                            f"Telegram {method} returned a non-JSON response",
+                            response.status_code,
+                        )
+                    if body.get("ok"):
+                        return body.get("result")
+                    if response.status_code != 429:
+                        raise TelegramAPIError(
+                            f"Telegram {method} failed: {body.get('description')}",
+                            body.get("error_code"),
+                        )
+                    retry_after = body.get("parameters", {}).get("retry_after", retry_after)
+                    self._blocked_until = max(
+                        self._blocked_until, time.monotonic() + retry_after
+                    )
+                logger.warning(
+                    "Telegram %s returned %d, retrying in %ss",
+                    method, response.status_code, retry_after,
+                )
+
+            if attempt < TELEGRAM_API_MAX_RETRIES:
+                await asyncio.sleep(retry_after)
+
+        raise TelegramAPIError(
+            f"Telegram {method} failed after {TELEGRAM_API_MAX_RETRIES} retries"
+        )
+
+    async def _wait_turn(self, method: str) -> None:
+        blocked = self._blocked_until - time.monotonic()
+        if blocked > 0:
+            await asyncio.sleep(blocked)
+        if method.startswith("send"):
+            await self._send_limiter.acquire()
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+_client: TelegramClient | None = None
+
+
+def get_telegram_client() -> TelegramClient:
+    """
+    Return the process-wide client, creating it on first use.
+
+    Raises:
+        TelegramAPIError: If TELEGRAM_BOT_TOKEN is not configured
+    """
+    global _client
+    if _client is None:
+        settings = get_settings()
+        if not settings.telegram_bot_token:
+            raise TelegramAPIError("Telegram bot token not configured")
+        _client = TelegramClient(settings.telegram_bot_token, settings.telegram_api_url)
+    return _client
+
+
+async def close_telegram_client() -> None:
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.close()
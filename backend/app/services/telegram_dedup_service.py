@@ -0,0 +1,40 @@
+"""
+Drops redelivered Telegram webhook updates.
+
+Telegram retries an update until the webhook answers, so slow or failed
+requests cause the same update_id to arrive again. Each process remembers
+the last TELEGRAM_RECENT_UPDATE_IDS update_ids it has processed, which is
+enough to reject most redeliveries before they touch the database.
+Redeliveries that reach another process, or arrive after a restart, are
+rejected by the telegram_processed_updates table
+(TelegramProcessedUpdateRepository.claim).
+
+Only exact ids are compared. update_ids usually increase by one, but
+Telegram starts again from a random id after a bot has had no updates for
+a week, so a lower id is not evidence of a repeat.
+"""
+from collections import OrderedDict
+
+from app.core.constants import TELEGRAM_RECENT_UPDATE_IDS
+
+
+class TelegramUpdateDeduplicator:
+    def __init__(self, max_recent: int = TELEGRAM_RECENT_UPDATE_IDS):
+        self.max_recent = max_recent
+        self._recent: OrderedDict[int, None] = OrderedDict()
+
+    def seen(self, update_id: int) -> bool:
+        return update_id in self._recent
+
+    def record(self, update_id: int) -> None:
+        self._recent[update_id] = None
+        self._recent.move_to_end(update_id)
+        if len(self._recent) > self.max_recent:
+            self._recent.popitem(last=False)
+
+    def clear(self) -> None:
+        self._recent.clear()
+
+
+# Singleton instance
+telegram_updates = TelegramUpdateDeduplicator()
@@ -0,0 +1,148 @@
+"""
+Fuzzy matching of unmapped Telegram users to mentee profiles.
+
+Candidates are found by blocking rather than comparing every pair: mentees
+are indexed by their normalized Telegram username and by the 3-letter
+prefix of each name token, and an unmapped user is only scored against
+mentees that share one of those keys.
+"""
+import re
+import unicodedata
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Iterable, Sequence
+
+from app.core.constants import TELEGRAM_MATCH_MIN_SCORE
+
+BLOCK_PREFIX_LENGTH = 3
+
+
+@dataclass
+class MatchCandidate:
+    telegram_user_id: int
+    telegram_username: str | None
+    telegram_display_name: str | None
+    message_count: int
+    mentee_profile_id: int
+    mentee_id: str
+    full_name: str
+    score: float  # 0-1 confidence
+    reason: str  # "username" or "name"
+
+
+def _tokens(text: str | None) -> list[str]:
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def _username(username: str | None) -> str:
+    username = "".join(_tokens(username))
+    # Placeholders stand in for mentees without a known username
+    return "" if username.startswith("pending") else username
+
+
+def _block_keys(name_tokens: list[str], username: str) -> set[str]:
+    keys = {
+        f"t:{token[:BLOCK_PREFIX_LENGTH]}"
+        for token in name_tokens
+        if len(token) >= BLOCK_PREFIX_LENGTH
+    }
+    if username:
+        keys.add(f"u:{username}")
+        keys.add(f"t:{username[:BLOCK_PREFIX_LENGTH]}")
+    return keys
+
+
+def _similarity(a: str, b: str) -> float:
+    if not a or not b:
+        return 0.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+@dataclass
+class _Mentee:
+    profile_id: int
+    mentee_id: str
+    full_name: str
+    name_key: str  # Sorted name tokens, so word order doesn't matter
+    compact_name: str  # Name tokens run together, compared with usernames
+    username: str
+
+
+def propose_matches(
+    unmapped_users: Iterable[Sequence],
+    mentees: Iterable[Sequence],
+    min_score: float = TELEGRAM_MATCH_MIN_SCORE,
+) -> list[MatchCandidate]:
+    """
+    Propose at most one mentee per unmapped user and vice versa, best scores first.
+
+    unmapped_users rows: (telegram_user_id, username, display_name, message_count)
+    mentees rows: (profile id, mentee_id, full_name, telegram_username)
+    """
+    blocks: dict[str, list[_Mentee]] = {}
+    for profile_id, mentee_id, full_name, telegram_username in mentees:
+        name_tokens = _tokens(full_name)
+        mentee = _Mentee(
+            profile_id=profile_id,
+            mentee_id=mentee_id,
+            full_name=full_name,
+            name_key=" ".join(sorted(name_tokens)),
+            compact_name="".join(name_tokens),
+            username=_username(telegram_username),
+        )
+        for key in _block_keys(name_tokens, mentee.username):
+            blocks.setdefault(key, []).append(mentee)
+
+    scored: list[MatchCandidate] = []
+    for telegram_user_id, username, display_name, message_count in unmapped_users:
+        name_tokens = _tokens(display_name)
+        name_key = " ".join(sorted(name_tokens))
+        clean_username = _username(username)
+
+        best: tuple[float, str, _Mentee] | None = None
+        seen: set[int] = set()
+        for key in _block_keys(name_tokens, clean_username):
+            for mentee in blocks.get(key, ()):
+                if mentee.profile_id in seen:
+                    continue
+                seen.add(mentee.profile_id)
+
+                if clean_username and clean_username == mentee.username:
+                    score, reason = 1.0, "username"
+                else:
+                    score = max(
+                        _similarity(name_key, mentee.name_key),
+                        _similarity(clean_username, mentee.compact_name),
+                        # Near-identical usernames are likely typos in the sign-up form
+                        0.9 * _similarity(clean_username, mentee.username),
+                    )
+                    reason = "name"
+                if best is None or score > best[0]:
+                    best = (score, reason, mentee)
+
+        if best is not None and best[0] >= min_score:
+            score, reason, mentee = best
+            scored.append(MatchCandidate(
+                telegram_user_id=telegram_user_id,
+                telegram_username=username,
+                telegram_display_name=display_name,
+                message_count=message_count,
+                mentee_profile_id=mentee.profile_id,
+                mentee_id=mentee.mentee_id,
+                full_name=mentee.full_name,
+                score=round(score, 2),
+                reason=reason,
+            ))
+
+    # Each mentee goes to the unmapped user that matches it best
+    scored.sort(key=lambda c: c.score, reverse=True)
+    matches = []
+    taken: set[int] = set()
+    for candidate in scored:
+        if candidate.mentee_profile_id not in taken:
+            taken.add(candidate.mentee_profile_id)
+            matches.append(candidate)
+    return matches
@@ -0,0 +1,120 @@
+"""
+Telegram long-polling ingestion, for deployments without a public webhook URL.
+
+Only one getUpdates consumer may run per bot, so the poller runs in the
+worker that holds the TELEGRAM_POLLER_LOCK_NAME lock. Each batch of updates
+is processed in one transaction together with its message counts and the
+next offset. A crash before commit means the batch is fetched and processed
+again; after commit the stored offset skips it, so every message is counted
+exactly once.
+"""
+import asyncio
+import logging
+from collections import Counter
+from typing import Any
+
+from app.config import get_settings
+from app.core.constants import (
+    TELEGRAM_POLL_BATCH_SIZE,
+    TELEGRAM_POLL_RETRY_SECONDS,
+    TELEGRAM_POLL_TIMEOUT_SECONDS,
+)
+from app.database import AsyncSessionLocal
+from app.repositories.telegram_repo import TelegramBotStateRepository
+from app.services.leader_service import LeaderElector
+from app.services.telegram_bot_service import delete_webhook
+from app.services.telegram_client import bot_id_from_token, get_telegram_client
+from app.services.telegram_activity_service import ActivityKey, add_activity_counts
+from app.services.telegram_service import TelegramService
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_POLLER_LOCK_NAME = "kpdf_telegram_poller"
+
+
+class TelegramPoller:
+    """Consumes getUpdates in batches and checkpoints the offset in the database."""
+
+    def __init__(self, bot_token: str):
+        self.bot_id = bot_id_from_token(bot_token)
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    def stop(self) -> None:
+        # An uncommitted batch is rolled back and fetched again by the next leader
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def run(self) -> None:
+        offset = None
+        started = False
+        while True:
+            try:
+                if not started:
+                    # getUpdates fails while a webhook is registered
+                    await delete_webhook()
+                    async with AsyncSessionLocal() as db:
+                        offset = await TelegramBotStateRepository(db).get_offset(self.bot_id)
+                    started = True
+                    logger.info("Telegram poller started at offset %s", offset)
+
+                updates = await self._get_updates(offset)
+                if updates:
+                    offset = await self._process_batch(updates)
+            except Exception as e:
+                logger.error("Telegram polling failed: %s", e)
+                await asyncio.sleep(TELEGRAM_POLL_RETRY_SECONDS)
+
+    async def _get_updates(self, offset: int | None) -> list[dict[str, Any]]:
+        params: dict[str, Any] = {
+            "timeout": TELEGRAM_POLL_TIMEOUT_SECONDS,
+            "limit": TELEGRAM_POLL_BATCH_SIZE,
+            "allowed_updates": ["message"],
+        }
+        if offset is not None:
+            params["offset"] = offset
+        return await get_telegram_client().call("getUpdates", params)
+
+    async def _process_batch(self, updates: list[dict[str, Any]]) -> int:
+        """Process a batch, its counts and the next offset in one transaction; returns the offset."""
+        next_offset = max(update["update_id"] for update in updates) + 1
+
+        counts: Counter[ActivityKey] = Counter()
+
+        async with AsyncSessionLocal() as db:
+            service = TelegramService(db)
+            for update in updates:
+                try:
+                    async with db.begin_nested():
+                        activity = await service.process_update(update)
+                except Exception:
+                    # Skip a bad update rather than stalling the whole stream on it
+                    logger.exception("Failed to process Telegram update %s", update.get("update_id"))
+                    continue
+                if activity is not None:
+                    counts[activity] += 1
+
+            await add_activity_counts(db, counts)
+            await TelegramBotStateRepository(db).save_offset(self.bot_id, next_offset)
+            await db.commit()
+
+        return next_offset
+
+
+def setup_telegram_poller() -> LeaderElector | None:
+    """
+    Create the poller and its leader election when TELEGRAM_MODE is polling.
+    Returns the elector to run, or None if polling is disabled.
+    """
+    settings = get_settings()
+    if settings.telegram_mode != "polling" or not settings.telegram_bot_token:
+        return None
+
+    poller = TelegramPoller(settings.telegram_bot_token)
+    elector = LeaderElector(TELEGRAM_POLLER_LOCK_NAME)
+    elector.add_listener(lambda is_leader: poller.start() if is_leader else poller.stop())
+    return elector
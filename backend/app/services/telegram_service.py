@@ -1,11 +1,27 @@
+from collections import Counter
+from datetime import datetime, timezone
 from typing import Any
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.constants import MIN_MESSAGE_LENGTH
-from app.core.exceptions import NotFoundError
-from app.repositories.telegram_repo import TelegramStatsRepository, UnmappedTelegramUserRepository
+from app.config import get_settings
+from app.core.constants import MIN_MESSAGE_LENGTH, TELEGRAM_BULK_MAP_MAX_ROWS
+from app.core.exceptions import (
+    NotFoundError,
+    InvalidTelegramMappingError,
+    TooManyRowsError,
+)
+from app.repositories.telegram_repo import (
+    TelegramProcessedUpdateRepository,
+    TelegramStatsRepository,
+    UnmappedTelegramUserRepository,
+)
 from app.repositories.mentee_repo import MenteeRepository
 from app.models.telegram import UnmappedTelegramUser
+from app.services.event_service import run_after_commit
+from app.services.telegram_activity_service import ActivityKey, add_activity_counts
+from app.services.telegram_client import bot_id_from_token
+from app.services.telegram_dedup_service import telegram_updates
+from app.services.telegram_match_service import MatchCandidate, propose_matches
 
 
 class TelegramService:
@@ -16,27 +32,64 @@ class TelegramService:
     def __init__(self, db: AsyncSession):
         self.stats_repo = TelegramStatsRepository(db)
         self.unmapped_repo = UnmappedTelegramUserRepository(db)
+        self.processed_update_repo = TelegramProcessedUpdateRepository(db)
         self.mentee_repo = MenteeRepository(db)
         self.db = db
 
-    async def process_update(self, update: dict[str, Any]) -> None:
+    async def process_webhook_update(self, update: dict[str, Any]) -> bool:
         """
-        Process a Telegram webhook update.
-        Silently counts messages from group chats.
+        Process a webhook update once per update_id.
+        Returns False if it was a redelivery and was dropped.
+
+        The update_id is claimed, and the message counted, in the same
+        transaction that processes the update, so a rolled-back request
+        leaves it free for Telegram's retry and a committed one is counted
+        exactly once.
+        """
+        update_id = update.get("update_id")
+        bot_token = get_settings().telegram_bot_token
+        if not isinstance(update_id, int) or not bot_token:
+            await self._count(await self.process_update(update))
+            return True
+
+        if telegram_updates.seen(update_id):
+            return False
+
+        bot_id = bot_id_from_token(bot_token)
+        if not await self.processed_update_repo.claim(bot_id, update_id):
+            telegram_updates.record(update_id)
+            return False
+
+        await self._count(await self.process_update(update))
+        run_after_commit(self.db, lambda: telegram_updates.record(update_id))
+        return True
+
+    async def _count(self, activity: ActivityKey | None) -> None:
+        """Add a counted message to the activity tables in the request transaction."""
+        if activity is not None:
+            await add_activity_counts(self.db, Counter({activity: 1}))
+
+    async def process_update(self, update: dict[str, Any]) -> ActivityKey | None:
+        """
+        Process a Telegram update from a group chat.
+
+        Unmapped senders are tracked here. For a qualifying message from a
+        mapped mentee, returns the (mentee_id, program_id, day) it counts
+        towards; the caller decides when the count is written.
         """
         message = update.get("message")
         if not message or not message.get("from"):
-            return
+            return None
 
         # Only process group/supergroup messages
         chat = message.get("chat", {})
         chat_type = chat.get("type")
         if chat_type not in ("group", "supergroup"):
-            return
+            return None
 
         # Check if message qualifies for counting
         if not self._is_qualifying_message(message):
-            return
+            return None
 
         tg_user_id = message["from"]["id"]
         chat_id = chat.get("id")
@@ -54,19 +107,23 @@ class TelegramService:
                 await self.db.flush()
 
         if mentee:
-            # User is mapped - increment their message count
+            # User is mapped - count the message towards the day it was sent
             # Default to program_id = 1 (can be made configurable)
             program_id = 1
-            await self.stats_repo.increment_count(mentee.id, program_id)
-        else:
-            # User is not mapped - track in unmapped users table
-            telegram_name = self._extract_name(message["from"])
-            await self.unmapped_repo.upsert(
-                telegram_user_id=tg_user_id,
-                telegram_name=telegram_name,
-                telegram_username=telegram_username,
-                chat_id=chat_id,
-            )
+            day = datetime.fromtimestamp(
+                message.get("date") or datetime.now(timezone.utc).timestamp(), timezone.utc
+            ).date()
+            return mentee.id, program_id, day
+
+        # User is not mapped - track in unmapped users table
+        telegram_name = self._extract_name(message["from"])
+        await self.unmapped_repo.upsert(
+            telegram_user_id=tg_user_id,
+            telegram_name=telegram_name,
+            telegram_username=telegram_username,
+            chat_id=chat_id,
+        )
+        return None
 
     def _is_qualifying_message(self, message: dict[str, Any]) -> bool:
         """Check if a message should be counted based on filtering rules."""
@@ -111,6 +168,7 @@ class TelegramService:
         mentee = await self.mentee_repo.find_by_id(mentee_profile_id)
         if mentee is None:
             raise NotFoundError("MenteeProfile", mentee_profile_id)
+        await self._check_not_linked_elsewhere([(telegram_user_id, mentee_profile_id)])
 
         # Get unmapped user if exists
         unmapped = await self.unmapped_repo.find_by_telegram_id(telegram_user_id)
@@ -122,24 +180,67 @@ class TelegramService:
         if unmapped:
             program_id = 1  # Default program
 
-            stat = await self.stats_repo.find_by_mentee_and_program(
-                mentee.id, program_id
+            await self.stats_repo.increment_count(
+                mentee.id, program_id, unmapped.message_count
             )
-            if stat:
-                stat.message_count += unmapped.message_count
-                await self.db.flush()
-            else:
-                await self.stats_repo.create(
-                    mentee_id=mentee.id,
-                    program_id=program_id,
-                    message_count=unmapped.message_count,
-                )
 
             # Remove from unmapped table
             await self.unmapped_repo.delete(unmapped)
 
         await self.db.flush()
 
+    async def suggest_matches(self) -> list[MatchCandidate]:
+        """Propose mentees for unmapped Telegram users, best matches first."""
+        unmapped = await self.unmapped_repo.find_match_rows()
+        if not unmapped:
+            return []
+        mentees = await self.mentee_repo.find_unlinked_telegram_rows()
+        return propose_matches(unmapped, mentees)
+
+    async def map_telegram_users(self, links: list[tuple[int, int]]) -> int:
+        """
+        Map many (telegram_user_id, mentee_profile_id) pairs at once.
+        Uses a fixed number of statements regardless of the batch size.
+        Returns the number of mappings applied.
+        """
+        if len(links) > TELEGRAM_BULK_MAP_MAX_ROWS:
+            raise TooManyRowsError(len(links), TELEGRAM_BULK_MAP_MAX_ROWS)
+        if not links:
+            return 0
+
+        telegram_user_ids = [telegram_user_id for telegram_user_id, _ in links]
+        profile_ids = [profile_id for _, profile_id in links]
+        if len(set(telegram_user_ids)) < len(links):
+            raise InvalidTelegramMappingError("Each Telegram user can only be mapped once")
+        if len(set(profile_ids)) < len(links):
+            raise InvalidTelegramMappingError("Each mentee can only be mapped once")
+
+        existing = await self.mentee_repo.find_existing_ids(profile_ids)
+        missing = [profile_id for profile_id in profile_ids if profile_id not in existing]
+        if missing:
+            raise NotFoundError("MenteeProfile", missing[0])
+        await self._check_not_linked_elsewhere(links)
+
+        program_id = 1  # Default program
+        await self.mentee_repo.set_telegram_user_ids(
+            {profile_id: telegram_user_id for telegram_user_id, profile_id in links}
+        )
+        # Counts move over before the unmapped rows are removed
+        await self.stats_repo.transfer_unmapped_counts(dict(links), program_id)
+        await self.unmapped_repo.delete_by_telegram_ids(telegram_user_ids)
+        return len(links)
+
+    async def _check_not_linked_elsewhere(self, links: list[tuple[int, int]]) -> None:
+        """Reject Telegram users that are already linked to a different mentee."""
+        linked = await self.mentee_repo.find_telegram_links(
+            [telegram_user_id for telegram_user_id, _ in links]
+        )
+        for telegram_user_id, profile_id in links:
+            if linked.get(telegram_user_id, profile_id) != profile_id:
+                raise InvalidTelegramMappingError(
+                    f"Telegram user {telegram_user_id} is already mapped to another mentee"
+                )
+
     async def remove_mapping(self, mentee_id: int) -> None:
         """Remove Telegram mapping from a mentee."""
         mentee = await self.mentee_repo.find_by_id(mentee_id)
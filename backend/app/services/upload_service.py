@@ -1,17 +1,47 @@
 """File upload service for handling profile pictures and other uploads."""
+import asyncio
+import hashlib
+import mimetypes
 import os
+import re
+import shutil
+import tempfile
 import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
+from typing import Awaitable, Callable
 
 from fastapi import UploadFile
+from PIL import Image, ImageOps
 
 from app.config import get_settings
+from app.core.media import WEBP_SOURCE_EXTENSIONS, webp_variant_path
+from app.services.storage_service import StorageError, get_storage
 
 settings = get_settings()
 
 ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
 
+PROFILES_KEY_PREFIX = "profiles/"
+INCOMING_KEY_PREFIX = "incoming/"
+UPLOAD_CHUNK_SIZE = 64 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+THUMBNAIL_SIZE = (128, 128)
+THUMBNAIL_SUFFIX = "_thumb"
+WEBP_QUALITY = 80
+
+# Content-addressed names: sha256 hex digest plus the original extension
+CONTENT_ADDRESSED_NAME = re.compile(r"^(?P<digest>[0-9a-f]{64})(?P<ext>\.[a-z]+)$")
+# Any stored file: an original or a thumbnail, in its own format or WebP
+STORED_NAME = re.compile(r"^(?P<digest>[0-9a-f]{64})(?P<thumb>_thumb)?(?P<ext>\.[a-z]+)$")
+
+# Pillow releases the GIL while decoding and resizing, so a small thread pool
+# keeps thumbnail work off the event loop without forking worker processes.
+_thumbnail_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="thumbnails")
+
 
 class UploadError(Exception):
     """Raised when file upload fails."""
@@ -21,13 +51,181 @@ class UploadError(Exception):
         super().__init__(message)
 
 
+class InvalidImageError(UploadError):
+    """Raised when an uploaded file is not a valid image."""
+
+
+def _max_upload_size() -> int:
+    return settings.max_upload_size_mb * 1024 * 1024
+
+
+def _too_large() -> UploadError:
+    return UploadError(f"File too large. Maximum size: {settings.max_upload_size_mb}MB")
+
+
+def _validate_image(content_type: str | None, filename: str | None) -> str:
+    """Check the declared type and file extension; returns the extension."""
+    if content_type not in ALLOWED_IMAGE_TYPES:
+        raise UploadError(
+            f"Invalid file type. Allowed types: {', '.join(ALLOWED_IMAGE_TYPES)}"
+        )
+
+    ext = Path(filename or "image.jpg").suffix.lower()
+    if ext not in ALLOWED_EXTENSIONS:
+        raise UploadError(
+            f"Invalid file extension. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
+        )
+    return ext
+
+
+def _content_type(key: str) -> str:
+    return mimetypes.guess_type(key)[0] or "application/octet-stream"
+
+
+def _save_webp(image: Image.Image, destination: Path) -> None:
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+    image.save(destination, format="WEBP", quality=WEBP_QUALITY, method=4)
+
+
+def _make_derivatives(
+    source: Path,
+    thumbnail: Path,
+    webp: Path | None = None,
+    webp_thumbnail: Path | None = None,
+) -> None:
+    """
+    Write a resized copy of an image, and optionally WebP variants of the
+    original and the thumbnail. Raises if the file is not a valid image.
+    """
+    with Image.open(source) as image:
+        image_format = image.format
+        image = ImageOps.exif_transpose(image)
+        if webp:
+            _save_webp(image, webp)
+        image.thumbnail(THUMBNAIL_SIZE)
+        if webp_thumbnail:
+            _save_webp(image, webp_thumbnail)
+        if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.save(thumbnail, format=image_format)
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _discard(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError:
+        pass  # Ignore errors deleting temporary files
+
+
+def _profile_key(url_path: str | None) -> str | None:
+    key = get_storage().key_for_url(url_path) if url_path else None
+    if key is None or not key.startswith(PROFILES_KEY_PREFIX):
+        return None
+    return key
+
+
+def _thumbnail_key(key: str) -> str | None:
+    match = CONTENT_ADDRESSED_NAME.match(key[len(PROFILES_KEY_PREFIX):])
+    if match is None:
+        return None
+    return f"{PROFILES_KEY_PREFIX}{match['digest']}{THUMBNAIL_SUFFIX}{match['ext']}"
+
+
+def _is_original(key: str) -> bool:
+    """Whether a profiles/ key is an uploaded image rather than a thumbnail."""
+    match = STORED_NAME.match(key[len(PROFILES_KEY_PREFIX):])
+    return match is not None and match["thumb"] is None
+
+
+def _derivative_keys(key: str) -> list[str]:
+    """Keys of the thumbnail and, for JPEG/PNG, the WebP variants of a picture."""
+    thumb_key = _thumbnail_key(key)
+    if thumb_key is None:
+        return []
+    if Path(key).suffix not in WEBP_SOURCE_EXTENSIONS:
+        return [thumb_key]
+    return [thumb_key, webp_variant_path(key), webp_variant_path(thumb_key)]
+
+
+def thumbnail_url(url_path: str | None) -> str | None:
+    """
+    Get the thumbnail URL for a profile picture URL.
+    Pictures uploaded before thumbnails existed fall back to the original.
+    """
+    key = _profile_key(url_path)
+    thumb_key = _thumbnail_key(key) if key else None
+    if thumb_key is None:
+        return url_path
+    return get_storage().url(thumb_key)
+
+
+async def _store_profile_picture(source: Path, digest: str, ext: str) -> str:
+    """
+    Store a local file under its content-addressed key together with its
+    derivatives, and return its URL. Consumes the source file.
+    """
+    storage = get_storage()
+    key = f"{PROFILES_KEY_PREFIX}{digest}{ext}"
+
+    work_dir = None
+    try:
+        # Identical image already stored - nothing more to write. Refreshing
+        # its modified time keeps the sweep off it until the profile commits.
+        if await storage.exists(key):
+            await storage.touch(key, _content_type(key))
+            return storage.url(key)
+
+        # Generate the thumbnail and WebP variants first; this also rejects
+        # files that aren't images
+        work_dir = Path(await asyncio.to_thread(tempfile.mkdtemp, prefix="upload_"))
+        derivative_keys = _derivative_keys(key)
+        derivative_paths = [work_dir / os.path.basename(k) for k in derivative_keys]
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(
+                _thumbnail_executor, _make_derivatives, source, *derivative_paths
+            )
+        except Exception:
+            raise InvalidImageError("File is not a valid image")
+
+        # The original is written last, so its existence implies the
+        # derivatives exist too
+        for derivative_key, path in zip(derivative_keys, derivative_paths):
+            await storage.put_file(derivative_key, path, _content_type(derivative_key))
+        await storage.put_file(key, source, _content_type(key))
+    except StorageError as e:
+        raise UploadError(f"Failed to store file: {e.message}")
+    finally:
+        await asyncio.to_thread(_discard, source)
+        if work_dir is not None:
+            await asyncio.to_thread(shutil.rmtree, work_dir, True)
+
+    return storage.url(key)
+
+
 async def save_profile_picture(file: UploadFile, user_id: int) -> str:
     """
     Save an uploaded profile picture and return its URL path.
 
+    The upload is streamed to a temporary file in chunks and rejected as
+    soon as it exceeds the size limit. Files are stored under their SHA-256
+    digest, so identical images are stored once and the URL never changes
+    content. A thumbnail is stored next to each original, and JPEG/PNG
+    images also get WebP variants that MediaFiles serves when the client
+    accepts them.
+
     Args:
         file: The uploaded file
-        user_id: The user ID (used for organizing files)
+        user_id: The user ID of the uploader
 
     Returns:
         The URL path to access the uploaded file
@@ -35,58 +233,182 @@ async def save_profile_picture(file: UploadFile, user_id: int) -> str:
     Raises:
         UploadError: If the file is invalid or upload fails
     """
-    # Validate file type
-    if file.content_type not in ALLOWED_IMAGE_TYPES:
-        raise UploadError(
-            f"Invalid file type. Allowed types: {', '.join(ALLOWED_IMAGE_TYPES)}"
-        )
+    ext = _validate_image(file.content_type, file.filename)
 
-    # Validate file extension
-    original_filename = file.filename or "image.jpg"
-    ext = Path(original_filename).suffix.lower()
-    if ext not in ALLOWED_EXTENSIONS:
-        raise UploadError(
-            f"Invalid file extension. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
-        )
+    # Check file size (in bytes) - up front when the client declared it
+    max_size = _max_upload_size()
+    if file.size is not None and file.size > max_size:
+        raise _too_large()
 
-    # Read file content
-    content = await file.read()
+    fd, tmp_name = await asyncio.to_thread(tempfile.mkstemp, prefix="upload_")
+    tmp_path = Path(tmp_name)
 
-    # Check file size (in bytes)
-    max_size = settings.max_upload_size_mb * 1024 * 1024
-    if len(content) > max_size:
-        raise UploadError(
-            f"File too large. Maximum size: {settings.max_upload_size_mb}MB"
+    # Stream to a temporary file while hashing
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    raise _too_large()
+                digest.update(chunk)
+                await asyncio.to_thread(tmp_file.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(_discard, tmp_path)
+        raise
+
+    return await _store_profile_picture(tmp_path, digest.hexdigest(), ext)
+
+
+async def create_profile_picture_upload(
+    user_id: int, content_type: str, filename: str
+) -> dict:
+    """
+    Create a presigned direct-to-storage upload for a profile picture.
+
+    The client POSTs the file to the returned URL with the returned form
+    fields, then confirms the upload with the returned key.
+
+    Raises:
+        UploadError: If the file is invalid or the storage backend does not
+            support direct uploads
+    """
+    ext = _validate_image(content_type, filename)
+    key = f"{INCOMING_KEY_PREFIX}{user_id}/{uuid.uuid4().hex}{ext}"
+    try:
+        presigned = await get_storage().presigned_upload(
+            key, content_type, _max_upload_size()
         )
+    except StorageError as e:
+        raise UploadError(e.message)
+    return {"url": presigned["url"], "fields": presigned["fields"], "key": key}
 
-    # Generate unique filename
-    unique_id = uuid.uuid4().hex[:12]
-    filename = f"profile_{user_id}_{unique_id}{ext}"
 
-    # Save file
-    profiles_dir = Path(settings.upload_dir) / "profiles"
-    profiles_dir.mkdir(parents=True, exist_ok=True)
+def _incoming_extension(user_id: int, key: str) -> str:
+    """Extension of a user's incoming upload key; raises UploadError if invalid."""
+    prefix = f"{INCOMING_KEY_PREFIX}{user_id}/"
+    name = key[len(prefix):] if key.startswith(prefix) else ""
+    ext = Path(name).suffix.lower()
+    if not name or "/" in name or name.startswith(".") or ext not in ALLOWED_EXTENSIONS:
+        raise UploadError("Invalid upload key")
+    return ext
 
-    file_path = profiles_dir / filename
 
-    # Delete old profile picture if exists
-    for old_file in profiles_dir.glob(f"profile_{user_id}_*"):
-        try:
-            old_file.unlink()
-        except OSError:
-            pass  # Ignore errors deleting old files
+async def confirm_profile_picture_upload(user_id: int, key: str) -> None:
+    """
+    Check a direct upload before it is queued for processing. Only the key
+    and the object's size are checked here, so the image bytes never pass
+    through the API process; process_profile_picture_upload does the rest.
 
-    # Write new file
-    with open(file_path, "wb") as f:
-        f.write(content)
+    Raises:
+        UploadError: If the key doesn't belong to the user, nothing was
+            uploaded, or the file is too large
+    """
+    _incoming_extension(user_id, key)
+    storage = get_storage()
+    size = await storage.size(key)
+    if size is None:
+        raise UploadError("Upload not found")
+    if size > _max_upload_size():
+        await storage.delete(key)
+        raise _too_large()
 
-    # Return URL path (relative to static mount)
-    return f"/static/profiles/{filename}"
 
+async def process_profile_picture_upload(user_id: int, key: str) -> str | None:
+    """
+    Store a confirmed direct upload under its content-addressed key with
+    its derivatives. Returns the URL path, or None if the incoming object
+    is already gone. The caller deletes the incoming object once the
+    profile points at the stored copy, so a failed attempt can be retried.
 
-def delete_profile_picture(url_path: str) -> bool:
+    Raises:
+        InvalidImageError: If the file is not a valid image; the incoming
+            object is deleted
+        UploadError: If storing the file fails
     """
-    Delete a profile picture by its URL path.
+    ext = _incoming_extension(user_id, key)
+    storage = get_storage()
+    if not await storage.exists(key):
+        return None
+
+    fd, tmp_name = await asyncio.to_thread(tempfile.mkstemp, prefix="upload_")
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    try:
+        await storage.get_file(key, tmp_path, _max_upload_size())
+        digest = await asyncio.to_thread(_hash_file, tmp_path)
+    except StorageError as e:
+        await asyncio.to_thread(_discard, tmp_path)
+        raise UploadError(e.message)
+
+    try:
+        return await _store_profile_picture(tmp_path, digest, ext)
+    except InvalidImageError:
+        await storage.delete(key)
+        raise
+
+
+async def delete_profile_picture_upload(key: str) -> None:
+    """Delete a direct upload's incoming object once it has been processed."""
+    await get_storage().delete(key)
+
+
+async def delete_unused_profile_pictures(
+    find_in_use: Callable[[list[str]], Awaitable[set[str]]],
+    modified_before: datetime,
+) -> int:
+    """
+    Delete stored profile pictures that no profile references and that were
+    last written before modified_before. Returns how many were deleted.
+
+    Files are grouped by digest, since the same image uploaded as .jpg and
+    .png shares its WebP variants, and a .webp upload can be another
+    original's variant. Each unused original goes with its own thumbnail;
+    files shared by digest go only once every original using them is gone.
+
+    Args:
+        find_in_use: Returns the subset of the given URLs some profile uses
+        modified_before: Files written since then may belong to an upload
+            whose profile change hasn't committed yet, and are kept
+    """
+    storage = get_storage()
+    by_digest: dict[str, dict[str, datetime]] = defaultdict(dict)
+    for key, modified_at in await storage.list_keys(PROFILES_KEY_PREFIX):
+        match = STORED_NAME.match(key[len(PROFILES_KEY_PREFIX):])
+        if match is not None:
+            by_digest[match["digest"]][key] = modified_at
+
+    originals = [key for files in by_digest.values() for key in files if _is_original(key)]
+    in_use = await find_in_use([storage.url(key) for key in originals])
+
+    deleted = 0
+    for files in by_digest.values():
+        kept = {
+            key for key, modified_at in files.items()
+            if _is_original(key)
+            and (storage.url(key) in in_use or modified_at >= modified_before)
+        }
+        needed = kept | {derivative for key in kept for derivative in _derivative_keys(key)}
+        doomed = [
+            key for key, modified_at in files.items()
+            if key not in needed and modified_at < modified_before
+        ]
+        # Originals first, so one is never left behind without its derivatives
+        doomed.sort(key=lambda key: not _is_original(key))
+        for key in doomed:
+            await storage.delete(key)
+        deleted += sum(1 for key in doomed if _is_original(key))
+    return deleted
+
+
+async def delete_profile_picture(url_path: str) -> bool:
+    """
+    Delete a profile picture, its thumbnail and WebP variants by URL path.
+    Variants shared with another original of the same image are kept.
+
+    Content-addressed files may be shared by several profiles, so only the
+    scheduled sweep deletes them, once no profile references them.
 
     Args:
         url_path: The URL path returned from save_profile_picture
@@ -94,17 +416,24 @@ def delete_profile_picture(url_path: str) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    if not url_path or not url_path.startswith("/static/profiles/"):
+    key = _profile_key(url_path)
+    match = STORED_NAME.match(key[len(PROFILES_KEY_PREFIX):]) if key else None
+    if match is None or match["thumb"]:
         return False
 
-    filename = url_path.replace("/static/profiles/", "")
-    file_path = Path(settings.upload_dir) / "profiles" / filename
+    storage = get_storage()
+    if not await storage.exists(key):
+        return False
 
-    try:
-        if file_path.exists():
-            file_path.unlink()
-            return True
-    except OSError:
-        pass
+    siblings = {
+        other for other, _ in await storage.list_keys(f"{PROFILES_KEY_PREFIX}{match['digest']}")
+        if other != key and _is_original(other)
+    }
+    needed = siblings | {derivative for other in siblings for derivative in _derivative_keys(other)}
 
-    return False
+    # Original first, so it is never left behind without its derivatives
+    await storage.delete(key)
+    for derivative_key in _derivative_keys(key):
+        if derivative_key not in needed:
+            await storage.delete(derivative_key)
+    return True
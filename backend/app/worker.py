@@ -0,0 +1,82 @@
+"""Background worker: runs queued jobs and the periodic scheduler.
+
+Run one or more alongside the API with:
+
+    python -m app.worker
+"""
+import asyncio
+import logging
+import signal
+
+from app.config import get_settings
+from app.services.auth_service import send_password_reset_job
+from app.services.email_service import send_bulk_email_job
+from app.services.job_service import JobRunner
+from app.services.mentee_service import process_profile_picture_job
+from app.services.telegram_client import close_telegram_client
+from app.services.telegram_polling_service import setup_telegram_poller
+from app.services.scheduler_service import (
+    setup_scheduler,
+    start_scheduler,
+    stop_scheduler,
+    scheduler_elector,
+    send_session_reminders,
+    finalize_session_attendance,
+)
+
+settings = get_settings()
+
+# Job name -> handler; handlers receive the job payload as keyword arguments
+JOB_HANDLERS = {
+    "send_bulk_email": send_bulk_email_job,
+    "send_password_reset": send_password_reset_job,
+    "send_session_reminders": send_session_reminders,
+    "finalize_session_attendance": finalize_session_attendance,
+    "process_profile_picture": process_profile_picture_job,
+}
+
+# Singleton instance
+job_runner = JobRunner(JOB_HANDLERS, concurrency=settings.worker_concurrency)
+
+
+async def run_worker() -> None:
+    """
+    Run the job runner, and the scheduler and Telegram poller whenever this
+    worker is their elected leader, until stop_worker() is called.
+    """
+    setup_scheduler()
+    start_scheduler()
+    electors = [scheduler_elector]
+    poller_elector = setup_telegram_poller()
+    if poller_elector is not None:
+        electors.append(poller_elector)
+
+    elections = [asyncio.create_task(elector.run()) for elector in electors]
+    try:
+        await job_runner.run()
+    finally:
+        for elector in electors:
+            elector.stop()
+        await asyncio.gather(*elections)
+        stop_scheduler()
+        if poller_elector is not None:
+            await close_telegram_client()
+
+
+def stop_worker() -> None:
+    job_runner.stop()
+
+
+async def _main() -> None:
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_worker)
+    await run_worker()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    asyncio.run(_main())
@@ -0,0 +1,106 @@
+"""Benchmark encoding list responses against the old response_model path.
+
+Builds --rows mentee responses in memory and serves them from a small
+FastAPI app twice: the old way (returned from an endpoint with
+response_model and JSONResponse, so FastAPI re-validates the models and
+goes through jsonable_encoder and json.dumps) and with
+model_list_response. Both bodies must be byte for byte identical. Also
+reports the size gzip brings the body down to at the app's level.
+
+Usage:
+    python scripts/benchmark_list_encoding.py --rows 10000 --repeat 5
+"""
+import argparse
+import asyncio
+import gzip
+import statistics
+import sys
+import time as timer
+from datetime import datetime, timedelta, timezone
+sys.path.insert(0, ".")
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.api.responses import model_list_response
+from app.core.constants import GZIP_COMPRESS_LEVEL
+from app.schemas.mentee import MenteeProfileResponse
+
+TRACKS = ["Backend", "Frontend", "Mobile", "Data", "Design"]
+
+
+def build_rows(rows: int) -> list[MenteeProfileResponse]:
+    created_at = datetime(2026, 1, 5, 9, 0, tzinfo=timezone.utc)
+    return [
+        MenteeProfileResponse(
+            id=i + 1,
+            mentee_id=f"KPDF-{i:05d}",
+            full_name=f"Mentee Ọkafọr {i:05d}",
+            email=f"mentee{i}@kpdf.org",
+            track=TRACKS[i % len(TRACKS)],
+            profile_pic_url=f"/static/profiles/{i:064x}.png" if i % 2 else None,
+            profile_pic_thumb_url=f"/static/profiles/{i:064x}_thumb.png" if i % 2 else None,
+            telegram_user_id=100000000 + i if i % 3 else None,
+            created_at=created_at + timedelta(minutes=i),
+        )
+        for i in range(rows)
+    ]
+
+
+def encoding_app(items: list[MenteeProfileResponse]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/old", response_model=list[MenteeProfileResponse], response_class=JSONResponse)
+    async def old():
+        return items
+
+    @app.get("/new", response_model=list[MenteeProfileResponse])
+    async def new():
+        return model_list_response(MenteeProfileResponse, items)
+
+    return app
+
+
+async def timed(client: AsyncClient, url: str, repeat: int) -> tuple[float, float, bytes]:
+    """Median wall ms and median CPU seconds over `repeat` requests, plus the last body."""
+    walls, cpus = [], []
+    for _ in range(repeat):
+        wall, cpu = timer.perf_counter(), timer.process_time()
+        response = await client.get(url)
+        cpus.append(timer.process_time() - cpu)
+        walls.append((timer.perf_counter() - wall) * 1000)
+    return statistics.median(walls), statistics.median(cpus), response.content
+
+
+def report(label: str, wall_ms: float, cpu_s: float, rows: int) -> None:
+    print(f"  {label:<34} {wall_ms:9.1f} ms wall  {cpu_s * 1e6 / rows:7.2f} us CPU/row")
+
+
+async def benchmark(rows: int, repeat: int) -> None:
+    items = build_rows(rows)
+    transport = ASGITransport(app=encoding_app(items))
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/old")  # Warm up FastAPI's and pydantic's serializers
+        await client.get("/new")
+        old_wall, old_cpu, old = await timed(client, "/old", repeat)
+        new_wall, new_cpu, new = await timed(client, "/new", repeat)
+
+    assert new == old, "Response bodies differ"
+    print(f"Mentee list: {rows} rows, {len(new) / 1e6:.2f} MB, median of {repeat} requests")
+    report("response_model + JSONResponse", old_wall, old_cpu, rows)
+    report("model_list_response", new_wall, new_cpu, rows)
+    compressed = gzip.compress(new, compresslevel=GZIP_COMPRESS_LEVEL)
+    print(f"  gzip level {GZIP_COMPRESS_LEVEL}: {len(new)} -> {len(compressed)} bytes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list response encoding.")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
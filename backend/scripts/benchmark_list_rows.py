@@ -0,0 +1,214 @@
+"""Benchmark the mentee and session list queries against the old ORM path.
+
+Seeds --mentees mentees and --sessions sessions (with --resources resources
+each) inside one transaction, then times building the list responses the old
+way (ORM entities + selectinload + from_model) and the current way (Core
+column rows + from_row). Both must give the same responses. Everything is
+rolled back afterwards.
+
+CPU time is this process's own (driver decoding, ORM and pydantic work),
+which is what the change reduces; wall time also includes Postgres.
+
+Usage:
+    python scripts/benchmark_list_rows.py --mentees 10000 --sessions 1000 --repeat 5
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time as timer
+from datetime import date, time, timedelta
+sys.path.insert(0, ".")
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import selectinload
+
+from app.core.constants import ResourceType, UserRole
+from app.database import AsyncSessionLocal, engine
+from app.models.mentee import MenteeProfile
+from app.models.program import Program
+from app.models.session import Session, SessionResource
+from app.models.user import User
+from app.repositories.mentee_repo import MenteeRepository
+from app.repositories.session_repo import SessionRepository
+from app.schemas.mentee import MenteeProfileResponse
+from app.schemas.session import SessionResponse
+
+TRACKS = ["Backend", "Frontend", "Mobile", "Data", "Design"]
+RESOURCE_TYPES = list(ResourceType)
+
+
+async def seed(db, mentees: int, sessions: int, resources: int) -> int:
+    """Add mentees with users, and a program with sessions and resources."""
+    user_ids = (
+        await db.scalars(
+            insert(User).returning(User.id),
+            [
+                {
+                    "email": f"list-bench-{i}@kpdf.org",
+                    "password_hash": "x",
+                    "role": UserRole.MENTEE,
+                    "must_reset_password": False,
+                }
+                for i in range(mentees)
+            ],
+        )
+    ).all()
+    await db.execute(
+        insert(MenteeProfile),
+        [
+            {
+                "user_id": user_id,
+                "mentee_id": f"LIST-{i:05d}",
+                "full_name": f"Mentee {(i * 7919) % mentees:05d}",
+                "track": TRACKS[i % len(TRACKS)],
+                "telegram_username": f"listbench{i}",
+            }
+            for i, user_id in enumerate(user_ids)
+        ],
+    )
+
+    program = Program(
+        name="List benchmark",
+        start_date=date(2026, 1, 1),
+        end_date=date(2026, 12, 31),
+        total_core_sessions=10,
+        telegram_target_messages=50,
+    )
+    db.add(program)
+    await db.flush()
+    session_ids = (
+        await db.scalars(
+            insert(Session).returning(Session.id),
+            [
+                {
+                    "program_id": program.id,
+                    "title": f"Session {i}",
+                    "description": "Weekly session " * 10,
+                    "date": date(2026, 1, 1) + timedelta(days=i // 4),
+                    "start_time": time(9 + 2 * (i % 4), 0),
+                    "end_time": time(10 + 2 * (i % 4), 0),
+                    "google_meet_link": "https://meet.google.com/abc-defg-hij",
+                    "is_core_session": i % 2 == 0,
+                }
+                for i in range(sessions)
+            ],
+        )
+    ).all()
+    if resources:
+        await db.execute(
+            insert(SessionResource),
+            [
+                {
+                    "session_id": session_id,
+                    "type": RESOURCE_TYPES[j % len(RESOURCE_TYPES)],
+                    "title": f"Resource {j}",
+                    "url": f"https://example.org/{session_id}/{j}",
+                    "speaker_name": "Grace Hopper",
+                    "speaker_bio": "Computer scientist " * 5,
+                }
+                for session_id in session_ids
+                for j in range(resources)
+            ],
+        )
+    return program.id
+
+
+async def old_mentee_list(db) -> list[MenteeProfileResponse]:
+    """The mentee list as it was built before the Core column query."""
+    result = await db.execute(
+        select(MenteeProfile)
+        .options(selectinload(MenteeProfile.user))
+        .order_by(MenteeProfile.full_name, MenteeProfile.id)
+    )
+    return [MenteeProfileResponse.from_model(m) for m in result.scalars().all()]
+
+
+async def new_mentee_list(db) -> list[MenteeProfileResponse]:
+    rows = await MenteeRepository(db).find_list_rows()
+    return [MenteeProfileResponse.from_row(row) for row in rows]
+
+
+async def old_session_list(db, program_id: int) -> list[SessionResponse]:
+    """The session list as it was built before the Core column queries."""
+    result = await db.execute(
+        select(Session)
+        .options(selectinload(Session.resources))
+        .where(Session.program_id == program_id)
+        .order_by(Session.date, Session.start_time)
+    )
+    return [SessionResponse.from_model(s) for s in result.scalars().all()]
+
+
+async def new_session_list(db, program_id: int) -> list[SessionResponse]:
+    sessions, resources = await SessionRepository(db).find_list_rows(program_id)
+    return [SessionResponse.from_row(s, resources.get(s.id, [])) for s in sessions]
+
+
+def normalized(responses: list) -> list[dict]:
+    """Dumped responses, with resources in id order; the old relationship had none."""
+    dumped = [r.model_dump() for r in responses]
+    for item in dumped:
+        if "resources" in item:
+            item["resources"].sort(key=lambda r: r["id"])
+    return dumped
+
+
+async def timed(db, repeat: int, fn) -> tuple[float, float, list]:
+    """Median wall ms and median CPU seconds over `repeat` runs, plus the last result."""
+    walls, cpus = [], []
+    for _ in range(repeat):
+        db.expunge_all()  # Every run loads from the database, like a fresh request
+        wall, cpu = timer.perf_counter(), timer.process_time()
+        result = await fn()
+        cpus.append(timer.process_time() - cpu)
+        walls.append((timer.perf_counter() - wall) * 1000)
+    return statistics.median(walls), statistics.median(cpus), result
+
+
+def report(label: str, wall_ms: float, cpu_s: float, rows: int) -> None:
+    print(f"  {label:<34} {wall_ms:9.1f} ms wall  {cpu_s * 1e6 / rows:7.1f} us CPU/row")
+
+
+async def benchmark(mentees: int, sessions: int, resources: int, repeat: int) -> None:
+    engine.echo = False  # Development echo would dominate the timings
+    async with AsyncSessionLocal() as db:
+        try:
+            program_id = await seed(db, mentees, sessions, resources)
+
+            old_wall, old_cpu, old = await timed(db, repeat, lambda: old_mentee_list(db))
+            new_wall, new_cpu, new = await timed(db, repeat, lambda: new_mentee_list(db))
+            assert normalized(new) == normalized(old), "Mentee lists disagree"
+            print(f"Mentee list: {len(new)} mentees, median of {repeat} runs")
+            report("ORM + selectinload + from_model", old_wall, old_cpu, len(old))
+            report("Core rows + from_row", new_wall, new_cpu, len(new))
+
+            old_wall, old_cpu, old = await timed(
+                db, repeat, lambda: old_session_list(db, program_id)
+            )
+            new_wall, new_cpu, new = await timed(
+                db, repeat, lambda: new_session_list(db, program_id)
+            )
+            assert normalized(new) == normalized(old), "Session lists disagree"
+            print(
+                f"Session list: {len(new)} sessions with {resources} resources each, "
+                f"median of {repeat} runs"
+            )
+            report("ORM + selectinload + from_model", old_wall, old_cpu, len(old))
+            report("Core rows + from_row", new_wall, new_cpu, len(new))
+        finally:
+            await db.rollback()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the mentee and session lists.")
+    parser.add_argument("--mentees", type=int, default=10000)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--resources", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.mentees, args.sessions, args.resources, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Benchmark the session roster queries against the old load-everything approach.
+
+Seeds a session with --mentees mentees inside one transaction, times
+find_session_roster and count_roster_statuses next to the previous Python
+merge-and-sort, checks both give the same roster, then rolls everything back.
+
+Usage:
+    python scripts/benchmark_roster.py --mentees 10000 --repeat 5
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time as timer
+from datetime import date, datetime, time, timezone
+sys.path.insert(0, ".")
+
+from sqlalchemy import insert
+
+from app.core.constants import AttendanceStatus, UserRole
+from app.database import AsyncSessionLocal
+from app.models.attendance import Attendance
+from app.models.mentee import MenteeProfile
+from app.models.program import Program
+from app.models.session import Session
+from app.models.user import User
+from app.repositories.attendance_repo import AttendanceRepository
+from app.repositories.mentee_repo import MenteeRepository
+
+TRACKS = ["Backend", "Frontend", "Mobile", "Data", "Design"]
+STATUS_ORDER = {
+    AttendanceStatus.PRESENT: 0,
+    AttendanceStatus.PARTIAL: 1,
+    AttendanceStatus.ABSENT: 2,
+}
+
+
+async def seed(db, mentees: int) -> int:
+    """Add a session and mentees; two thirds of them have an attendance record."""
+    program = Program(
+        name="Roster benchmark",
+        start_date=date(2026, 1, 1),
+        end_date=date(2026, 12, 31),
+        total_core_sessions=10,
+        telegram_target_messages=50,
+    )
+    db.add(program)
+    await db.flush()
+    session = Session(
+        program_id=program.id,
+        title="Roster benchmark",
+        date=date(2026, 6, 1),
+        start_time=time(10, 0),
+        end_time=time(12, 0),
+        is_core_session=True,
+    )
+    db.add(session)
+    await db.flush()
+
+    user_ids = (
+        await db.scalars(
+            insert(User).returning(User.id),
+            [
+                {
+                    "email": f"roster-bench-{i}@kpdf.org",
+                    "password_hash": "x",
+                    "role": UserRole.MENTEE,
+                    "must_reset_password": False,
+                }
+                for i in range(mentees)
+            ],
+        )
+    ).all()
+    profile_ids = (
+        await db.scalars(
+            insert(MenteeProfile).returning(MenteeProfile.id),
+            [
+                {
+                    "user_id": user_id,
+                    "mentee_id": f"BENCH-{i:05d}",
+                    "full_name": f"Mentee {(i * 7919) % mentees:05d}",
+                    "track": TRACKS[i % len(TRACKS)],
+                    "telegram_username": f"bench{i}",
+                }
+                for i, user_id in enumerate(user_ids)
+            ],
+        )
+    ).all()
+
+    now = datetime.now(timezone.utc)
+    statuses = [AttendanceStatus.PRESENT, AttendanceStatus.PARTIAL, None]
+    await db.execute(
+        insert(Attendance),
+        [
+            {
+                "session_id": session.id,
+                "mentee_id": profile_id,
+                "status": status,
+                "joined_at": now,
+                "code_entered_at": now if status == AttendanceStatus.PRESENT else None,
+            }
+            for i, profile_id in enumerate(profile_ids)
+            if (status := statuses[i % 3]) is not None
+        ],
+    )
+    return session.id
+
+
+async def old_roster(db, session_id: int) -> list[dict]:
+    """The roster as get_session_attendance built it before the LEFT JOIN query."""
+    attendances = await AttendanceRepository(db).find_by_session_with_mentees(session_id)
+    attendance_by_mentee = {a.mentee_id: a for a in attendances}
+    result = []
+    for mentee in await MenteeRepository(db).find_all():
+        attendance = attendance_by_mentee.get(mentee.id)
+        result.append({
+            "attendance_id": attendance.id if attendance else None,
+            "mentee_profile_id": mentee.id,
+            "mentee_id": mentee.mentee_id,
+            "full_name": mentee.full_name,
+            "track": mentee.track,
+            "status": attendance.status if attendance else AttendanceStatus.ABSENT,
+            "joined_at": attendance.joined_at if attendance else None,
+            "code_entered_at": attendance.code_entered_at if attendance else None,
+        })
+    result.sort(
+        key=lambda x: (STATUS_ORDER.get(x["status"], 3), x["full_name"], x["mentee_profile_id"])
+    )
+    return result
+
+
+async def timed(db, repeat: int, fn) -> tuple[float, object]:
+    """Median wall time in milliseconds over `repeat` runs, plus the last result."""
+    durations = []
+    for _ in range(repeat):
+        db.expunge_all()  # Every run loads from the database, like a fresh request
+        start = timer.perf_counter()
+        result = await fn()
+        durations.append((timer.perf_counter() - start) * 1000)
+    return statistics.median(durations), result
+
+
+async def benchmark(mentees: int, repeat: int) -> None:
+    async with AsyncSessionLocal() as db:
+        try:
+            session_id = await seed(db, mentees)
+            repo = AttendanceRepository(db)
+
+            old_ms, old = await timed(db, repeat, lambda: old_roster(db, session_id))
+            new_ms, new = await timed(db, repeat, lambda: repo.find_session_roster(session_id))
+            page_ms, _ = await timed(
+                db, repeat, lambda: repo.find_session_roster(session_id, limit=50)
+            )
+            counts_ms, counts = await timed(
+                db, repeat, lambda: repo.count_roster_statuses(session_id)
+            )
+            track_ms, _ = await timed(
+                db, repeat, lambda: repo.count_roster_statuses(session_id, track="Backend")
+            )
+
+            assert new == old, "The roster query and the old Python merge disagree"
+            assert sum(counts.values()) == len(new)
+
+            print(f"{mentees} mentees, median of {repeat} runs")
+            print(f"  old load + Python sort          {old_ms:9.1f} ms")
+            print(f"  find_session_roster             {new_ms:9.1f} ms")
+            print(f"  find_session_roster (limit 50)  {page_ms:9.1f} ms")
+            print(f"  count_roster_statuses           {counts_ms:9.1f} ms")
+            print(f"  count_roster_statuses (track)   {track_ms:9.1f} ms")
+        finally:
+            await db.rollback()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the session roster queries.")
+    parser.add_argument("--mentees", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.mentees, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
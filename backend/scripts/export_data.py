@@ -0,0 +1,51 @@
+"""Export program data as CSV or Parquet for reporting.
+
+Usage:
+    python scripts/export_data.py attendance --program-id 1 --format parquet -o attendance.parquet
+    python scripts/export_data.py mentees > mentees.csv
+"""
+import argparse
+import asyncio
+import sys
+sys.path.insert(0, ".")
+
+from app.database import AsyncSessionLocal, engine
+from app.services.export_service import (
+    export_dataset,
+    ExportError,
+    EXPORT_DATASETS,
+    EXPORT_FORMATS,
+)
+
+
+async def export(dataset: str, program_id: int, export_format: str, output: str | None):
+    # SQL echo (on in development) logs to stdout and would corrupt the export
+    engine.echo = False
+    async with AsyncSessionLocal() as db:
+        chunks = export_dataset(db, dataset, program_id, export_format)
+        out = open(output, "wb") if output else sys.stdout.buffer
+        try:
+            async for chunk in chunks:
+                out.write(chunk)
+        finally:
+            if output:
+                out.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export program data for reporting.")
+    parser.add_argument("dataset", choices=sorted(EXPORT_DATASETS))
+    parser.add_argument("--program-id", type=int, default=1)
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="csv")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(export(args.dataset, args.program_id, args.format, args.output))
+    except ExportError as e:
+        print(f"Export failed: {e.message}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,9 @@ from app.main import app
 from app.database import Base
 from app.api.deps import get_db
 from app.config import get_settings
+from app.services import telegram_client
+from app.services.telegram_client import TelegramClient
+from tests.fake_telegram import FAKE_BOT_TOKEN, FakeBotAPI
 
 settings = get_settings()
 
@@ -62,3 +65,14 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield ac
 
     app.dependency_overrides.clear()
+
+
+@pytest_asyncio.fixture(scope="function")
+async def telegram_api(monkeypatch) -> AsyncGenerator[FakeBotAPI, None]:
+    """Point the shared Telegram client at a fake Bot API."""
+    api = FakeBotAPI()
+    client = TelegramClient(FAKE_BOT_TOKEN, transport=api.transport)
+    monkeypatch.setattr(settings, "telegram_bot_token", FAKE_BOT_TOKEN)
+    monkeypatch.setattr(telegram_client, "_client", client)
+    yield api
+    await client.close()
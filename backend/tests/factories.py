@@ -0,0 +1,102 @@
+"""Helpers for creating rows, auth headers and Telegram updates in tests."""
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.constants import UserRole
+from app.core.security import create_access_token, hash_password
+from app.models.mentee import MenteeProfile
+from app.models.program import Program
+from app.models.session import Session
+from app.models.user import User
+
+TEST_PASSWORD = "Password123!"
+# bcrypt is slow; hash once for every test user
+_PASSWORD_HASH = hash_password(TEST_PASSWORD)
+
+
+def auth_headers(user: User) -> dict[str, str]:
+    token = create_access_token({"sub": str(user.id), "role": user.role.value})
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def create_coordinator(db: AsyncSession, email: str = "coordinator@kpdf.org") -> User:
+    user = User(
+        email=email,
+        password_hash=_PASSWORD_HASH,
+        role=UserRole.COORDINATOR,
+        must_reset_password=False,
+    )
+    db.add(user)
+    await db.flush()
+    return user
+
+
+async def create_mentee(
+    db: AsyncSession,
+    mentee_id: str = "KPDF-001",
+    full_name: str = "Ada Lovelace",
+    track: str = "Backend",
+) -> MenteeProfile:
+    user = User(
+        email=f"{mentee_id.lower()}@kpdf.org",
+        password_hash=_PASSWORD_HASH,
+        role=UserRole.MENTEE,
+        must_reset_password=False,
+    )
+    db.add(user)
+    await db.flush()
+    profile = MenteeProfile(
+        user_id=user.id,
+        mentee_id=mentee_id,
+        full_name=full_name,
+        track=track,
+        telegram_username=mentee_id.lower().replace("-", ""),
+    )
+    profile.user = user
+    db.add(profile)
+    await db.flush()
+    return profile
+
+
+async def create_program(db: AsyncSession, total_core_sessions: int = 4) -> Program:
+    program = Program(
+        name="Cohort 1",
+        start_date=date.today() - timedelta(days=30),
+        end_date=date.today() + timedelta(days=60),
+        total_core_sessions=total_core_sessions,
+        telegram_target_messages=50,
+    )
+    db.add(program)
+    await db.flush()
+    return program
+
+
+async def create_session(
+    db: AsyncSession, program: Program, day: date | None = None, title: str = "Intro"
+) -> Session:
+    session = Session(
+        program_id=program.id,
+        title=title,
+        date=day or date.today(),
+        start_time=time(10, 0),
+        end_time=time(12, 0),
+        is_core_session=True,
+    )
+    db.add(session)
+    await db.flush()
+    return session
+
+
+def telegram_group_message(update_id: int, mentee_id: str = "KPDF-001") -> dict:
+    """A qualifying group message from the Telegram user create_mentee links by username."""
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(datetime.now().timestamp()),
+            "chat": {"id": -100, "type": "supergroup"},
+            "from": {"id": 42, "username": mentee_id.lower().replace("-", "")},
+            "text": "Hello everyone",
+        },
+    }
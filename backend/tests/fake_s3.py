@@ -0,0 +1,263 @@
+"""An in-process stand-in for an S3-compatible bucket, like a local MinIO."""
+import base64
+import email.policy
+import hashlib
+import hmac
+import io
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email import message_from_bytes
+from email.utils import format_datetime
+from urllib.parse import parse_qs, unquote, urlsplit
+from xml.sax.saxutils import escape
+
+import httpx
+from botocore.awsrequest import AWSResponse
+
+FAKE_S3_ENDPOINT = "http://minio.test"
+FAKE_S3_BUCKET = "kpmp-uploads"
+FAKE_S3_ACCESS_KEY = "minio-access"
+FAKE_S3_SECRET_KEY = "minio-secret"
+FAKE_S3_REGION = "us-east-1"
+
+XML_NAMESPACE = "http://s3.amazonaws.com/doc/2006-03-01/"
+
+
+@dataclass
+class FakeObject:
+    body: bytes
+    content_type: str
+    cache_control: str | None = None
+    last_modified: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @property
+    def etag(self) -> str:
+        return f'"{hashlib.md5(self.body).hexdigest()}"'
+
+
+class _RawBody(io.BytesIO):
+    """The urllib3 response interface botocore reads bodies through."""
+
+    def stream(self, **kwargs):
+        while chunk := self.read(64 * 1024):
+            yield chunk
+
+
+class FakeS3:
+    """
+    Answers S3 calls for one path-style bucket at FAKE_S3_ENDPOINT.
+
+    `attach` routes a boto3 client's requests here after they are built
+    and signed, so the real request serialisation and response parsing
+    run. Browser form uploads go through `transport` and are checked
+    against the signed POST policy. `page_size` caps ListObjectsV2 pages
+    so pagination can be exercised with a few objects.
+    """
+
+    def __init__(self):
+        self.objects: dict[str, FakeObject] = {}
+        self.calls: list[tuple[str, str]] = []  # (HTTP method, key) of API calls
+        self.page_size = 1000
+        self.transport = httpx.MockTransport(self._handle_form_upload)
+
+    def attach(self, client) -> None:
+        client.meta.events.register("before-send.s3", self._handle)
+
+    # boto3 API calls
+
+    def _handle(self, request, **kwargs) -> AWSResponse:
+        url = urlsplit(request.url)
+        bucket, _, key = url.path.lstrip("/").partition("/")
+        key = unquote(key)
+        self.calls.append((request.method, key))
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        headers = {
+            name.lower(): value.decode() if isinstance(value, bytes) else value
+            for name, value in request.headers.items()
+        }
+        if bucket != FAKE_S3_BUCKET:
+            return self._error(request, 404, "NoSuchBucket")
+        if not headers.get("authorization", "").startswith("AWS4-HMAC-SHA256"):
+            return self._error(request, 403, "AccessDenied")
+
+        if request.method == "GET" and not key:
+            return self._list_objects(request, query)
+        if request.method == "HEAD":
+            return self._head_object(request, key)
+        if request.method == "GET":
+            return self._get_object(request, key)
+        if request.method == "PUT" and "x-amz-copy-source" in headers:
+            return self._copy_object(request, key, headers)
+        if request.method == "PUT":
+            return self._put_object(request, key, headers)
+        if request.method == "DELETE":
+            self.objects.pop(key, None)
+            return self._response(request, 204)
+        return self._error(request, 405, "MethodNotAllowed")
+
+    def _head_object(self, request, key: str) -> AWSResponse:
+        obj = self.objects.get(key)
+        if obj is None:
+            return self._response(request, 404)
+        return self._response(request, 200, headers=self._object_headers(obj))
+
+    def _get_object(self, request, key: str) -> AWSResponse:
+        obj = self.objects.get(key)
+        if obj is None:
+            return self._error(request, 404, "NoSuchKey")
+        return self._response(request, 200, obj.body, self._object_headers(obj))
+
+    def _put_object(self, request, key: str, headers: dict[str, str]) -> AWSResponse:
+        body = request.body
+        if hasattr(body, "read"):
+            body = body.read()
+        obj = FakeObject(
+            body=bytes(body or b""),
+            content_type=headers.get("content-type", "binary/octet-stream"),
+            cache_control=headers.get("cache-control"),
+        )
+        self.objects[key] = obj
+        return self._response(request, 200, headers={"ETag": obj.etag})
+
+    def _copy_object(self, request, key: str, headers: dict[str, str]) -> AWSResponse:
+        copy_source = unquote(headers["x-amz-copy-source"]).lstrip("/")
+        source_bucket, _, source_key = copy_source.partition("/")
+        source = self.objects.get(source_key) if source_bucket == FAKE_S3_BUCKET else None
+        if source is None:
+            return self._error(request, 404, "NoSuchKey")
+        replace = headers.get("x-amz-metadata-directive") == "REPLACE"
+        if source_key == key and not replace:
+            return self._error(request, 400, "InvalidRequest")
+        obj = FakeObject(
+            body=source.body,
+            content_type=headers["content-type"] if replace else source.content_type,
+            cache_control=headers.get("cache-control") if replace else source.cache_control,
+        )
+        self.objects[key] = obj
+        return self._response(
+            request,
+            200,
+            f"<CopyObjectResult><LastModified>{obj.last_modified.isoformat()}</LastModified>"
+            f"<ETag>{escape(obj.etag)}</ETag></CopyObjectResult>".encode(),
+        )
+
+    def _list_objects(self, request, query: dict[str, str]) -> AWSResponse:
+        prefix = query.get("prefix", "")
+        after = query.get("continuation-token", "")
+        keys = sorted(k for k in self.objects if k.startswith(prefix) and k > after)
+        page, truncated = keys[: self.page_size], len(keys) > self.page_size
+        contents = "".join(
+            f"<Contents><Key>{escape(key)}</Key>"
+            f"<LastModified>{self.objects[key].last_modified.isoformat()}</LastModified>"
+            f"<ETag>{escape(self.objects[key].etag)}</ETag>"
+            f"<Size>{len(self.objects[key].body)}</Size>"
+            f"<StorageClass>STANDARD</StorageClass></Contents>"
+            for key in page
+        )
+        next_token = (
+            f"<NextContinuationToken>{escape(page[-1])}</NextContinuationToken>"
+            if truncated else ""
+        )
+        body = (
+            f'<ListBucketResult xmlns="{XML_NAMESPACE}">'
+            f"<Name>{FAKE_S3_BUCKET}</Name><Prefix>{escape(prefix)}</Prefix>"
+            f"<KeyCount>{len(page)}</KeyCount><MaxKeys>{self.page_size}</MaxKeys>"
+            f"<IsTruncated>{'true' if truncated else 'false'}</IsTruncated>"
+            f"{next_token}{contents}</ListBucketResult>"
+        )
+        return self._response(request, 200, body.encode())
+
+    def _object_headers(self, obj: FakeObject) -> dict[str, str]:
+        headers = {
+            "Content-Length": str(len(obj.body)),
+            "Content-Type": obj.content_type,
+            "ETag": obj.etag,
+            "Last-Modified": format_datetime(obj.last_modified, usegmt=True),
+        }
+        if obj.cache_control:
+            headers["Cache-Control"] = obj.cache_control
+        return headers
+
+    def _response(
+        self, request, status_code: int, body: bytes = b"", headers: dict[str, str] | None = None
+    ) -> AWSResponse:
+        headers = headers or {}
+        headers.setdefault("Content-Length", str(len(body)))
+        return AWSResponse(request.url, status_code, headers, _RawBody(body))
+
+    def _error(self, request, status_code: int, code: str) -> AWSResponse:
+        body = f"<Error><Code>{code}</Code><Message>{code}</Message></Error>"
+        return self._response(request, status_code, body.encode())
+
+    # Browser form uploads
+
+    async def _handle_form_upload(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "POST" or str(request.url) != f"{FAKE_S3_ENDPOINT}/{FAKE_S3_BUCKET}":
+            return self._form_error(404, "NoSuchBucket")
+        fields, file = self._parse_form(request)
+        if file is None or "policy" not in fields:
+            return self._form_error(400, "InvalidArgument")
+
+        if not hmac.compare_digest(fields.get("x-amz-signature", ""), self._sign(fields)):
+            return self._form_error(403, "SignatureDoesNotMatch")
+        policy = json.loads(base64.b64decode(fields["policy"]))
+        expiration = datetime.fromisoformat(policy["expiration"].replace("Z", "+00:00"))
+        if expiration < datetime.now(timezone.utc):
+            return self._form_error(403, "AccessDenied")
+
+        values = {**fields, "bucket": FAKE_S3_BUCKET}
+        for condition in policy["conditions"]:
+            if isinstance(condition, dict):
+                [(name, expected)] = condition.items()
+                if values.get(name) != expected:
+                    return self._form_error(403, "AccessDenied")
+            elif condition[0] == "content-length-range":
+                if not condition[1] <= len(file) <= condition[2]:
+                    code = "EntityTooLarge" if len(file) > condition[2] else "EntityTooSmall"
+                    return self._form_error(400, code)
+            else:
+                operator, name, expected = condition
+                value = values.get(name.lstrip("$"), "")
+                if operator == "eq" and value != expected:
+                    return self._form_error(403, "AccessDenied")
+                if operator == "starts-with" and not value.startswith(expected):
+                    return self._form_error(403, "AccessDenied")
+
+        self.objects[fields["key"]] = FakeObject(
+            body=file, content_type=fields.get("Content-Type", "binary/octet-stream")
+        )
+        return httpx.Response(204)
+
+    @staticmethod
+    def _parse_form(request: httpx.Request) -> tuple[dict[str, str], bytes | None]:
+        message = message_from_bytes(
+            f"Content-Type: {request.headers['content-type']}\r\n\r\n".encode()
+            + request.read(),
+            policy=email.policy.HTTP,
+        )
+        fields, file = {}, None
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            payload = part.get_payload(decode=True)
+            if name == "file":
+                file = payload
+            else:
+                fields[name] = payload.decode()
+        return fields, file
+
+    @staticmethod
+    def _sign(fields: dict[str, str]) -> str:
+        """SigV4 signature of a POST policy, checked with the bucket's secret key."""
+        access_key, day, region, service, _ = fields.get("x-amz-credential", "////").split("/")
+        if access_key != FAKE_S3_ACCESS_KEY:
+            return ""
+        key = f"AWS4{FAKE_S3_SECRET_KEY}".encode()
+        for part in (day, region, service, "aws4_request"):
+            key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+        return hmac.new(key, fields["policy"].encode(), hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def _form_error(status_code: int, code: str) -> httpx.Response:
+        body = f"<Error><Code>{code}</Code><Message>{code}</Message></Error>"
+        return httpx.Response(status_code, content=body.encode())
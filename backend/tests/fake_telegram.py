@@ -0,0 +1,66 @@
+"""An in-process stand-in for the Telegram Bot API."""
+import asyncio
+import json
+from collections import defaultdict
+from typing import Any
+
+import httpx
+
+FAKE_BOT_TOKEN = "123456:fake-token"
+
+
+class FakeBotAPI:
+    """
+    Answers Bot API calls made through `transport`.
+
+    getUpdates serves `updates` the way Telegram does: passing an offset
+    confirms and forgets every update below it. Responses queued with
+    `respond` or `disconnect` are used, in order, before the normal
+    handling of a method.
+    """
+
+    def __init__(self):
+        self.updates: list[dict[str, Any]] = []
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+        self.read_timeouts: dict[str, float] = {}  # Latest read timeout per method
+        self._scripted: dict[str, list[httpx.Response | None]] = defaultdict(list)
+        self.transport = httpx.MockTransport(self._handle)
+
+    def respond(self, method: str, status_code: int, body: dict[str, Any]) -> None:
+        self._scripted[method].append(httpx.Response(status_code, json=body))
+
+    def disconnect(self, method: str) -> None:
+        """Drop the connection on the next call to `method`."""
+        self._scripted[method].append(None)
+
+    def methods(self) -> list[str]:
+        return [method for method, _ in self.calls]
+
+    async def _handle(self, request: httpx.Request) -> httpx.Response:
+        method = request.url.path.rsplit("/", 1)[-1]
+        params = json.loads(request.content or b"{}")
+        self.calls.append((method, params))
+        self.read_timeouts[method] = request.extensions["timeout"]["read"]
+
+        if self._scripted[method]:
+            response = self._scripted[method].pop(0)
+            if response is None:
+                raise httpx.ConnectError("Connection reset", request=request)
+            return response
+
+        if method == "getUpdates":
+            result = await self._get_updates(params)
+        elif method.startswith("send"):
+            result = {"message_id": len(self.calls), "chat": {"id": params.get("chat_id")}}
+        else:
+            result = True
+        return httpx.Response(200, json={"ok": True, "result": result})
+
+    async def _get_updates(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        offset = params.get("offset")
+        if offset is not None:
+            self.updates = [u for u in self.updates if u["update_id"] >= offset]
+        if not self.updates:
+            # Stand in for the long poll without holding the test up
+            await asyncio.sleep(0.01)
+        return self.updates[: params.get("limit", 100)]
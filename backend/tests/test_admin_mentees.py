@@ -0,0 +1,48 @@
+import pytest
+import pytest_asyncio
+
+from app.core.constants import HAS_MORE_HEADER, MENTEE_LIST_DEFAULT_LIMIT
+from tests.factories import auth_headers, create_coordinator, create_mentee
+
+URL = "/api/v1/admin/mentees"
+
+
+@pytest_asyncio.fixture
+async def headers(db_session):
+    coordinator = await create_coordinator(db_session)
+    for i in range(60):
+        await create_mentee(db_session, f"KPDF-{i:03d}", f"Ada Lovelace {i:03d}")
+    await db_session.commit()
+    return auth_headers(coordinator)
+
+
+@pytest.mark.asyncio
+async def test_search_is_bounded_by_default(client, headers):
+    response = await client.get(URL, params={"search": "a"}, headers=headers)
+
+    assert len(response.json()) == MENTEE_LIST_DEFAULT_LIMIT
+    assert response.headers[HAS_MORE_HEADER] == "true"
+
+
+@pytest.mark.asyncio
+async def test_pages_cover_every_match_once(client, headers):
+    ids = []
+    offset, has_more = 0, "true"
+    while has_more == "true":
+        response = await client.get(
+            URL, params={"search": "Ada", "limit": 25, "offset": offset}, headers=headers
+        )
+        page = [mentee["mentee_id"] for mentee in response.json()]
+        ids += page
+        offset += len(page)
+        has_more = response.headers[HAS_MORE_HEADER]
+
+    assert sorted(ids) == [f"KPDF-{i:03d}" for i in range(60)]
+    assert len(response.json()) == 10
+
+
+@pytest.mark.asyncio
+async def test_limit_is_capped(client, headers):
+    response = await client.get(URL, params={"limit": 5000}, headers=headers)
+
+    assert response.status_code == 422
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.constants import BULK_ATTENDANCE_MAX_ROWS, AttendanceStatus
+from app.models.attendance import Attendance
+from app.repositories.attendance_repo import AttendanceRepository
+from tests.factories import (
+    auth_headers,
+    create_coordinator,
+    create_mentee,
+    create_program,
+    create_session,
+)
+
+
+@pytest.mark.asyncio
+async def test_upsert_reports_created_and_updated_rows(db_session):
+    session = await create_session(db_session, await create_program(db_session))
+    ada = await create_mentee(db_session)
+    bob = await create_mentee(db_session, "KPDF-002", "Bob Smith")
+    repo = AttendanceRepository(db_session)
+    first_at = datetime(2026, 5, 1, 10, 0, tzinfo=timezone.utc)
+
+    created = await repo.upsert_statuses(
+        session.id,
+        [(ada.id, AttendanceStatus.PRESENT), (bob.id, AttendanceStatus.ABSENT)],
+        first_at,
+    )
+    assert [(row["mentee_id"], row["inserted"]) for row in created] == [
+        (ada.id, True),
+        (bob.id, True),
+    ]
+
+    updated = await repo.upsert_statuses(
+        session.id,
+        [(ada.id, AttendanceStatus.PARTIAL)],
+        first_at + timedelta(hours=1),
+    )
+    assert [(row["id"], row["inserted"]) for row in updated] == [(created[0]["id"], False)]
+
+    db_session.expire_all()
+    attendance = await db_session.get(Attendance, created[0]["id"])
+    assert attendance.status == AttendanceStatus.PARTIAL
+    # Existing records only change status
+    assert attendance.joined_at == first_at
+    assert attendance.code_entered_at == first_at
+    absent = await db_session.get(Attendance, created[1]["id"])
+    assert absent.joined_at is None and absent.code_entered_at is None
+
+
+@pytest.mark.asyncio
+async def test_bulk_set_reports_each_row(client, db_session):
+    coordinator = await create_coordinator(db_session)
+    session = await create_session(db_session, await create_program(db_session))
+    ada = await create_mentee(db_session)
+    await create_mentee(db_session, "KPDF-002", "Bob Smith")
+    db_session.add(Attendance(
+        session_id=session.id, mentee_id=ada.id, status=AttendanceStatus.ABSENT
+    ))
+    session_id = session.id
+    await db_session.commit()
+
+    response = await client.post(
+        f"/api/v1/attendance/sessions/{session_id}/bulk",
+        headers=auth_headers(coordinator),
+        json={"rows": [
+            {"mentee_id": "KPDF-001", "status": "present"},
+            {"mentee_id": " KPDF-002 ", "status": " Present "},
+            {"mentee_id": "KPDF-404", "status": "PRESENT"},
+            {"mentee_id": "KPDF-001", "status": "maybe"},
+            {"mentee_id": "KPDF-002", "status": "ABSENT"},
+        ]},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["total"], body["created"], body["updated"], body["failed"]) == (5, 1, 1, 3)
+    assert [(r["row"], r["mentee_id"], r["result"], r["error"]) for r in body["results"]] == [
+        (1, "KPDF-001", "updated", None),
+        (2, "KPDF-002", "created", None),
+        (3, "KPDF-404", "error", "Mentee not found: KPDF-404"),
+        (4, "KPDF-001", "error", "Invalid status: maybe"),
+        (5, "KPDF-002", "error", "Duplicate of row 2"),
+    ]
+    assert [r["status"] for r in body["results"]] == [
+        "PRESENT", "PRESENT", "PRESENT", None, "ABSENT"
+    ]
+
+    db_session.expire_all()
+    statuses = await db_session.execute(
+        select(Attendance.id, Attendance.status).where(Attendance.session_id == session_id)
+    )
+    assert dict(statuses.all()) == {
+        body["results"][0]["attendance_id"]: AttendanceStatus.PRESENT,
+        body["results"][1]["attendance_id"]: AttendanceStatus.PRESENT,
+    }
+
+
+@pytest.mark.asyncio
+async def test_bulk_set_rejects_too_many_rows(client, db_session):
+    coordinator = await create_coordinator(db_session)
+    session = await create_session(db_session, await create_program(db_session))
+    await create_mentee(db_session)
+    session_id = session.id
+    await db_session.commit()
+    rows = [{"mentee_id": "KPDF-001", "status": "PRESENT"}] * (BULK_ATTENDANCE_MAX_ROWS + 1)
+
+    response = await client.post(
+        f"/api/v1/attendance/sessions/{session_id}/bulk",
+        headers=auth_headers(coordinator),
+        json={"rows": rows},
+    )
+
+    assert response.status_code == 400
+    assert str(BULK_ATTENDANCE_MAX_ROWS) in response.json()["detail"]
+    assert await db_session.scalar(select(func.count(Attendance.id))) == 0
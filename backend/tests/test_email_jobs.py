@@ -0,0 +1,104 @@
+import re
+
+import pytest
+from sqlalchemy import select
+
+from app.core.constants import JobStatus
+from app.models.job import Job
+from app.repositories.job_repo import JobRepository
+from app.core.security import hash_reset_token
+from app.services import auth_service, email_service as email_module, job_service
+from app.services.auth_service import AuthService, send_password_reset_job
+from app.services.email_service import send_bulk_email_job
+from app.services.job_service import JobRunner, enqueue_job
+from tests import conftest
+from tests.factories import create_mentee
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    """Record sent emails; addresses in `smtp.failing` fail like an SMTP error."""
+
+    class FakeSMTP:
+        def __init__(self):
+            self.failing: set[str] = set()
+            self.sent: list[str] = []
+
+            self.bodies: list[str] = []
+
+        async def send_email(self, to_email, subject, html_content, text_content=None):
+            if to_email in self.failing:
+                return False
+            self.sent.append(to_email)
+            self.bodies.append(html_content)
+            return True
+
+    fake = FakeSMTP()
+    monkeypatch.setattr(email_module.email_service, "send_email", fake.send_email)
+    return fake
+
+
+async def _run_once(db_session, handlers) -> Job:
+    """Lease and run the single queued job, then return its updated row."""
+    runner = JobRunner(handlers)
+    jobs = await JobRepository(db_session).lease(runner.worker_id, 1)
+    await db_session.commit()
+    assert len(jobs) == 1
+    job_id = jobs[0].id
+    await runner._execute(jobs[0])
+    db_session.expire_all()
+    return await db_session.scalar(select(Job).where(Job.id == job_id))
+
+
+@pytest.mark.asyncio
+async def test_password_reset_token_is_only_stored_hashed(db_session, smtp, monkeypatch):
+    monkeypatch.setattr(job_service, "AsyncSessionLocal", conftest.test_session_factory)
+    monkeypatch.setattr(auth_service, "AsyncSessionLocal", conftest.test_session_factory)
+    mentee = await create_mentee(db_session)
+    user = mentee.user
+    await AuthService(db_session).request_password_reset(mentee.mentee_id)
+    await db_session.commit()
+
+    job = await _run_once(db_session, {"send_password_reset": send_password_reset_job})
+
+    await db_session.refresh(user)
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.payload == {"user_id": user.id}
+    assert smtp.sent == [user.email]
+    token = re.search(r"token=([\w-]+)", smtp.bodies[0]).group(1)
+    assert user.reset_token_hash == hash_reset_token(token)
+
+
+@pytest.mark.asyncio
+async def test_failed_password_reset_email_is_retried(db_session, smtp, monkeypatch):
+    monkeypatch.setattr(job_service, "AsyncSessionLocal", conftest.test_session_factory)
+    monkeypatch.setattr(auth_service, "AsyncSessionLocal", conftest.test_session_factory)
+    mentee = await create_mentee(db_session)
+    smtp.failing = {mentee.user.email}
+    await enqueue_job(db_session, "send_password_reset", user_id=mentee.user_id)
+    await db_session.commit()
+
+    job = await _run_once(db_session, {"send_password_reset": send_password_reset_job})
+
+    assert job.status == JobStatus.PENDING
+    assert "could not be sent" in job.last_error
+
+
+@pytest.mark.asyncio
+async def test_bulk_email_retry_only_goes_to_failed_recipients(db_session, smtp, monkeypatch):
+    monkeypatch.setattr(job_service, "AsyncSessionLocal", conftest.test_session_factory)
+    smtp.failing = {"bob@kpdf.org"}
+    await enqueue_job(
+        db_session,
+        "send_bulk_email",
+        recipients=[("ada@kpdf.org", "Ada"), ("bob@kpdf.org", "Bob")],
+        subject="Hello",
+        html_content="Hi {{name}}",
+    )
+    await db_session.commit()
+
+    job = await _run_once(db_session, {"send_bulk_email": send_bulk_email_job})
+
+    assert smtp.sent == ["ada@kpdf.org"]
+    assert job.status == JobStatus.PENDING
+    assert job.payload["recipients"] == [["bob@kpdf.org", "Bob"]]
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from app.config import get_settings
+from app.core.constants import UserRole
+from app.models.user import User
+from app.services import event_service
+from app.services.event_service import EventBus
+from tests import conftest
+from tests.factories import auth_headers, create_program, create_session
+
+
+@pytest.mark.asyncio
+async def test_user_without_mentee_profile_cannot_stream_events(client, db_session):
+    program = await create_program(db_session)
+    session = await create_session(db_session, program)
+    user = User(email="nobody@kpdf.org", password_hash="x", role=UserRole.MENTEE)
+    db_session.add(user)
+    await db_session.commit()
+
+    response = await client.get(
+        f"/api/v1/events/sessions/{session.id}", headers=auth_headers(user)
+    )
+
+    assert response.status_code == 403
+
+
+async def _wait_for(condition, timeout: float = 5) -> None:
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_event_bus_relistens_after_connection_loss(db_session, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "event_backend", "postgres")
+    monkeypatch.setattr(settings, "database_url", conftest.TEST_DATABASE_URL)
+    monkeypatch.setattr(event_service, "RECONNECT_BASE_SECONDS", 0.01)
+    bus = EventBus()
+
+    await bus.start()
+    try:
+        await _wait_for(lambda: bus._pg_conn is not None)
+        first = bus._pg_conn
+        async with bus.subscribe("session:1") as queue:
+            bus.publish("session:1", {"type": "ping"})
+            assert await asyncio.wait_for(queue.get(), 5) == {"type": "ping"}
+
+            # Postgres drops the listening connection, e.g. on failover
+            conn = await db_session.connection()
+            await conn.exec_driver_sql(
+                "SELECT pg_terminate_backend($1)", (first.get_server_pid(),)
+            )
+            await _wait_for(lambda: bus._pg_conn not in (None, first))
+
+            bus.publish("session:1", {"type": "pong"})
+            assert await asyncio.wait_for(queue.get(), 5) == {"type": "pong"}
+    finally:
+        await bus.stop()
+    assert bus._pg_conn is None
@@ -0,0 +1,47 @@
+import asyncio
+import csv
+import io
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from tests import conftest
+from tests.factories import create_program, create_session
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+
+async def run_export(*args: str) -> bytes:
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "scripts/export_data.py",
+        *args,
+        cwd=BACKEND_DIR,
+        env={
+            **os.environ,
+            "DATABASE_URL": conftest.TEST_DATABASE_URL,
+            "ENVIRONMENT": "development",  # SQL echo on
+        },
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate()
+    assert process.returncode == 0, stderr.decode()
+    return stdout
+
+
+@pytest.mark.asyncio
+async def test_csv_on_stdout_contains_only_the_export(db_session):
+    program = await create_program(db_session)
+    session = await create_session(db_session, program)
+    await db_session.commit()
+
+    output = await run_export("sessions", "--program-id", str(program.id))
+
+    rows = list(csv.reader(io.StringIO(output.decode())))
+    assert rows[0] == [
+        "session_id", "title", "date", "start_time", "end_time", "is_core_session", "created_at"
+    ]
+    assert [row[:2] for row in rows[1:]] == [[str(session.id), session.title]]
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+from app.core.constants import JobStatus
+from app.models.job import Job
+from app.repositories.job_repo import JobRepository
+from app.services.job_service import enqueue_job
+
+
+async def expire_lease(db_session, job_id: int) -> None:
+    """Simulate the leasing worker dying: its lease runs out."""
+    await db_session.execute(
+        update(Job)
+        .where(Job.id == job_id)
+        .values(locked_until=datetime.now(timezone.utc) - timedelta(seconds=1))
+    )
+    await db_session.commit()
+    db_session.expire_all()
+
+
+async def reload(db_session, job_id: int) -> Job:
+    db_session.expire_all()
+    return await db_session.scalar(select(Job).where(Job.id == job_id))
+
+
+@pytest.mark.asyncio
+async def test_expired_leases_are_retried_until_attempts_run_out(db_session):
+    repo = JobRepository(db_session)
+    await enqueue_job(db_session, "crashes_worker")
+    await db_session.commit()
+
+    for attempt in range(1, 4):
+        [job] = await repo.lease(f"worker-{attempt}", 1)
+        await db_session.commit()
+        assert job.attempts == attempt
+        job_id = job.id
+        await expire_lease(db_session, job_id)
+
+    assert await repo.lease("worker-4", 1) == []
+    await db_session.commit()
+    job = await reload(db_session, job_id)
+    assert job.status == JobStatus.FAILED
+    assert job.attempts == 3
+    assert job.locked_by is None
+    assert job.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_worker_that_lost_its_lease_cannot_record_a_result(db_session):
+    repo = JobRepository(db_session)
+    await enqueue_job(db_session, "slow")
+    await db_session.commit()
+    [job] = await repo.lease("worker-1", 1)
+    await db_session.commit()
+    job_id = job.id
+    await expire_lease(db_session, job_id)
+    await repo.lease("worker-2", 1)
+    await db_session.commit()
+
+    await repo.mark_failed(job_id, "worker-1", "late failure", retry_at=None)
+    await repo.mark_succeeded(job_id, "worker-1")
+    await db_session.commit()
+    job = await reload(db_session, job_id)
+    assert job.status == JobStatus.RUNNING
+    assert job.locked_by == "worker-2"
+    assert job.last_error is None
+
+    await repo.mark_succeeded(job_id, "worker-2")
+    await db_session.commit()
+    job = await reload(db_session, job_id)
+    assert job.status == JobStatus.SUCCEEDED
@@ -0,0 +1,53 @@
+import pytest
+
+from app.api.v1 import leaderboard
+from app.services.singleflight_service import coordinator_reads
+from tests import conftest
+from tests.factories import (
+    auth_headers,
+    create_coordinator,
+    create_mentee,
+    create_program,
+    create_session,
+)
+
+
+@pytest.mark.asyncio
+async def test_check_in_refreshes_cached_leaderboard(client, db_session, monkeypatch):
+    # The leaderboard is computed in its own session, outside the request's
+    monkeypatch.setattr(leaderboard, "AsyncSessionLocal", conftest.test_session_factory)
+    coordinator_reads.clear()
+
+    coordinator = await create_coordinator(db_session)
+    mentee = await create_mentee(db_session)
+    program = await create_program(db_session)
+    session = await create_session(db_session, program)
+    await db_session.commit()
+    coordinator_headers = auth_headers(coordinator)
+    mentee_headers = auth_headers(mentee.user)
+    url = f"/api/v1/leaderboard?program_id={program.id}"
+
+    before = await client.get(url, headers=coordinator_headers)
+    assert before.status_code == 200
+    assert before.json()[0]["sessions_attended"] == 0
+
+    response = await client.post(
+        "/api/v1/attendance/join", json={"session_id": session.id}, headers=mentee_headers
+    )
+    assert response.status_code == 200
+    response = await client.post(
+        f"/api/v1/attendance/sessions/{session.id}/generate-code",
+        headers=coordinator_headers,
+    )
+    code = response.json()["code"]
+    response = await client.post(
+        "/api/v1/attendance/code",
+        json={"session_id": session.id, "code": code},
+        headers=mentee_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "PRESENT"
+
+    # Still within the fresh period, but the check-in changed the attendance table
+    after = await client.get(url, headers=coordinator_headers)
+    assert after.json()[0]["sessions_attended"] == 1
@@ -0,0 +1,70 @@
+import shutil
+import uuid
+from pathlib import Path
+
+import pytest
+
+from app.config import get_settings
+from app.core.media import DEFAULT_CACHE_CONTROL, IMMUTABLE_CACHE_CONTROL
+
+DIGEST = "0123456789abcdef" * 4
+WEBP_ACCEPT = "image/avif,image/webp,image/*,*/*;q=0.8"
+
+
+@pytest.fixture
+def media_dir():
+    """A scratch directory under the mounted upload dir, as (path, URL prefix)."""
+    name = f"media-test-{uuid.uuid4().hex}"
+    path = Path(get_settings().upload_dir) / name
+    path.mkdir(parents=True)
+    yield path, f"/static/{name}"
+    shutil.rmtree(path)
+
+
+@pytest.mark.asyncio
+async def test_hashed_names_are_cached_as_immutable(client, media_dir):
+    path, url = media_dir
+    (path / f"{DIGEST}.png").write_bytes(b"png")
+    (path / f"{DIGEST}_thumb.png").write_bytes(b"thumb")
+
+    for name in (f"{DIGEST}.png", f"{DIGEST}_thumb.png"):
+        response = await client.get(f"{url}/{name}")
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert response.headers["vary"] == "Accept"
+
+
+@pytest.mark.asyncio
+async def test_other_names_get_the_default_cache_control(client, media_dir):
+    path, url = media_dir
+    (path / "logo.png").write_bytes(b"png")
+    (path / f"{DIGEST}-old.png").write_bytes(b"png")
+
+    for name in ("logo.png", f"{DIGEST}-old.png"):
+        response = await client.get(f"{url}/{name}")
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == DEFAULT_CACHE_CONTROL
+
+
+@pytest.mark.asyncio
+async def test_webp_sibling_is_served_only_when_accepted_and_present(client, media_dir):
+    path, url = media_dir
+    (path / f"{DIGEST}.png").write_bytes(b"png")
+    (path / f"{DIGEST}.webp").write_bytes(b"webp")
+    (path / "logo.png").write_bytes(b"logo")
+
+    webp = await client.get(f"{url}/{DIGEST}.png", headers={"Accept": WEBP_ACCEPT})
+    assert webp.content == b"webp"
+    assert webp.headers["content-type"] == "image/webp"
+    assert webp.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert webp.headers["vary"] == "Accept"
+
+    png = await client.get(f"{url}/{DIGEST}.png", headers={"Accept": "image/png,*/*"})
+    assert png.content == b"png"
+    assert png.headers["content-type"] == "image/png"
+    assert png.headers["vary"] == "Accept"
+
+    # No sibling: the original is served even to WebP clients
+    no_sibling = await client.get(f"{url}/logo.png", headers={"Accept": WEBP_ACCEPT})
+    assert no_sibling.content == b"logo"
+    assert no_sibling.headers["content-type"] == "image/png"
@@ -0,0 +1,142 @@
+import asyncio
+import io
+import os
+import time
+
+import pytest
+from PIL import Image
+from starlette.datastructures import Headers, UploadFile
+
+from app.services import upload_service
+from app.services.mentee_service import MenteeService
+from app.services.scheduler_service import sweep_profile_pictures
+from app.services.storage_service import LocalStorage
+from tests import conftest
+from tests.factories import create_mentee
+
+TWO_DAYS_AGO = time.time() - 2 * 24 * 3600
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch) -> LocalStorage:
+    storage = LocalStorage(str(tmp_path))
+    monkeypatch.setattr(upload_service, "get_storage", lambda: storage)
+    return storage
+
+
+async def upload(color: str, filename: str = "me.png") -> str:
+    data = io.BytesIO()
+    Image.new("RGB", (200, 200), color).save(data, format="PNG")
+    file = UploadFile(
+        io.BytesIO(data.getvalue()),
+        filename=filename,
+        headers=Headers({"content-type": "image/png"}),
+    )
+    return await upload_service.save_profile_picture(file, user_id=1)
+
+
+def stored_files(storage: LocalStorage) -> set[str]:
+    return set(os.listdir(storage.root / "profiles"))
+
+
+def age(storage: LocalStorage, url: str) -> None:
+    """Backdate a picture and its derivatives past the sweep's grace period."""
+    digest = os.path.basename(url).split(".")[0]
+    for name in stored_files(storage):
+        if name.startswith(digest):
+            os.utime(storage.root / "profiles" / name, (TWO_DAYS_AGO, TWO_DAYS_AGO))
+
+
+@pytest.mark.asyncio
+async def test_changing_picture_keeps_file_for_concurrent_upload(db_session, storage):
+    ada = await create_mentee(db_session)
+    bob = await create_mentee(db_session, "KPDF-002", "Bob Smith")
+    shared = await upload("red")
+    await MenteeService(db_session).update_profile_picture(bob.user_id, shared)
+    await db_session.commit()
+
+    async with conftest.test_session_factory() as ada_db:
+        # Ada uploads the same image; her profile change is not committed yet
+        assert await upload("red") == shared
+        await MenteeService(ada_db).update_profile_picture(ada.user_id, shared)
+
+        new_picture = await upload("blue")
+        await MenteeService(db_session).update_profile_picture(bob.user_id, new_picture)
+        await db_session.commit()
+        await asyncio.sleep(0.1)  # Let any after-commit cleanup run
+        await ada_db.commit()
+
+    assert os.path.basename(shared) in stored_files(storage)
+
+
+@pytest.mark.asyncio
+async def test_sweep_deletes_only_old_unreferenced_pictures(db_session, storage):
+    ada = await create_mentee(db_session)
+    in_use = await upload("red")
+    await MenteeService(db_session).update_profile_picture(ada.user_id, in_use)
+    await db_session.commit()
+    unused = await upload("blue")
+    fresh = await upload("green")
+    age(storage, in_use)
+    age(storage, unused)
+    before = stored_files(storage)
+
+    await sweep_profile_pictures(db_session)
+
+    unused_digest = os.path.basename(unused).split(".")[0]
+    removed = before - stored_files(storage)
+    # The original, its thumbnail and both WebP variants
+    assert len(removed) == 4
+    assert all(name.startswith(unused_digest) for name in removed)
+    assert os.path.basename(in_use) in stored_files(storage)
+    assert os.path.basename(fresh) in stored_files(storage)
+
+
+@pytest.mark.asyncio
+async def test_reuploading_an_old_picture_protects_it_from_the_sweep(db_session, storage):
+    url = await upload("red")
+    age(storage, url)
+
+    # Same bytes again: deduplicated, and its profile change is not committed yet
+    assert await upload("red") == url
+    await sweep_profile_pictures(db_session)
+
+    assert os.path.basename(url) in stored_files(storage)
+
+
+@pytest.mark.asyncio
+async def test_sweep_keeps_variants_shared_with_a_used_original(db_session, storage):
+    # The same bytes uploaded under two extensions share their WebP variants
+    ada = await create_mentee(db_session)
+    as_jpg = await upload("red", "me.jpg")
+    as_png = await upload("red", "me.png")
+    await MenteeService(db_session).update_profile_picture(ada.user_id, as_jpg)
+    await db_session.commit()
+    age(storage, as_jpg)
+    digest = os.path.basename(as_jpg).split(".")[0]
+
+    await sweep_profile_pictures(db_session)
+
+    assert stored_files(storage) == {
+        f"{digest}.jpg", f"{digest}_thumb.jpg", f"{digest}.webp", f"{digest}_thumb.webp"
+    }
+
+    # Once the last original of the image is unused, the shared files go too
+    await MenteeService(db_session).update_profile_picture(ada.user_id, await upload("blue"))
+    await db_session.commit()
+    await sweep_profile_pictures(db_session)
+
+    assert not any(name.startswith(digest) for name in stored_files(storage))
+
+
+@pytest.mark.asyncio
+async def test_deleting_one_original_keeps_variants_its_sibling_uses(storage):
+    as_jpg = await upload("red", "me.jpg")
+    as_png = await upload("red", "me.png")
+    digest = os.path.basename(as_jpg).split(".")[0]
+
+    assert await upload_service.delete_profile_picture(as_png)
+
+    assert stored_files(storage) == {
+        f"{digest}.jpg", f"{digest}_thumb.jpg", f"{digest}.webp", f"{digest}_thumb.webp"
+    }
@@ -0,0 +1,83 @@
+"""
+The hot lookups should be served by the indexes added for them.
+
+The test tables are nearly empty, so sequential scans are switched off to
+make the planner show which index it would pick on a full table.
+"""
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+
+from app.repositories.attendance_repo import AttendanceCodeRepository, AttendanceRepository
+from app.repositories.mentee_repo import MenteeRepository
+from app.repositories.session_repo import SessionRepository
+from app.repositories.telegram_repo import TelegramStatsRepository
+
+
+@contextmanager
+def captured_statements(db_session):
+    """Collect the SQL and parameters of every statement run inside the block."""
+    statements: list[tuple[str, tuple]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+async def explain(db_session, statement: str, parameters: tuple = ()) -> str:
+    conn = await db_session.connection()
+    await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+    return "\n".join(result.scalars().all())
+
+
+async def plans_for(db_session, call) -> list[str]:
+    with captured_statements(db_session) as statements:
+        await call
+    return [await explain(db_session, sql, params) for sql, params in statements]
+
+
+@pytest.mark.asyncio
+async def test_active_code_lookup_uses_session_expiry_index(db_session):
+    repo = AttendanceCodeRepository(db_session)
+
+    [plan] = await plans_for(db_session, repo.get_active_code(1, datetime.now(timezone.utc)))
+
+    assert "ix_attendance_codes_session_id_expires_at" in plan
+
+
+@pytest.mark.asyncio
+async def test_upcoming_session_lookup_uses_date_start_time_index(db_session):
+    repo = SessionRepository(db_session)
+    now = datetime.now()
+
+    plans = await plans_for(db_session, repo.find_upcoming_session(now.date(), now.time()))
+
+    assert "ix_sessions_date_start_time" in plans[0]
+
+
+@pytest.mark.asyncio
+async def test_track_filters_use_track_index(db_session):
+    mentee_plans = await plans_for(
+        db_session, db_session.execute(MenteeRepository(db_session).list_rows_query("Backend"))
+    )
+    leaderboard_plans = await plans_for(
+        db_session, AttendanceRepository(db_session).get_mentee_attendance_counts(1, "Backend")
+    )
+    telegram_plans = await plans_for(
+        db_session,
+        TelegramStatsRepository(db_session).get_stats_by_program(
+            1, "Backend", since=(datetime.now() - timedelta(days=7)).date()
+        ),
+    )
+
+    for plan in (mentee_plans[0], leaderboard_plans[0], telegram_plans[0]):
+        assert "ix_mentee_profiles_track" in plan
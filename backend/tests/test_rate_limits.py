@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.api import deps
+from app.core.constants import LOGIN_RATE_LIMIT_PER_IP_AND_IDENTIFIER
+from app.main import app
+from app.services import rate_limit_service
+from app.services.rate_limit_service import RateLimit, RateLimiter
+
+URL = "/api/v1/auth/login"
+LOGIN_LIMIT = LOGIN_RATE_LIMIT_PER_IP_AND_IDENTIFIER[0]
+TEST_LIMIT = RateLimit("test", 2, 60)
+
+
+class BrokenStore:
+    backend = "broken"
+
+    async def hit(self, key: str, window_index: int, window_seconds: int) -> tuple[int, int]:
+        raise ConnectionError("rate limit store is down")
+
+
+@pytest.fixture
+def limiter(monkeypatch) -> RateLimiter:
+    """A fresh in-memory limiter for the API's rate limit dependencies."""
+    limiter = RateLimiter()
+    monkeypatch.setattr(deps, "rate_limiter", limiter)
+    return limiter
+
+
+def at(monkeypatch, seconds: float) -> None:
+    monkeypatch.setattr(rate_limit_service, "time", SimpleNamespace(time=lambda: seconds))
+
+
+async def login(client: AsyncClient, identifier: str = "KPDF-404"):
+    return await client.post(URL, json={"identifier": identifier, "password": "wrong"})
+
+
+@pytest.mark.asyncio
+async def test_limit_gives_retry_after_until_the_window_slides(monkeypatch):
+    limiter = RateLimiter()
+    at(monkeypatch, 600)  # Start of a window
+
+    assert await limiter.hit(TEST_LIMIT, "a") is None
+    assert await limiter.hit(TEST_LIMIT, "a") is None
+    retry_after = await limiter.hit(TEST_LIMIT, "a")
+    assert retry_after == 100
+    assert await limiter.hit(TEST_LIMIT, "b") is None  # Keys are counted separately
+
+    at(monkeypatch, 600 + retry_after + 1)
+    assert await limiter.hit(TEST_LIMIT, "a") is None
+    assert limiter.metrics["test"].as_dict() == {"allowed": 4, "limited": 1, "errors": 0}
+
+
+@pytest.mark.asyncio
+async def test_limiter_fails_open(monkeypatch):
+    limiter = RateLimiter()
+    monkeypatch.setattr(limiter, "_store", BrokenStore())
+
+    for _ in range(TEST_LIMIT.limit + 1):
+        assert await limiter.hit(TEST_LIMIT, "a") is None
+    assert limiter.metrics["test"].errors == TEST_LIMIT.limit + 1
+
+
+@pytest.mark.asyncio
+async def test_login_is_limited_per_identifier_from_one_ip(client, limiter):
+    for _ in range(LOGIN_LIMIT):
+        assert (await login(client)).status_code == 401
+
+    limited = await login(client)
+    assert limited.status_code == 429
+    assert int(limited.headers["retry-after"]) > 0
+
+    # Other accounts from the same IP, and the same account from elsewhere, still work
+    assert (await login(client, "KPDF-405")).status_code == 401
+    transport = ASGITransport(app=app, client=("203.0.113.9", 123))
+    async with AsyncClient(transport=transport, base_url="http://test") as elsewhere:
+        assert (await login(elsewhere)).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_login_is_allowed_when_the_limiter_fails(client, limiter, monkeypatch):
+    monkeypatch.setattr(limiter, "_store", BrokenStore())
+
+    for _ in range(LOGIN_LIMIT + 1):
+        assert (await login(client)).status_code == 401
+    assert limiter.metrics["login:ip"].errors == LOGIN_LIMIT + 1
@@ -0,0 +1,213 @@
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.api.responses import SelectiveGZipMiddleware, model_list_response
+from app.core.constants import (
+    GZIP_COMPRESS_LEVEL,
+    GZIP_EXCLUDED_PREFIXES,
+    GZIP_MINIMUM_SIZE,
+    AttendanceStatus,
+    ResourceType,
+)
+from app.main import app as main_app
+from app.schemas.attendance import MenteeAttendanceDetailResponse
+from app.schemas.leaderboard import LeaderboardEntryResponse
+from app.schemas.mentee import MenteeProfileResponse
+from app.schemas.session import SessionResourceResponse, SessionResponse
+
+LAGOS = timezone(timedelta(hours=1))
+CREATED_AT = datetime(2026, 3, 14, 9, 26, 53, 589793, tzinfo=LAGOS)
+
+MENTEES = [
+    MenteeProfileResponse(
+        id=1,
+        mentee_id="KPDF-001",
+        full_name="Adaeze Ọkafọr \"Ada\" 🚀",
+        email="ada@kpdf.org",
+        track="Backend",
+        profile_pic_url="/static/profiles/a.png",
+        profile_pic_thumb_url="/static/profiles/a_thumb.png",
+        telegram_user_id=2**40,
+        created_at=CREATED_AT,
+    ),
+    MenteeProfileResponse(
+        id=2,
+        mentee_id="KPDF-002",
+        full_name="Zoë </script> \\ Back",
+        email="zoe@kpdf.org",
+        track="Data",
+        profile_pic_url=None,
+        profile_pic_thumb_url=None,
+        telegram_user_id=None,
+        created_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+    ),
+]
+ROSTER = [
+    MenteeAttendanceDetailResponse(
+        attendance_id=None,
+        mentee_profile_id=1,
+        mentee_id="KPDF-001",
+        full_name="Adaeze Ọkafọr",
+        track="Backend",
+        status=AttendanceStatus.ABSENT,
+        joined_at=None,
+        code_entered_at=None,
+    ),
+    MenteeAttendanceDetailResponse(
+        attendance_id=7,
+        mentee_profile_id=2,
+        mentee_id="KPDF-002",
+        full_name="Zoë",
+        track="Data",
+        status=AttendanceStatus.PRESENT,
+        joined_at=CREATED_AT,
+        code_entered_at=CREATED_AT + timedelta(minutes=3),
+    ),
+]
+LEADERBOARD = [
+    LeaderboardEntryResponse(
+        rank=1,
+        mentee_profile_id=1,
+        mentee_id="KPDF-001",
+        full_name="Adaeze Ọkafọr",
+        track="Backend",
+        sessions_attended=7,
+        total_core_sessions=9,
+        meet_score=7 / 9 * 50,
+        telegram_messages=31,
+        telegram_score=31 / 50 * 50,
+        total_score=7 / 9 * 50 + 31 / 50 * 50,
+    ),
+    LeaderboardEntryResponse(
+        rank=2,
+        mentee_profile_id=2,
+        mentee_id="KPDF-002",
+        full_name="Zoë",
+        track="Data",
+        sessions_attended=0,
+        total_core_sessions=9,
+        meet_score=0.0,
+        telegram_messages=0,
+        telegram_score=0.0,
+        total_score=100.0,
+    ),
+]
+SESSIONS = [
+    SessionResponse(
+        id=3,
+        program_id=1,
+        title="Async Python — “deep” dive",
+        description=None,
+        date=date(2026, 4, 1),
+        start_time=time(9, 30),
+        end_time=time(11, 0, 15),
+        google_meet_link="https://meet.google.com/abc-defg-hij",
+        is_core_session=True,
+        created_at=CREATED_AT,
+        resources=[
+            SessionResourceResponse(
+                id=5,
+                session_id=3,
+                type=ResourceType.SPEAKER,
+                title="Slides",
+                url=None,
+                speaker_name="Grace Hopper",
+                speaker_bio="Line one\nLine two\t✓",
+                speaker_linkedin=None,
+                created_at=CREATED_AT,
+            )
+        ],
+    ),
+]
+
+
+def encoding_app() -> FastAPI:
+    """One endpoint per list, served the old way and with model_list_response."""
+    app = FastAPI()
+    for name, model, items in (
+        ("mentees", MenteeProfileResponse, MENTEES),
+        ("roster", MenteeAttendanceDetailResponse, ROSTER),
+        ("leaderboard", LeaderboardEntryResponse, LEADERBOARD),
+        ("sessions", SessionResponse, SESSIONS),
+    ):
+        async def old(items=items):
+            return items
+
+        async def new(model=model, items=items):
+            return model_list_response(model, items)
+
+        app.get(f"/old/{name}", response_model=list[model], response_class=JSONResponse)(old)
+        app.get(f"/new/{name}", response_model=list[model])(new)
+    return app
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", ["mentees", "roster", "leaderboard", "sessions"])
+async def test_model_list_response_matches_the_old_encoding(name):
+    transport = ASGITransport(app=encoding_app())
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        old = await client.get(f"/old/{name}")
+        new = await client.get(f"/new/{name}")
+
+    assert new.status_code == old.status_code == 200
+    assert new.content == old.content
+    assert new.headers["content-type"] == old.headers["content-type"]
+
+
+def gzip_app() -> FastAPI:
+    """The app's gzip settings in front of a JSON list, an event stream and a static file."""
+    app = FastAPI()
+    app.add_middleware(
+        SelectiveGZipMiddleware,
+        excluded_prefixes=GZIP_EXCLUDED_PREFIXES,
+        minimum_size=GZIP_MINIMUM_SIZE,
+        compresslevel=GZIP_COMPRESS_LEVEL,
+    )
+    body = "x" * (4 * GZIP_MINIMUM_SIZE)
+
+    @app.get("/api/v1/sessions")
+    async def sessions():
+        return [body]
+
+    @app.get("/api/v1/events/sessions/1")
+    async def events():
+        async def stream():
+            yield f"data: {body}\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @app.get("/static/profiles/a.png")
+    async def picture():
+        return StreamingResponse(iter([body.encode()]), media_type="image/png")
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_gzip_skips_event_streams_and_static_files():
+    transport = ASGITransport(app=gzip_app())
+    headers = {"Accept-Encoding": "gzip"}
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        json_list = await client.get("/api/v1/sessions", headers=headers)
+        events = await client.get("/api/v1/events/sessions/1", headers=headers)
+        picture = await client.get("/static/profiles/a.png", headers=headers)
+
+    assert json_list.headers["content-encoding"] == "gzip"
+    assert json_list.json() == ["x" * (4 * GZIP_MINIMUM_SIZE)]
+    for response in (events, picture):
+        assert "content-encoding" not in response.headers
+        assert len(response.content) >= 4 * GZIP_MINIMUM_SIZE
+
+
+def test_app_uses_the_tested_gzip_settings():
+    [middleware] = [m for m in main_app.user_middleware if m.cls is SelectiveGZipMiddleware]
+
+    assert middleware.kwargs == {
+        "excluded_prefixes": GZIP_EXCLUDED_PREFIXES,
+        "minimum_size": GZIP_MINIMUM_SIZE,
+        "compresslevel": GZIP_COMPRESS_LEVEL,
+    }
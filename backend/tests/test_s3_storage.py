@@ -0,0 +1,223 @@
+import io
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from PIL import Image
+
+from sqlalchemy import select
+
+from app.core.constants import JobStatus
+from app.core.media import IMMUTABLE_CACHE_CONTROL
+from app.models.job import Job
+from app.models.mentee import MenteeProfile
+from app.repositories.job_repo import JobRepository
+from app.services import job_service, mentee_service, upload_service
+from app.services.job_service import JobRunner
+from app.services.mentee_service import MenteeService
+from app.services.storage_service import S3Storage, StorageBackend, StorageError
+from app.worker import JOB_HANDLERS
+from tests import conftest
+from tests.fake_s3 import (
+    FAKE_S3_ACCESS_KEY,
+    FAKE_S3_BUCKET,
+    FAKE_S3_ENDPOINT,
+    FAKE_S3_REGION,
+    FAKE_S3_SECRET_KEY,
+    FakeS3,
+)
+from tests.factories import create_mentee
+
+PUBLIC_URL = "https://cdn.kpdf.test/uploads"
+
+
+@pytest.fixture
+def s3() -> FakeS3:
+    return FakeS3()
+
+
+@pytest.fixture
+def storage(s3, monkeypatch) -> S3Storage:
+    storage = S3Storage(
+        bucket=FAKE_S3_BUCKET,
+        public_url=PUBLIC_URL,
+        endpoint_url=FAKE_S3_ENDPOINT,
+        region=FAKE_S3_REGION,
+        access_key=FAKE_S3_ACCESS_KEY,
+        secret_key=FAKE_S3_SECRET_KEY,
+    )
+    s3.attach(storage.client)
+    monkeypatch.setattr(upload_service, "get_storage", lambda: storage)
+    return storage
+
+
+def png(color: str) -> bytes:
+    data = io.BytesIO()
+    Image.new("RGB", (200, 200), color).save(data, format="PNG")
+    return data.getvalue()
+
+
+async def browser_upload(s3: FakeS3, upload: dict, body: bytes, content_type: str) -> httpx.Response:
+    """POST a file with the presigned form fields, as the frontend does."""
+    async with httpx.AsyncClient(transport=s3.transport) as browser:
+        return await browser.post(
+            upload["url"], data=upload["fields"], files={"file": ("me.png", body, content_type)}
+        )
+
+
+async def run_queued_job(db_session) -> Job:
+    """Lease and run the single queued job with the worker's handlers."""
+    runner = JobRunner(JOB_HANDLERS)
+    [job] = await JobRepository(db_session).lease(runner.worker_id, 1)
+    await db_session.commit()
+    job_id = job.id
+    await runner._execute(job)
+    db_session.expire_all()
+    return await db_session.scalar(select(Job).where(Job.id == job_id))
+
+
+def test_storage_backend_is_abstract():
+    with pytest.raises(TypeError):
+        StorageBackend()
+
+
+@pytest.mark.asyncio
+async def test_object_round_trip(storage, s3, tmp_path):
+    source = tmp_path / "source.png"
+    source.write_bytes(b"picture")
+
+    assert await storage.exists("profiles/a.png") is False
+    await storage.put_file("profiles/a.png", source, "image/png")
+
+    assert not source.exists()
+    assert await storage.exists("profiles/a.png") is True
+    assert s3.objects["profiles/a.png"].content_type == "image/png"
+    assert s3.objects["profiles/a.png"].cache_control == IMMUTABLE_CACHE_CONTROL
+
+    assert await storage.get_file("profiles/a.png", tmp_path / "copy.png", 100) == 7
+    assert (tmp_path / "copy.png").read_bytes() == b"picture"
+    with pytest.raises(StorageError):
+        await storage.get_file("profiles/a.png", tmp_path / "copy.png", 6)
+    with pytest.raises(StorageError):
+        await storage.get_file("profiles/missing.png", tmp_path / "copy.png", 100)
+
+    await storage.delete("profiles/a.png")
+    await storage.delete("profiles/a.png")  # Missing objects are ignored
+    assert await storage.exists("profiles/a.png") is False
+
+
+@pytest.mark.asyncio
+async def test_list_keys_follows_pages(storage, s3, tmp_path):
+    for name in ("a", "b", "c", "d", "e"):
+        (tmp_path / name).write_bytes(b"x")
+        await storage.put_file(f"profiles/{name}.png", tmp_path / name, "image/png")
+    (tmp_path / "other").write_bytes(b"x")
+    await storage.put_file("incoming/1/other.png", tmp_path / "other", "image/png")
+    s3.page_size = 2
+
+    keys = await storage.list_keys("profiles/")
+
+    assert [key for key, _ in keys] == [f"profiles/{name}.png" for name in "abcde"]
+    assert all(modified_at.tzinfo is not None for _, modified_at in keys)
+
+
+@pytest.mark.asyncio
+async def test_touch_refreshes_last_modified_and_keeps_metadata(storage, s3, tmp_path):
+    (tmp_path / "a").write_bytes(b"picture")
+    await storage.put_file("profiles/a.png", tmp_path / "a", "image/png")
+    s3.objects["profiles/a.png"].last_modified -= timedelta(days=2)
+
+    await storage.touch("profiles/a.png", "image/png")
+
+    obj = s3.objects["profiles/a.png"]
+    assert obj.body == b"picture"
+    assert obj.content_type == "image/png"
+    assert obj.cache_control == IMMUTABLE_CACHE_CONTROL
+    assert obj.last_modified > datetime.now(timezone.utc) - timedelta(minutes=1)
+
+
+@pytest.mark.asyncio
+async def test_direct_upload_is_processed_by_a_worker(db_session, storage, s3, monkeypatch):
+    monkeypatch.setattr(job_service, "AsyncSessionLocal", conftest.test_session_factory)
+    monkeypatch.setattr(mentee_service, "AsyncSessionLocal", conftest.test_session_factory)
+    mentee = await create_mentee(db_session)
+    user_id = mentee.user_id
+    upload = await upload_service.create_profile_picture_upload(user_id, "image/png", "me.png")
+    assert upload["key"].startswith(f"incoming/{user_id}/")
+    response = await browser_upload(s3, upload, png("red"), "image/png")
+    assert response.status_code == 204
+
+    profile = await MenteeService(db_session).queue_profile_picture_upload(user_id, upload["key"])
+    await db_session.commit()
+
+    # Confirming only looks at the object; the API process never reads it
+    assert profile.profile_pic_url is None
+    assert ("GET", upload["key"]) not in s3.calls
+
+    job = await run_queued_job(db_session)
+    assert job.status == JobStatus.SUCCEEDED
+    url = (await db_session.scalar(
+        select(MenteeProfile.profile_pic_url).where(MenteeProfile.user_id == user_id)
+    ))
+    digest = url.rsplit("/", 1)[-1].split(".")[0]
+    assert url == f"{PUBLIC_URL}/profiles/{digest}.png"
+    assert sorted(s3.objects) == [
+        f"profiles/{digest}.png",
+        f"profiles/{digest}.webp",
+        f"profiles/{digest}_thumb.png",
+        f"profiles/{digest}_thumb.webp",
+    ]
+    assert s3.objects[f"profiles/{digest}.webp"].content_type == "image/webp"
+    assert upload_service.thumbnail_url(url) == f"{PUBLIC_URL}/profiles/{digest}_thumb.png"
+
+
+@pytest.mark.asyncio
+async def test_confirming_checks_the_uploaded_size(storage, s3, monkeypatch):
+    upload = await upload_service.create_profile_picture_upload(1, "image/png", "me.png")
+    with pytest.raises(upload_service.UploadError, match="not found"):
+        await upload_service.confirm_profile_picture_upload(1, upload["key"])
+
+    await browser_upload(s3, upload, png("red"), "image/png")
+    monkeypatch.setattr(upload_service, "_max_upload_size", lambda: 100)
+    with pytest.raises(upload_service.UploadError, match="too large"):
+        await upload_service.confirm_profile_picture_upload(1, upload["key"])
+    assert s3.objects == {}
+
+
+@pytest.mark.asyncio
+async def test_direct_upload_policy_is_enforced(storage, s3, monkeypatch):
+    monkeypatch.setattr(upload_service, "_max_upload_size", lambda: 100)
+    upload = await upload_service.create_profile_picture_upload(1, "image/png", "me.png")
+
+    too_large = await browser_upload(s3, upload, png("red"), "image/png")
+    assert too_large.status_code == 400
+    assert b"EntityTooLarge" in too_large.content
+
+    upload["fields"]["Content-Type"] = "text/html"
+    wrong_type = await browser_upload(s3, upload, b"<p>hi</p>", "text/html")
+    assert wrong_type.status_code == 403
+
+    upload["fields"]["key"] = "profiles/planted.png"
+    wrong_key = await browser_upload(s3, upload, b"x", "image/png")
+    assert wrong_key.status_code == 403
+    assert s3.objects == {}
+
+
+@pytest.mark.asyncio
+async def test_confirming_another_users_upload_is_rejected(storage, s3):
+    upload = await upload_service.create_profile_picture_upload(1, "image/png", "me.png")
+    await browser_upload(s3, upload, png("red"), "image/png")
+
+    with pytest.raises(upload_service.UploadError):
+        await upload_service.confirm_profile_picture_upload(2, upload["key"])
+    assert list(s3.objects) == [upload["key"]]
+
+
+@pytest.mark.asyncio
+async def test_processing_an_invalid_image_removes_the_incoming_object(storage, s3):
+    upload = await upload_service.create_profile_picture_upload(1, "image/png", "me.png")
+    await browser_upload(s3, upload, b"not an image", "image/png")
+
+    with pytest.raises(upload_service.InvalidImageError):
+        await upload_service.process_profile_picture_upload(1, upload["key"])
+    assert s3.objects == {}
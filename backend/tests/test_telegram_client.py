@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from app.core.constants import (
+    TELEGRAM_API_MAX_RETRIES,
+    TELEGRAM_API_RETRY_BASE_SECONDS,
+    TELEGRAM_API_TIMEOUT_SECONDS,
+)
+from app.services import telegram_client
+from app.services.telegram_client import TelegramAPIError, get_telegram_client
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    """Record the client's waits instead of sleeping through them (patches asyncio.sleep)."""
+    recorded: list[float] = []
+    real_sleep = asyncio.sleep
+
+    async def sleep(delay, *args, **kwargs):
+        recorded.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(telegram_client.asyncio, "sleep", sleep)
+    return recorded
+
+
+@pytest.mark.asyncio
+async def test_429_waits_for_retry_after(telegram_api, sleeps):
+    telegram_api.respond(
+        "sendMessage",
+        429,
+        {
+            "ok": False,
+            "error_code": 429,
+            "description": "Too Many Requests: retry after 7",
+            "parameters": {"retry_after": 7},
+        },
+    )
+
+    result = await get_telegram_client().call("sendMessage", {"chat_id": 1, "text": "Hi"})
+
+    assert result["chat"]["id"] == 1
+    assert telegram_api.methods() == ["sendMessage", "sendMessage"]
+    assert sleeps[0] == 7
+
+
+@pytest.mark.asyncio
+async def test_5xx_backs_off_then_raises(telegram_api, sleeps):
+    for _ in range(TELEGRAM_API_MAX_RETRIES + 1):
+        telegram_api.respond("getWebhookInfo", 502, {"ok": False})
+
+    with pytest.raises(TelegramAPIError, match="failed after"):
+        await get_telegram_client().call("getWebhookInfo")
+
+    assert len(telegram_api.calls) == TELEGRAM_API_MAX_RETRIES + 1
+    # Doubling backoff, and no wait after the last attempt
+    assert sleeps == [
+        TELEGRAM_API_RETRY_BASE_SECONDS * 2 ** attempt for attempt in range(TELEGRAM_API_MAX_RETRIES)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_dropped_connection_is_retried(telegram_api, sleeps):
+    telegram_api.disconnect("deleteWebhook")
+
+    assert await get_telegram_client().call("deleteWebhook") is True
+    assert len(telegram_api.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_rejected_call_raises_without_retry(telegram_api, sleeps):
+    telegram_api.respond(
+        "sendMessage",
+        400,
+        {"ok": False, "error_code": 400, "description": "Bad Request: chat not found"},
+    )
+
+    with pytest.raises(TelegramAPIError, match="chat not found") as error:
+        await get_telegram_client().call("sendMessage", {"chat_id": 1, "text": "Hi"})
+
+    assert error.value.error_code == 400
+    assert len(telegram_api.calls) == 1
+    assert sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_send_methods_are_spaced_out(telegram_api, sleeps):
+    client = get_telegram_client()
+    interval = client._send_limiter.interval
+
+    await asyncio.gather(
+        *(client.call("sendMessage", {"chat_id": i, "text": "Hi"}) for i in range(3)),
+        client.call("getWebhookInfo"),
+    )
+
+    # The first send goes straight away; other methods are not limited
+    assert sleeps == [pytest.approx(interval, abs=0.01), pytest.approx(2 * interval, abs=0.01)]
+
+
+@pytest.mark.asyncio
+async def test_read_timeouts_are_per_method(telegram_api, monkeypatch):
+    monkeypatch.setitem(telegram_client.TELEGRAM_API_READ_TIMEOUTS, "sendDocument", 60)
+    telegram_api.updates = [{"update_id": 1}]
+    client = get_telegram_client()
+
+    await client.call("sendDocument", {"chat_id": 1})
+    await client.call("getUpdates", {"timeout": 30})
+    await client.call("getWebhookInfo")
+
+    assert telegram_api.read_timeouts == {
+        "sendDocument": 60,
+        "getUpdates": 30 + TELEGRAM_API_TIMEOUT_SECONDS,
+        "getWebhookInfo": TELEGRAM_API_TIMEOUT_SECONDS,
+    }
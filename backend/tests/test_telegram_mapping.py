@@ -0,0 +1,134 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.models.mentee import MenteeProfile
+from app.models.telegram import TelegramStat, UnmappedTelegramUser
+from app.services.telegram_match_service import propose_matches
+from tests.factories import auth_headers, create_coordinator, create_mentee, create_program
+
+URL = "/api/v1/telegram/map/bulk"
+
+
+@pytest_asyncio.fixture
+async def headers(db_session):
+    await create_program(db_session)  # The default program mapped counts go to
+    coordinator = await create_coordinator(db_session)
+    await db_session.commit()
+    return auth_headers(coordinator)
+
+
+async def add_unmapped(db, telegram_user_id: int, message_count: int) -> None:
+    db.add(UnmappedTelegramUser(
+        telegram_user_id=telegram_user_id,
+        username=f"user{telegram_user_id}",
+        display_name=None,
+        chat_id=-100,
+        message_count=message_count,
+    ))
+    await db.flush()
+
+
+async def totals(db) -> dict[int, int]:
+    result = await db.execute(select(TelegramStat.mentee_id, TelegramStat.message_count))
+    return dict(result.all())
+
+
+async def links(db) -> dict[int, int | None]:
+    result = await db.execute(select(MenteeProfile.id, MenteeProfile.telegram_user_id))
+    return dict(result.all())
+
+
+@pytest.mark.asyncio
+async def test_bulk_map_moves_unmapped_counts(client, db_session, headers):
+    ada = await create_mentee(db_session)
+    bob = await create_mentee(db_session, "KPDF-002", "Bob Smith")
+    cy = await create_mentee(db_session, "KPDF-003", "Cy Young")
+    ada_id, bob_id, cy_id = ada.id, bob.id, cy.id
+    db_session.add(TelegramStat(mentee_id=ada_id, program_id=1, message_count=3))
+    await add_unmapped(db_session, 101, 5)
+    await add_unmapped(db_session, 102, 4)
+    await add_unmapped(db_session, 103, 0)
+    await db_session.commit()
+
+    response = await client.post(URL, headers=headers, json={"mappings": [
+        {"telegram_user_id": 101, "mentee_profile_id": ada_id},
+        {"telegram_user_id": 102, "mentee_profile_id": bob_id},
+        {"telegram_user_id": 103, "mentee_profile_id": cy_id},
+    ]})
+
+    assert response.status_code == 200
+    assert response.json()["mapped"] == 3
+    db_session.expire_all()
+    # Added to the existing total; users without messages get no row
+    assert await totals(db_session) == {ada_id: 8, bob_id: 4}
+    assert await links(db_session) == {ada_id: 101, bob_id: 102, cy_id: 103}
+    assert (await db_session.scalars(select(UnmappedTelegramUser))).all() == []
+
+
+@pytest.mark.asyncio
+async def test_telegram_user_linked_to_another_mentee_is_rejected(client, db_session, headers):
+    ada = await create_mentee(db_session)
+    bob = await create_mentee(db_session, "KPDF-002", "Bob Smith")
+    ada_id, bob_id = ada.id, bob.id
+    ada.telegram_user_id = 101
+    await add_unmapped(db_session, 102, 4)
+    await db_session.commit()
+
+    response = await client.post(URL, headers=headers, json={"mappings": [
+        {"telegram_user_id": 102, "mentee_profile_id": ada_id},
+        {"telegram_user_id": 101, "mentee_profile_id": bob_id},
+    ]})
+    assert response.status_code == 400
+    assert "101" in response.json()["detail"]
+
+    single = await client.post("/api/v1/telegram/map", headers=headers, json={
+        "telegram_user_id": 101, "mentee_profile_id": bob_id,
+    })
+    assert single.status_code == 400
+
+    db_session.expire_all()
+    assert await links(db_session) == {ada_id: 101, bob_id: None}
+    assert await totals(db_session) == {}
+
+    # Mapping a user to the mentee it is already linked to is allowed
+    again = await client.post(URL, headers=headers, json={"mappings": [
+        {"telegram_user_id": 101, "mentee_profile_id": ada_id},
+    ]})
+    assert again.status_code == 200
+
+
+def test_propose_matches_scores_usernames_and_names():
+    unmapped = [
+        (101, "ada_lovelace", None, 5),
+        (102, None, "Smith Bob", 2),
+        (103, "zzz", "Nobody Known", 1),
+    ]
+    mentees = [
+        (1, "KPDF-001", "Ada Lovelace", "adalovelace"),
+        (2, "KPDF-002", "Bob Smith", "pending_kpdf002"),
+    ]
+
+    matches = propose_matches(unmapped, mentees)
+
+    assert [(m.telegram_user_id, m.mentee_profile_id, m.reason) for m in matches] == [
+        (101, 1, "username"),
+        (102, 2, "name"),
+    ]
+    assert [m.score for m in matches] == [1.0, 1.0]
+    assert matches[0].message_count == 5
+
+
+def test_propose_matches_gives_each_mentee_to_its_best_match():
+    unmapped = [
+        (101, None, "Ada Lovelace", 1),
+        (102, None, "Ada Lovelac", 1),
+        (103, None, "Ada", 1),
+    ]
+    mentees = [(1, "KPDF-001", "Ada Lovelace", None)]
+
+    matches = propose_matches(unmapped, mentees)
+
+    assert [(m.telegram_user_id, m.mentee_profile_id) for m in matches] == [(101, 1)]
+    assert propose_matches([(102, None, "Ada Lovelac", 1)], mentees)[0].score >= 0.8
+    assert propose_matches([(103, None, "Ada", 1)], mentees) == []
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.telegram import TelegramDailyActivity, TelegramStat
+from app.repositories.telegram_repo import TelegramBotStateRepository
+from app.services import telegram_polling_service
+from app.services.telegram_polling_service import TelegramPoller
+from tests import conftest
+from tests.fake_telegram import FAKE_BOT_TOKEN
+from tests.factories import create_mentee, create_program, telegram_group_message
+
+
+@pytest.fixture
+def poller(db_session, telegram_api, monkeypatch):
+    monkeypatch.setattr(
+        telegram_polling_service, "AsyncSessionLocal", conftest.test_session_factory
+    )
+    return TelegramPoller(FAKE_BOT_TOKEN)
+
+
+async def _counts(db_session) -> tuple[int | None, int | None]:
+    daily = await db_session.scalar(select(func.sum(TelegramDailyActivity.message_count)))
+    total = await db_session.scalar(select(func.sum(TelegramStat.message_count)))
+    return daily, total
+
+
+@pytest.mark.asyncio
+async def test_poller_counts_a_batch_and_stores_the_offset(db_session, telegram_api, poller):
+    await create_program(db_session)
+    await create_mentee(db_session)
+    await db_session.commit()
+    telegram_api.updates = [telegram_group_message(update_id) for update_id in (7, 8, 9)]
+
+    poller.start()
+    try:
+        for _ in range(200):
+            offset = await TelegramBotStateRepository(db_session).get_offset(poller.bot_id)
+            await db_session.commit()
+            if offset is not None:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        poller.stop()
+
+    assert offset == 10
+    assert await _counts(db_session) == (3, 3)
+    # getUpdates fails while a webhook is set, so it is removed first
+    assert telegram_api.methods()[:2] == ["deleteWebhook", "getUpdates"]
+
+
+@pytest.mark.asyncio
+async def test_poller_batch_is_all_or_nothing(db_session, telegram_api, poller, monkeypatch):
+    await create_program(db_session)
+    await create_mentee(db_session)
+    await db_session.commit()
+    telegram_api.updates = [telegram_group_message(update_id) for update_id in (7, 8)]
+
+    async def crash(self, bot_id, update_offset):
+        raise RuntimeError("Worker died before commit")
+
+    with monkeypatch.context() as m:
+        m.setattr(TelegramBotStateRepository, "save_offset", crash)
+        with pytest.raises(RuntimeError):
+            await poller._process_batch(await poller._get_updates(None))
+    assert await _counts(db_session) == (None, None)
+
+    # The batch is fetched again and counted once
+    assert await poller._process_batch(await poller._get_updates(None)) == 9
+    assert await _counts(db_session) == (2, 2)
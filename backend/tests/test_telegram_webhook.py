@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import func, select
+
+from app.config import get_settings
+from app.models.telegram import TelegramDailyActivity
+from app.services.telegram_dedup_service import telegram_updates
+from app.services.telegram_service import TelegramService
+from tests import conftest
+from tests.factories import create_mentee, create_program, telegram_group_message
+
+
+@pytest.fixture
+def webhook(monkeypatch):
+    monkeypatch.setattr(get_settings(), "telegram_bot_token", "123456:test-token")
+    telegram_updates.clear()
+    yield
+    telegram_updates.clear()
+
+
+async def _deliver(db_session, update: dict) -> bool:
+    processed = await TelegramService(db_session).process_webhook_update(update)
+    await db_session.commit()
+    return processed
+
+
+@pytest.mark.asyncio
+async def test_webhook_redelivery_is_counted_once(db_session, webhook):
+    await create_program(db_session)
+    await create_mentee(db_session)
+    await db_session.commit()
+
+    assert await _deliver(db_session, telegram_group_message(1000))
+    # Another process, or this one after a restart, only has the database
+    telegram_updates.clear()
+    assert not await _deliver(db_session, telegram_group_message(1000))
+
+    total = await db_session.scalar(select(func.sum(TelegramDailyActivity.message_count)))
+    assert total == 1
+
+
+@pytest.mark.asyncio
+async def test_webhook_accepts_lower_update_id_after_id_reset(db_session, webhook):
+    # Telegram picks a new random starting id after a week without updates
+    await create_program(db_session)
+    await create_mentee(db_session)
+    await db_session.commit()
+
+    assert await _deliver(db_session, telegram_group_message(900_000))
+    assert await _deliver(db_session, telegram_group_message(12))
+
+    total = await db_session.scalar(select(func.sum(TelegramDailyActivity.message_count)))
+    assert total == 2
+
+
+@pytest.mark.asyncio
+async def test_webhook_count_is_committed_with_the_update_claim(db_session, webhook):
+    await create_program(db_session)
+    await create_mentee(db_session)
+    await db_session.commit()
+
+    assert await _deliver(db_session, telegram_group_message(1000))
+
+    # Nothing is left in memory: a restart right after the commit keeps the count
+    async with conftest.test_session_factory() as other_db:
+        total = await other_db.scalar(select(func.sum(TelegramDailyActivity.message_count)))
+    assert total == 1
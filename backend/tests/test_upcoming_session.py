@@ -0,0 +1,78 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.core.constants import ResourceType
+from app.models.session import SessionResource
+from app.repositories.session_repo import SessionRepository
+from app.services import session_service
+from app.services.attendance_service import AttendanceService
+from app.services.code_window_service import code_window_cache
+from app.services.singleflight_service import mentee_reads
+from tests import conftest
+from tests.factories import auth_headers, create_mentee, create_program, create_session
+
+URL = "/api/v1/mentees/me/upcoming-session"
+
+
+@pytest.fixture
+def caches(monkeypatch):
+    monkeypatch.setattr(session_service, "AsyncSessionLocal", conftest.test_session_factory)
+    code_window_cache.clear()
+    mentee_reads.clear()
+    yield
+    code_window_cache.clear()
+    mentee_reads.clear()
+
+
+@pytest.mark.asyncio
+async def test_code_window_opens_only_after_commit(db_session, caches):
+    program = await create_program(db_session)
+    session = await create_session(db_session, program)
+    await db_session.commit()
+    session_id = session.id
+    service = AttendanceService(db_session)
+
+    await service.generate_code(session_id)
+    assert code_window_cache.is_open(session_id, datetime.now(timezone.utc)) is None
+    await db_session.rollback()
+    assert code_window_cache.is_open(session_id, datetime.now(timezone.utc)) is None
+
+    await service.generate_code(session_id)
+    await db_session.commit()
+    assert code_window_cache.is_open(session_id, datetime.now(timezone.utc)) is True
+
+
+@pytest.mark.asyncio
+async def test_upcoming_session_is_shared_until_sessions_change(
+    client, db_session, caches, monkeypatch
+):
+    mentee = await create_mentee(db_session)
+    program = await create_program(db_session)
+    session = await create_session(db_session, program, day=date.today() + timedelta(days=1))
+    await db_session.commit()
+    headers = auth_headers(mentee.user)
+
+    lookups = 0
+    find_upcoming_session = SessionRepository.find_upcoming_session
+
+    async def counted(self, today, current_time):
+        nonlocal lookups
+        lookups += 1
+        return await find_upcoming_session(self, today, current_time)
+
+    monkeypatch.setattr(SessionRepository, "find_upcoming_session", counted)
+
+    for _ in range(3):
+        response = await client.get(URL, headers=headers)
+        assert response.json()["id"] == session.id
+    assert lookups == 1
+
+    db_session.add(
+        SessionResource(session_id=session.id, type=ResourceType.LINK, title="Slides")
+    )
+    await db_session.commit()
+
+    response = await client.get(URL, headers=headers)
+    assert [r["title"] for r in response.json()["resources"]] == ["Slides"]
+    assert lookups == 2
@@ -56,13 +56,25 @@ export const sessionsAdminApi = {
 };
 
 // Mentee Management API
+const MENTEE_PAGE_SIZE = 1000;
+
 export const menteesAdminApi = {
   listMentees: async (track?: string, search?: string): Promise<MenteeProfile[]> => {
-    const params: Record<string, string> = {};
-    if (track) params.track = track;
-    if (search) params.search = search;
-    const response = await apiClient.get<MenteeProfile[]>('/admin/mentees', { params });
-    return response.data;
+    // The list is paged; follow X-Has-More until every mentee is loaded
+    const mentees: MenteeProfile[] = [];
+    let hasMore = true;
+    while (hasMore) {
+      const params: Record<string, string | number> = {
+        limit: MENTEE_PAGE_SIZE,
+        offset: mentees.length,
+      };
+      if (track) params.track = track;
+      if (search) params.search = search;
+      const response = await apiClient.get<MenteeProfile[]>('/admin/mentees', { params });
+      mentees.push(...response.data);
+      hasMore = response.headers['x-has-more'] === 'true';
+    }
+    return mentees;
   },
 
   getMentee: async (menteeId: number): Promise<MenteeProfile> => {